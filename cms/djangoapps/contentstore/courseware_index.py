@@ -7,6 +7,7 @@ from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import resolve
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
@@ -20,6 +21,7 @@ from openedx.core.lib.courses import course_image_url
 from xmodule.annotator_mixin import html_to_text
 from xmodule.library_tools import normalize_key_for_search
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo import BlockKey
 
 # REINDEX_AGE is the default amount of time that we look back for changes
 # that might have happened. If we are provided with a time at which the
@@ -28,6 +30,10 @@ from xmodule.modulestore import ModuleStoreEnum
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# The version of each structure that was last indexed is cached, so that an
+# incremental index can find what changed since then.
+INDEXED_VERSION_CACHE_KEY = u'{index_name}.indexed_version.{structure_key}'
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -116,7 +122,86 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def remove_items(cls, searcher, structure, block_keys):
+        """
+        remove the items with the given block keys, in the given structure, from the search index
+        """
+        course_key = structure.location.course_key
+        searcher.remove(cls.DOCUMENT_TYPE, [
+            unicode(cls._id_modifier(course_key.make_usage_key(block_key.type, block_key.id)))
+            for block_key in block_keys
+        ])
+
+    @classmethod
+    def _indexed_version_cache_key(cls, structure_key):
+        """ Returns the key to cache the last indexed version of the structure with """
+        return INDEXED_VERSION_CACHE_KEY.format(index_name=cls.INDEX_NAME, structure_key=structure_key)
+
+    @classmethod
+    def _get_structure_changes(cls, modulestore, structure_key, structure):
+        """
+        Compares the given published structure with the version of it that was
+        last indexed, if it is known and both are split modulestore structures.
+
+        Returns:
+        None if the versions can't be compared; otherwise, a pair of
+            - the set of the block keys of the items whose index must be updated:
+              the changed items, their descendants (which inherit their settings
+              and display their names in their location) and their ancestors
+            - the set of the block keys of the items which have been deleted
+        """
+        indexed_version = cache.get(cls._indexed_version_cache_key(structure_key))
+        new_version = getattr(structure, 'course_version', None)
+        if indexed_version is None or new_version is None:
+            return None
+        if modulestore.get_modulestore_type(structure_key) != ModuleStoreEnum.Type.split:
+            return None
+
+        split_store = modulestore._get_modulestore_for_courselike(structure_key)  # pylint: disable=protected-access
+        old_structure = split_store.get_structure(structure_key, indexed_version)
+        new_structure = split_store.get_structure(structure_key, new_version)
+        if old_structure is None or new_structure is None:
+            return None
+
+        old_blocks, new_blocks = old_structure['blocks'], new_structure['blocks']
+        old_parents = split_store.build_block_key_to_parents_mapping(old_structure)
+        new_parents = split_store.build_block_key_to_parents_mapping(new_structure)
+
+        def block_content(block):
+            """ The parts of a block's data that its index depends on, apart from its children """
+            fields = {name: value for name, value in block.fields.iteritems() if name != 'children'}
+            return block.block_type, block.definition, fields, block.defaults, block.get_asides()
+
+        changed_keys = set()
+        changed_children_keys = set()
+        for block_key, block in new_blocks.iteritems():
+            old_block = old_blocks.get(block_key)
+            if old_block is None or block_content(old_block) != block_content(block):
+                changed_keys.add(block_key)
+            elif set(old_parents.get(block_key, [])) != set(new_parents.get(block_key, [])):
+                # Moved, which changes its location and what it inherits
+                changed_keys.add(block_key)
+            elif old_block.fields.get('children', []) != block.fields.get('children', []):
+                changed_children_keys.add(block_key)
+
+        update_keys = set()
+        pending_keys = list(changed_keys)
+        while pending_keys:
+            block_key = BlockKey(*pending_keys.pop())
+            if block_key not in update_keys and block_key in new_blocks:
+                update_keys.add(block_key)
+                pending_keys.extend(new_blocks[block_key].fields.get('children', []))
+
+        pending_keys = list(update_keys | changed_children_keys)
+        while pending_keys:
+            block_key = pending_keys.pop()
+            update_keys.add(block_key)
+            pending_keys.extend(parent for parent in new_parents.get(block_key, []) if parent not in update_keys)
+
+        return update_keys, set(old_blocks) - set(new_blocks)
+
+    @classmethod
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, incremental=False):
         """
         Process course for indexing
 
@@ -132,6 +217,12 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        incremental (bool) - only update the index of the items that changed since
+            the version of the structure that was last indexed, their descendants
+            and their ancestors, without walking through the rest of the structure.
+            Only possible in the split modulestore, once the structure has been
+            indexed; otherwise, triggered_at applies as above
+
         Returns:
         Number of items that have been added to the index
         """
@@ -159,6 +250,11 @@ class SearchIndexerBase(object):
         # instead of per item index API call.
         items_index = []
 
+        # update_keys is the set of the block keys of the items to update the index
+        # of, when indexing incrementally; None if all the items are to be walked
+        # through.
+        update_keys = None
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -180,6 +276,10 @@ class SearchIndexerBase(object):
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
+            if update_keys is not None and BlockKey.from_usage_key(item.location) not in update_keys:
+                # this item and its descendants are unchanged since they were last indexed
+                return
+
             is_indexable = hasattr(item, "index_dictionary")
             item_index_dictionary = item.index_dictionary() if is_indexable else None
             # if it's not indexable and it does not have children, then ignore
@@ -251,6 +351,12 @@ class SearchIndexerBase(object):
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
                 structure = cls._fetch_top_level(modulestore, structure_key)
+                structure_changes = cls._get_structure_changes(
+                    modulestore, structure_key, structure
+                ) if incremental else None
+                if structure_changes is not None:
+                    update_keys, deleted_keys = structure_changes
+                    triggered_at = None
                 groups_usage_info = cls.fetch_group_usage(modulestore, structure)
 
                 # First perform any additional indexing from the structure object
@@ -260,7 +366,13 @@ class SearchIndexerBase(object):
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
                 searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if structure_changes is None:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                elif deleted_keys:
+                    cls.remove_items(searcher, structure, deleted_keys)
+
+                if not error_list and getattr(structure, 'course_version', None):
+                    cache.set(cls._indexed_version_cache_key(structure_key), structure.course_version, None)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -258,6 +258,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
             reindex_age=(trigger_time - since_time)
         )
 
+    def index_changes(self, store):
+        """ index course incrementally """
+        return CoursewareSearchIndexer.index(store, self.course.id, triggered_at=datetime.now(UTC), incremental=True)
+
     def _get_default_search(self):
         return {"course": unicode(self.course.id)}
 
@@ -441,6 +445,52 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes what changed since the course was last indexed """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 4)
+
+        # Add a new sequential, with a vertical and its content
+        sequential2 = ItemFactory.create(
+            parent_location=self.chapter.location,
+            category='sequential',
+            display_name='Section 2',
+            modulestore=store,
+            publish_item=True,
+            start=datetime(2015, 3, 1, tzinfo=UTC),
+        )
+        vertical2 = ItemFactory.create(
+            parent_location=sequential2.location,
+            category='vertical',
+            display_name='Subsection 2',
+            modulestore=store,
+            publish_item=True,
+        )
+        ItemFactory.create(
+            parent_location=vertical2.location,
+            category="html",
+            display_name="Some other content",
+            publish_item=False,
+            modulestore=store,
+        )
+        self.publish_item(store, vertical2.location)
+
+        # only the new items and the chapter they were added to are indexed
+        indexed_count = self.index_changes(store)
+        self.assertEqual(indexed_count, 4)
+        self.assertEqual(self.search()["total"], 7)
+
+        # deleted items are removed from the index, and only their ancestors are indexed again
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.index_changes(store)
+        self.assertEqual(indexed_count, 3)
+        self.assertEqual(self.search()["total"], 6)
+
+        # nothing changed
+        self.assertEqual(self.index_changes(store), 0)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -572,6 +622,9 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    def test_incremental_index(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_incremental_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
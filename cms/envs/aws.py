@@ -388,6 +388,10 @@ XBLOCK_FIELD_DATA_WRAPPERS = ENV_TOKENS.get(
 
 CONTENTSTORE = AUTH_TOKENS['CONTENTSTORE']
 DOC_STORE_CONFIG = AUTH_TOKENS['DOC_STORE_CONFIG']
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE', COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE
+)
+COURSE_ASSETS_DISK_CACHE = ENV_TOKENS.get('COURSE_ASSETS_DISK_CACHE', COURSE_ASSETS_DISK_CACHE)
 # Datadog for events!
 DATADOG = AUTH_TOKENS.get("DATADOG", {})
 DATADOG.update(ENV_TOKENS.get("DATADOG", {}))
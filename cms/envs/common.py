@@ -351,6 +351,8 @@ GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoLite2-Country.mmdb"
 # Mako templating
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_cms')
+# The Mako templates compiled at startup, rather than when they are first rendered.
+MAKO_WARM_TEMPLATES = ['base.html']
 MAKO_TEMPLATE_DIRS_BASE = [
     PROJECT_ROOT / 'templates',
     COMMON_ROOT / 'templates',
@@ -612,6 +614,22 @@ MODULESTORE = {
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
 
+# Local disk cache of course asset contents, from which the contentserver
+# serves assets instead of loading them from the django cache or GridFS.
+COURSE_ASSETS_DISK_CACHE = {
+    # Directory to keep the cached assets in.  None disables the cache.
+    'DIRECTORY': None,
+    # Maximum total size, in bytes, of the cached assets.
+    'MAX_SIZE': 1024 * 1024 * 1024,
+    # Maximum size, in bytes, of an asset to cache.
+    'MAX_FILE_SIZE': 32 * 1024 * 1024,
+}
+
+# Maximum total size, in bytes, of the pickled split course structures
+# kept in each process's local LRU cache, in front of 'course_structure_cache'.
+# Set to 0 to disable the process-local cache.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -625,6 +643,20 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Maximum total size, in bytes, of the sandboxed execution results kept
+    # in each process, in front of the django cache.  0 disables it.
+    'result_cache_size': 32 * 1024 * 1024,
+
+    # Number of warm sandbox workers to run code in, each replaced after
+    # 'pool_max_jobs_per_worker' jobs.  0 starts a new sandbox for every job.
+    'pool_size': 0,
+    'pool_max_jobs_per_worker': 100,
+    # Unprivileged user to run the warm workers as, which must be neither root
+    # nor 'user', and the copy of the sandboxed Python it runs, which alone is
+    # given the capabilities to switch to 'user'.  See capa.safe_exec.pool.
+    'pool_user': None,
+    'pool_python_bin': None,
 }
 
 ############################ DJANGO_BUILTINS ################################
@@ -174,6 +174,12 @@ CACHES = {
     },
 }
 
+# Don't keep course structures in a process-local cache across tests
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = 0
+
+# Nor sandboxed execution results
+CODE_JAIL['result_cache_size'] = 0
+
 ################################# CELERY ######################################
 
 CELERY_ALWAYS_EAGER = True
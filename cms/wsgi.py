@@ -26,6 +26,11 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cms.envs.aws")
 import cms.startup as startup
 startup.run()
 
+from django.conf import settings
+from edxmako import warm_lookup
+
+warm_lookup('main', settings.MAKO_WARM_TEMPLATES)
+
 # This application object is used by the development server
 # as well as any WSGI server configured to use this file.
 from django.core.wsgi import get_wsgi_application
@@ -5,9 +5,10 @@ from config_models.models import ConfigurationModel
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_noop
+from edx_django_utils.cache import RequestCache
 from jsonfield.fields import JSONField
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
@@ -24,6 +25,10 @@ FORUM_ROLE_GROUP_MODERATOR = ugettext_noop('Group Moderator')
 FORUM_ROLE_COMMUNITY_TA = ugettext_noop('Community TA')
 FORUM_ROLE_STUDENT = ugettext_noop('Student')
 
+# The (course_id, name) of the forum roles of each user whose roles were
+# checked during a request are cached for the rest of it, by user id.
+USER_ROLES_CACHE_NAMESPACE = u'django_comment_common.models.user_roles'
+
 
 @receiver(post_save, sender=CourseEnrollment)
 def assign_default_role_on_enrollment(sender, instance, **kwargs):
@@ -120,8 +125,23 @@ class Role(models.Model):
     def user_has_role_for_course(user, course_id, role_names):
         """
         Returns True if the user has one of the given roles for the given course
+
+        All of the user's roles are loaded the first time this is checked
+        during a request, since it's checked for each of the user's courses.
         """
-        return Role.objects.filter(course_id=course_id, name__in=role_names, users=user).exists()
+        user_roles = RequestCache(USER_ROLES_CACHE_NAMESPACE).data
+        if user.id not in user_roles:
+            user_roles[user.id] = set(Role.objects.filter(users=user).values_list('course_id', 'name'))
+        return any((course_id, role_name) in user_roles[user.id] for role_name in role_names)
+
+
+@receiver(m2m_changed, sender=Role.users.through)
+@receiver(post_delete, sender=Role)
+def invalidate_user_roles_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the cached roles of users when any of them change.
+    """
+    RequestCache(USER_ROLES_CACHE_NAMESPACE).clear()
 
 
 class Permission(models.Model):
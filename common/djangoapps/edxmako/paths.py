@@ -4,6 +4,7 @@ Set up lookup paths for mako templates.
 
 import contextlib
 import hashlib
+import logging
 import os
 
 import pkg_resources
@@ -12,11 +13,17 @@ from mako.exceptions import TopLevelLookupException
 from mako.lookup import TemplateLookup
 
 from openedx.core.djangoapps.theming.helpers import get_template as themed_template
-from openedx.core.djangoapps.theming.helpers import get_template_path_with_theme, strip_site_theme_templates_path
+from openedx.core.djangoapps.theming.helpers import (
+    get_current_site_theme,
+    get_template_path_with_theme,
+    strip_site_theme_templates_path
+)
 from openedx.core.lib.cache_utils import request_cached
 
 from . import LOOKUP
 
+log = logging.getLogger(__name__)
+
 
 class TopLevelTemplateURI(unicode):
     """
@@ -31,10 +38,15 @@ class DynamicTemplateLookup(TemplateLookup):
     """
     A specialization of the standard mako `TemplateLookup` class which allows
     for adding directories progressively.
+
+    Unless the lookup checks the filesystem for changes to the templates, the
+    templates and theme template paths it finds are cached by site theme and
+    uri for the life of the process.
     """
     def __init__(self, *args, **kwargs):
         super(DynamicTemplateLookup, self).__init__(*args, **kwargs)
         self.__original_module_directory = self.template_args['module_directory']
+        self._theme_cache = {}
 
     def __repr__(self):
         return "<{0.__class__.__name__} {0.directories}>".format(self)
@@ -59,6 +71,27 @@ class DynamicTemplateLookup(TemplateLookup):
         # Also clear the internal caches. Ick.
         self._collection.clear()
         self._uri_cache.clear()
+        self._theme_cache.clear()
+
+    def _get_cached(self, kind, uri, compute):
+        """
+        Returns the value of the given kind for `uri` in the current site
+        theme, computing it with `compute` if it isn't cached.
+        """
+        if self.filesystem_checks:
+            return compute()
+        site_theme = get_current_site_theme()
+        cache_key = (kind, getattr(site_theme, 'theme_dir_name', None), isinstance(uri, TopLevelTemplateURI), uri)
+        if cache_key not in self._theme_cache:
+            self._theme_cache[cache_key] = compute()
+        return self._theme_cache[cache_key]
+
+    def _get_template_path_with_theme(self, uri):
+        """
+        Returns the path of the template for `uri` in the current site theme,
+        or `uri` itself if the theme doesn't override the template.
+        """
+        return self._get_cached('path', uri, lambda: get_template_path_with_theme(uri))
 
     def adjust_uri(self, uri, calling_uri):
         """
@@ -78,7 +111,7 @@ class DynamicTemplateLookup(TemplateLookup):
         # located inside a theme?
         if calling_uri != strip_site_theme_templates_path(calling_uri):
             # Is the calling template trying to include/inherit itself?
-            if calling_uri == get_template_path_with_theme(relative_uri):
+            if calling_uri == self._get_template_path_with_theme(relative_uri):
                 return TopLevelTemplateURI(relative_uri)
         return relative_uri
 
@@ -99,17 +132,23 @@ class DynamicTemplateLookup(TemplateLookup):
         # if microsite template is not present or request is not in microsite then
         # let mako find and serve a template
         if not template:
-            if isinstance(uri, TopLevelTemplateURI):
-                template = self._get_toplevel_template(uri)
-            else:
-                try:
-                    # Try to find themed template, i.e. see if current theme overrides the template
-                    template = super(DynamicTemplateLookup, self).get_template(get_template_path_with_theme(uri))
-                except TopLevelLookupException:
-                    template = self._get_toplevel_template(uri)
+            template = self._get_cached('template', uri, lambda: self._get_theme_template(uri))
 
         return template
 
+    def _get_theme_template(self, uri):
+        """
+        Lookup a template in the current site theme, falling back to the
+        default/toplevel template.
+        """
+        if isinstance(uri, TopLevelTemplateURI):
+            return self._get_toplevel_template(uri)
+        try:
+            # Try to find themed template, i.e. see if current theme overrides the template
+            return super(DynamicTemplateLookup, self).get_template(self._get_template_path_with_theme(uri))
+        except TopLevelLookupException:
+            return self._get_toplevel_template(uri)
+
     def _get_toplevel_template(self, uri):
         """
         Lookup a default/toplevel template, ignoring current theme.
@@ -142,6 +181,7 @@ def add_lookup(namespace, directory, package=None, prepend=False):
             input_encoding='utf-8',
             default_filters=['decode.utf8'],
             encoding_errors='replace',
+            filesystem_checks=getattr(settings, 'MAKO_FILESYSTEM_CHECKS', settings.DEBUG),
         )
     if package:
         directory = pkg_resources.resource_filename(package, directory)
@@ -156,6 +196,19 @@ def lookup_template(namespace, name):
     return LOOKUP[namespace].get_template(name)
 
 
+def warm_lookup(namespace, uris):
+    """
+    Compiles and caches the Mako templates with the given uris in the given
+    namespace, as they are found without a site theme, so that the first
+    requests to render them don't have to.  Used at startup.
+    """
+    for uri in uris:
+        try:
+            LOOKUP[namespace].get_template(uri)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u'Unable to warm the Mako template %s', uri)
+
+
 @contextlib.contextmanager
 def save_lookups():
     """
@@ -20,7 +20,10 @@ Methods for creating RequestContext for using with Mako templates.
 
 
 from crum import get_current_request
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.dispatch import receiver
 from django.template import RequestContext
+from django.utils.translation import get_language
 
 from edx_django_utils.cache import RequestCache
 from openedx.core.lib.request_utils import safe_get_host
@@ -51,3 +54,35 @@ def get_template_request_context(request=None):
     request_cache_dict[cache_key] = context
 
     return context
+
+
+def get_context_processors_output(context, compute):
+    """
+    Returns a new dictionary of the output of the context processors for the
+    given template processing context, computing it with `compute` unless it
+    has already been computed for the current request's context.
+
+    The output depends on the active language and on the user of the
+    request, which views may change while rendering (e.g. with
+    `translation.override`, or when masquerading), so it's cached for each
+    combination of them.
+    """
+    request_cache_dict = RequestCache('edxmako').data
+    if request_cache_dict.get("request_context") is not context:
+        return compute()
+
+    outputs = request_cache_dict.setdefault("context_processors_output", {})
+    output_key = (get_language(), getattr(context.request, 'user', None))
+    if output_key not in outputs:
+        outputs[output_key] = compute()
+    return dict(outputs[output_key])
+
+
+@receiver(user_logged_in)
+@receiver(user_logged_out)
+def _clear_context_processors_output(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the output of the context processors when the user of the request,
+    and so the user and CSRF token they output, change.
+    """
+    RequestCache('edxmako').data.pop("context_processors_output", None)
@@ -18,7 +18,7 @@ from mako.template import Template as MakoTemplate
 from six import text_type
 
 from . import Engines, LOOKUP
-from .request_context import get_template_request_context
+from .request_context import get_context_processors_output, get_template_request_context
 from .shortcuts import is_any_marketing_link_set, is_marketing_link_set, marketing_link
 
 KEY_CSRF_TOKENS = ('csrf_token', 'csrf')
@@ -73,9 +73,17 @@ class Template(object):
     def _get_context_processors_output_dict(self, context_object):
         """
         Run the context processors for the given context and get the output as a new dictionary.
+        The output for the current request's context is only computed once per request, for all
+        the templates rendered during it.
         """
-        with context_object.bind_template(self):
-            return context_object.flatten()
+        def compute():
+            """
+            Runs the context processors.
+            """
+            with context_object.bind_template(self):
+                return context_object.flatten()
+
+        return get_context_processors_output(context_object, compute)
 
     @staticmethod
     def _add_core_context(context_dictionary):
@@ -1,3 +1,5 @@
+import shutil
+import tempfile
 import unittest
 
 import ddt
@@ -7,11 +9,13 @@ from django.http import HttpResponse
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
+from django.utils import translation
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 
 from edxmako import LOOKUP, add_lookup
-from edxmako.request_context import get_template_request_context
+from edxmako.paths import DynamicTemplateLookup
+from edxmako.request_context import get_context_processors_output, get_template_request_context
 from edxmako.shortcuts import is_any_marketing_link_set, is_marketing_link_set, marketing_link, render_to_string
 from student.tests.factories import UserFactory
 from util.testing import UrlResetMixin
@@ -76,6 +80,42 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class DynamicTemplateLookupTests(TestCase):
+    """
+    Test the caching of templates by `DynamicTemplateLookup`.
+    """
+    def setUp(self):
+        super(DynamicTemplateLookupTests, self).setUp()
+        template_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, template_dir)
+        with open(template_dir + '/test.html', 'w') as template_file:
+            template_file.write('Hello')
+        self.template_dir = template_dir
+
+    def make_lookup(self, filesystem_checks):
+        """
+        Returns a lookup of the templates of the test directory.
+        """
+        lookup = DynamicTemplateLookup(module_directory=settings.MAKO_MODULE_DIR, filesystem_checks=filesystem_checks)
+        lookup.add_directory(self.template_dir)
+        return lookup
+
+    @patch('edxmako.paths.get_template_path_with_theme', side_effect=lambda uri: uri)
+    def test_templates_cached(self, mock_get_template_path_with_theme):
+        lookup = self.make_lookup(filesystem_checks=False)
+        template = lookup.get_template('test.html')
+        self.assertIs(lookup.get_template('test.html'), template)
+        self.assertEqual(template.render_unicode(), 'Hello')
+        self.assertEqual(mock_get_template_path_with_theme.call_count, 1)
+
+    @patch('edxmako.paths.get_template_path_with_theme', side_effect=lambda uri: uri)
+    def test_templates_not_cached_with_filesystem_checks(self, mock_get_template_path_with_theme):
+        lookup = self.make_lookup(filesystem_checks=True)
+        lookup.get_template('test.html')
+        lookup.get_template('test.html')
+        self.assertEqual(mock_get_template_path_with_theme.call_count, 2)
+
+
 class MakoRequestContextTest(TestCase):
     """
     Test MakoMiddleware.
@@ -149,3 +189,54 @@ class MakoRequestContextTest(TestCase):
         the threadlocal REQUEST_CONTEXT.context. This is meant to run in CMS.
         """
         self.assertIn("We're having trouble rendering your component", render_to_string("html_error.html", None))
+
+    def test_context_processors_output_cached(self):
+        """
+        Test that the output of the context processors is computed once per request.
+        """
+        compute = Mock(return_value={'foo': 'bar'})
+        with patch('edxmako.request_context.get_current_request', return_value=self.request):
+            context = get_template_request_context()
+            self.assertEqual(get_context_processors_output(context, compute), {'foo': 'bar'})
+            get_context_processors_output(context, compute)['foo'] = 'baz'
+            self.assertEqual(get_context_processors_output(context, compute), {'foo': 'bar'})
+        self.assertEqual(compute.call_count, 1)
+
+        RequestCache.clear_all_namespaces()
+        get_context_processors_output(get_template_request_context(self.request), compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_context_processors_output_cached_by_language(self):
+        """
+        Test that the output of the context processors is computed again for another language.
+        """
+        compute = Mock(return_value={})
+        context = get_template_request_context(self.request)
+        with translation.override('en'):
+            get_context_processors_output(context, compute)
+        with translation.override('eo'):
+            get_context_processors_output(context, compute)
+            get_context_processors_output(context, compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_context_processors_output_cached_by_user(self):
+        """
+        Test that the output of the context processors is computed again when the user
+        of the request changes, e.g. when masquerading.
+        """
+        compute = Mock(return_value={})
+        context = get_template_request_context(self.request)
+        get_context_processors_output(context, compute)
+        self.request.user = UserFactory.create()
+        get_context_processors_output(context, compute)
+        get_context_processors_output(context, compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_context_processors_output_not_cached_without_request(self):
+        """
+        Test that the output of the context processors isn't cached for other contexts.
+        """
+        compute = Mock(return_value={})
+        get_context_processors_output(Mock(), compute)
+        get_context_processors_output(Mock(), compute)
+        self.assertEqual(compute.call_count, 2)
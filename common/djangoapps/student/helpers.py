@@ -125,6 +125,9 @@ def check_verify_status_by_course(user, course_enrollments):
 
     recent_verification_datetime = None
 
+    # Whether the user has an active verification, looked up only if needed
+    user_is_verified = None
+
     for enrollment in course_enrollments:
 
         # If the user hasn't enrolled as verified, then the course
@@ -175,12 +178,14 @@ def check_verify_status_by_course(user, course_enrollments):
             )
             if status is None and not submitted:
                 if deadline is None or deadline > datetime.now(UTC):
-                    if IDVerificationService.user_is_verified(user) and verification_expiring_soon:
+                    if user_is_verified is None:
+                        user_is_verified = IDVerificationService.user_is_verified(user)
+                    if user_is_verified and verification_expiring_soon:
                         # The user has an active verification, but the verification
                         # is set to expire within "EXPIRING_SOON_WINDOW" days (default is 4 weeks).
                         # Tell the student to reverify.
                         status = VERIFY_STATUS_NEED_TO_REVERIFY
-                    elif not IDVerificationService.user_is_verified(user):
+                    elif not user_is_verified:
                         status = VERIFY_STATUS_NEED_TO_VERIFY
                 else:
                     # If a user currently has an active or pending verification,
@@ -430,7 +435,7 @@ class AccountValidationError(Exception):
         self.field = field
 
 
-def cert_info(user, course_overview):
+def cert_info(user, course_overview, cert_status=None, linkedin_config=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -438,6 +443,11 @@ def cert_info(user, course_overview):
     Arguments:
         user (User): A user.
         course_overview (CourseOverview): A course.
+        cert_status (dict): The user's certificate status in the course, as
+            returned by certificate_status_for_student, if it was already
+            retrieved.
+        linkedin_config (LinkedInAddToProfileConfiguration): The current
+            LinkedIn configuration, if it was already retrieved.
 
     Returns:
         dict: A dictionary with keys:
@@ -449,20 +459,21 @@ def cert_info(user, course_overview):
             'grade': if status is not 'processing'
             'can_unenroll': if status allows for unenrollment
     """
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id)
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, linkedin_config)
 
 
-def _cert_info(user, course_overview, cert_status):
+def _cert_info(user, course_overview, cert_status, linkedin_config=None):
     """
     Implements the logic for cert_info -- split out for testing.
 
     Arguments:
         user (User): A user.
         course_overview (CourseOverview): A course.
+        cert_status (dict): The user's certificate status in the course.
+        linkedin_config (LinkedInAddToProfileConfiguration): The current
+            LinkedIn configuration, if it was already retrieved.
     """
     # simplify the status for the template using this lookup table
     template_state = {
@@ -542,7 +553,8 @@ def _cert_info(user, course_overview, cert_status):
             # If enabled, show the LinkedIn "add to profile" button
             # Clicking this button sends the user to LinkedIn where they
             # can add the certificate information to their profile.
-            linkedin_config = LinkedInAddToProfileConfiguration.current()
+            if linkedin_config is None:
+                linkedin_config = LinkedInAddToProfileConfiguration.current()
 
             # posting certificates to LinkedIn is not currently
             # supported in White Labels
@@ -30,7 +30,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
-from django.db import IntegrityError, models
+from django.db import IntegrityError, models, transaction
 from django.db.models import Count, Q
 from django.db.models.signals import post_save, pre_save
 from django.db.utils import ProgrammingError
@@ -1098,11 +1098,26 @@ class CourseEnrollment(models.Model):
 
     objects = CourseEnrollmentManager()
 
-    # cache key format e.g enrollment.<username>.<course_key>.mode = 'honor'
-    COURSE_ENROLLMENT_CACHE_KEY = u"enrollment.{}.{}.mode"  # TODO Can this be removed?  It doesn't seem to be used.
+    # Enrollment states (CourseEnrollmentState) are cached for the duration of
+    # a request in the MODE_CACHE_NAMESPACE request cache, and across requests
+    # in the django cache, for ENROLLMENT_STATE_CACHE_TIMEOUT seconds, with
+    # keys of the format enrollment.<user_id>.<course_key>.versioned_mode
+    #
+    # The django cache stores (generation, state) tuples.  A state is only
+    # valid while its generation is the current one, cached without expiry
+    # under enrollment.<user_id>.<course_key>.generation; saving or deleting
+    # an enrollment starts a new generation once committed.
+    COURSE_ENROLLMENT_CACHE_KEY = u"enrollment.{}.{}.versioned_mode"
+    COURSE_ENROLLMENT_GENERATION_CACHE_KEY = u"enrollment.{}.{}.generation"
+    ENROLLMENT_STATE_CACHE_TIMEOUT = 60 * 60
 
     MODE_CACHE_NAMESPACE = u'CourseEnrollment.mode_and_active'
 
+    # Enrollments already loaded during a request can be cached for the rest
+    # of it in the ENROLLMENT_CACHE_NAMESPACE request cache, keyed by
+    # (user_id, course_key), so that get_enrollment doesn't load them again.
+    ENROLLMENT_CACHE_NAMESPACE = u'CourseEnrollment.enrollment'
+
     class Meta(object):
         unique_together = (('user', 'course'),)
         ordering = ('user', 'course')
@@ -1126,6 +1141,17 @@ class CourseEnrollment(models.Model):
         # Delete the cached status hash, forcing the value to be recalculated the next time it is needed.
         cache.delete(self.enrollment_status_hash_cache_key(self.user))
 
+        # Write the new enrollment state through to the enrollment state caches.  The
+        # shared cache is only updated once the new state is committed (until then,
+        # invalidate_enrollment_mode_cache has removed it), so that other processes
+        # can't cache a state that may yet be rolled back.
+        enrollment_state = CourseEnrollmentState(self.mode, self.is_active)
+        self._update_enrollment_in_request_cache(self.user, self.course_id, enrollment_state)
+        user_id, course_key = self.user_id, self.course_id
+        transaction.on_commit(
+            lambda: self._cache_committed_enrollment_state(user_id, course_key, enrollment_state)
+        )
+
     @classmethod
     def get_or_create_enrollment(cls, user, course_key):
         """
@@ -1190,6 +1216,9 @@ class CourseEnrollment(models.Model):
 
         if user.is_anonymous:
             return None
+        cached_enrollment = RequestCache(cls.ENROLLMENT_CACHE_NAMESPACE).data.get((user.id, course_key))
+        if cached_enrollment is not None:
+            return cached_enrollment
         try:
             query = cls.objects
             if select_related is not None:
@@ -1238,11 +1267,6 @@ class CourseEnrollment(models.Model):
 
         if activation_changed or mode_changed:
             self.save()
-            self._update_enrollment_in_request_cache(
-                self.user,
-                self.course_id,
-                CourseEnrollmentState(self.mode, self.is_active),
-            )
 
         if activation_changed:
             if self.is_active:
@@ -1908,6 +1932,33 @@ class CourseEnrollment(models.Model):
         """
         return cls.COURSE_ENROLLMENT_CACHE_KEY.format(user_id, text_type(course_key))
 
+    @classmethod
+    def generation_cache_key_name(cls, user_id, course_key):
+        """
+        Returns the key of the current generation of the cached enrollment
+        state of the given user in the given course.
+        """
+        return cls.COURSE_ENROLLMENT_GENERATION_CACHE_KEY.format(user_id, text_type(course_key))
+
+    @classmethod
+    def _cache_committed_enrollment_state(cls, user_id, course_key, enrollment_state):
+        """
+        Starts a new generation of the cached enrollment state of the given
+        user in the given course, with the given state, which was committed.
+        States cached under previous generations, such as those read from
+        the database before the commit, are ignored from now on.
+
+        If enrollment_state is None, only the new generation is started.
+        """
+        generation = uuid.uuid4().hex
+        cache.set(cls.generation_cache_key_name(user_id, course_key), generation, None)
+        if enrollment_state is not None:
+            cache.set(
+                cls.cache_key_name(user_id, course_key),
+                (generation, enrollment_state),
+                cls.ENROLLMENT_STATE_CACHE_TIMEOUT,
+            )
+
     @classmethod
     def _get_enrollment_state(cls, user, course_key):
         """
@@ -1920,12 +1971,7 @@ class CourseEnrollment(models.Model):
             return CourseEnrollmentState(None, None)
         enrollment_state = cls._get_enrollment_in_request_cache(user, course_key)
         if not enrollment_state:
-            try:
-                record = cls.objects.get(user=user, course_id=course_key)
-                enrollment_state = CourseEnrollmentState(record.mode, record.is_active)
-            except cls.DoesNotExist:
-                enrollment_state = CourseEnrollmentState(None, None)
-            cls._update_enrollment_in_request_cache(user, course_key, enrollment_state)
+            enrollment_state = cls._fetch_enrollment_states([user.id], [course_key])[(user.id, course_key)]
         return enrollment_state
 
     @classmethod
@@ -1933,16 +1979,106 @@ class CourseEnrollment(models.Model):
         """
         Bulk pre-fetches the enrollment states for the given users
         for the given course.
+
+        Returns a dict mapping the ids of the users to their
+        CourseEnrollmentState in the course.
         """
         # before populating the cache with another bulk set of data,
         # remove previously cached entries to keep memory usage low.
         RequestCache(cls.MODE_CACHE_NAMESPACE).clear()
 
-        records = cls.objects.filter(user__in=users, course_id=course_key).select_related('user')
+        enrollment_states = cls._fetch_enrollment_states([user.id for user in users], [course_key])
+        return {user_id: enrollment_state for (user_id, __), enrollment_state in six.iteritems(enrollment_states)}
+
+    @classmethod
+    def cache_enrollments_in_request(cls, enrollments):
+        """
+        Caches the given enrollments, which were already loaded, for the rest
+        of the request, so that get_enrollment returns them rather than
+        loading them again.
+        """
+        RequestCache(cls.ENROLLMENT_CACHE_NAMESPACE).data.update(
+            ((enrollment.user_id, enrollment.course_id), enrollment)
+            for enrollment in enrollments
+        )
+
+    @classmethod
+    def bulk_fetch_enrollment_states_for_user(cls, user, course_keys):  # pylint: disable=invalid-name
+        """
+        Bulk pre-fetches the enrollment states of the given user
+        in the given courses.
+
+        Returns a dict mapping the course keys to the user's
+        CourseEnrollmentState in the course.
+        """
+        if user.is_anonymous:
+            return {course_key: CourseEnrollmentState(None, None) for course_key in course_keys}
+
         cache = cls._get_mode_active_request_cache()
-        for record in records:
-            enrollment_state = CourseEnrollmentState(record.mode, record.is_active)
-            cls._update_enrollment(cache, record.user.id, course_key, enrollment_state)
+        enrollment_states = {course_key: cache.get((user.id, course_key)) for course_key in course_keys}
+        missing_course_keys = [course_key for course_key, state in six.iteritems(enrollment_states) if not state]
+        if missing_course_keys:
+            for (__, course_key), enrollment_state in six.iteritems(
+                cls._fetch_enrollment_states([user.id], missing_course_keys)
+            ):
+                enrollment_states[course_key] = enrollment_state
+        return enrollment_states
+
+    @classmethod
+    def _fetch_enrollment_states(cls, user_ids, course_keys):
+        """
+        Returns a dict mapping each (user_id, course_key) of the given users
+        and courses to the user's CourseEnrollmentState in the course, looked
+        up in the django cache, then in the database, and caches them in the
+        request cache.  Reading the django cache, querying the database, and
+        caching the states read from it are each at most one round trip,
+        however many users and courses are given.
+        """
+        cache_keys = {
+            (user_id, course_key): (
+                cls.cache_key_name(user_id, course_key),
+                cls.generation_cache_key_name(user_id, course_key),
+            )
+            for user_id in user_ids
+            for course_key in course_keys
+        }
+        cached = cache.get_many([key for keys in six.itervalues(cache_keys) for key in keys])
+
+        enrollment_states = {}
+        missing = {}
+        for key, (cache_key, generation_cache_key) in six.iteritems(cache_keys):
+            generation = cached.get(generation_cache_key)
+            cached_state = cached.get(cache_key)
+            if cached_state is not None and cached_state[0] == generation:
+                enrollment_states[key] = cached_state[1]
+            else:
+                missing[key] = generation
+
+        if missing:
+            fetched_states = {key: CourseEnrollmentState(None, None) for key in missing}
+            records = cls.objects.filter(
+                user_id__in={user_id for user_id, __ in missing},
+                course_id__in={course_key for __, course_key in missing},
+            ).values_list('user_id', 'course_id', 'mode', 'is_active')
+            for user_id, course_key, mode, is_active in records:
+                if (user_id, course_key) in missing:
+                    fetched_states[(user_id, course_key)] = CourseEnrollmentState(mode, is_active)
+            # The fetched states are cached under the generation read before the
+            # database was queried, so that they're ignored if they overwrite the
+            # state of a save committed meanwhile, which started a new generation.
+            cache.set_many(
+                {
+                    cache_keys[key][0]: (missing[key], enrollment_state)
+                    for key, enrollment_state in six.iteritems(fetched_states)
+                },
+                cls.ENROLLMENT_STATE_CACHE_TIMEOUT,
+            )
+            enrollment_states.update(fetched_states)
+
+        request_cache = cls._get_mode_active_request_cache()
+        for (user_id, course_key), enrollment_state in six.iteritems(enrollment_states):
+            cls._update_enrollment(request_cache, user_id, course_key, enrollment_state)
+        return enrollment_states
 
     @classmethod
     def _get_mode_active_request_cache(cls):
@@ -1984,10 +2120,19 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     """
 
     cache_key = CourseEnrollment.cache_key_name(
-        instance.user.id,
+        instance.user_id,
         text_type(instance.course_id)
     )
     cache.delete(cache_key)
+    RequestCache(CourseEnrollment.ENROLLMENT_CACHE_NAMESPACE).data.pop((instance.user_id, instance.course_id), None)
+    if kwargs.get('signal') is models.signals.post_delete:
+        RequestCache(CourseEnrollment.MODE_CACHE_NAMESPACE).data.pop((instance.user_id, instance.course_id), None)
+        user_id, course_key = instance.user_id, instance.course_id
+        transaction.on_commit(
+            lambda: CourseEnrollment._cache_committed_enrollment_state(  # pylint: disable=protected-access
+                user_id, course_key, None,
+            )
+        )
 
 
 class ManualEnrollmentAudit(models.Model):
@@ -5,6 +5,7 @@ import hashlib
 
 import ddt
 import factory
+import mock
 import pytz
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
@@ -22,6 +23,7 @@ from openedx.core.djangolib.testing.utils import skip_unless_lms
 from student.models import (
     CourseEnrollment,
     CourseEnrollmentAllowed,
+    CourseEnrollmentState,
     PendingEmailChange,
     ManualEnrollmentAudit,
     ALLOWEDTOENROLL_TO_ENROLLED,
@@ -32,6 +34,7 @@ from student.tests.factories import CourseEnrollmentFactory, UserFactory, Accoun
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 from django.test import TestCase
+from edx_django_utils.cache import RequestCache
 
 
 @ddt.ddt
@@ -107,6 +110,96 @@ class CourseEnrollmentTests(SharedModuleStoreTestCase):
         CourseEnrollmentFactory.create(user=self.user)
         self.assertIsNone(cache.get(CourseEnrollment.enrollment_status_hash_cache_key(self.user)))
 
+    def _clear_enrollment_state_request_cache(self):
+        """ Clear the request cache of enrollment states, as if in a new request. """
+        RequestCache(CourseEnrollment.MODE_CACHE_NAMESPACE).clear()
+
+    def test_enrollment_state_shared_cache(self):
+        """ Verify enrollment states are cached across requests, and invalidated when they change. """
+        enrollment = CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, mode=CourseMode.AUDIT)
+        self._clear_enrollment_state_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.user, self.course.id), ('audit', True))
+
+        self._clear_enrollment_state_request_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.user, self.course.id), ('audit', True))
+
+        enrollment.update_enrollment(mode=CourseMode.VERIFIED)
+        with self.assertNumQueries(0):
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.user, self.course.id), ('verified', True))
+        self._clear_enrollment_state_request_cache()
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.user, self.course.id), ('verified', True))
+
+        enrollment.delete()
+        self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.course.id))
+        self._clear_enrollment_state_request_cache()
+        self.assertFalse(CourseEnrollment.is_enrolled(self.user, self.course.id))
+
+    def test_bulk_fetch_enrollment_states(self):
+        """ Verify the enrollment states of many users in a course are fetched at once. """
+        CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, mode=CourseMode.VERIFIED)
+        CourseEnrollmentFactory.create(user=self.user_2, course_id=self.course.id, is_active=False)
+        user_3 = UserFactory()
+
+        with self.assertNumQueries(1):
+            enrollment_states = CourseEnrollment.bulk_fetch_enrollment_states(
+                [self.user, self.user_2, user_3], self.course.id
+            )
+        self.assertEqual(enrollment_states, {
+            self.user.id: ('verified', True),
+            self.user_2.id: ('audit', False),
+            user_3.id: (None, None),
+        })
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseEnrollment.is_enrolled(self.user, self.course.id))
+            self.assertFalse(CourseEnrollment.is_enrolled(self.user_2, self.course.id))
+            self.assertFalse(CourseEnrollment.is_enrolled(user_3, self.course.id))
+
+    def test_fetched_enrollment_state_ignored_after_concurrent_save(self):
+        """ Verify a state read from the database is ignored once a concurrent save is committed. """
+        enrollment = CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, mode=CourseMode.AUDIT)
+        self._clear_enrollment_state_request_cache()
+        set_many = cache.set_many
+
+        def set_many_after_concurrent_save(values, timeout):
+            """ Cache the states read from the database after a save is committed meanwhile. """
+            CourseEnrollment.objects.filter(pk=enrollment.pk).update(mode=CourseMode.VERIFIED)
+            CourseEnrollment._cache_committed_enrollment_state(  # pylint: disable=protected-access
+                self.user.id, self.course.id, CourseEnrollmentState(CourseMode.VERIFIED, True),
+            )
+            set_many(values, timeout)
+
+        with mock.patch.object(cache, 'set_many', side_effect=set_many_after_concurrent_save):
+            self.assertEqual(
+                CourseEnrollment.enrollment_mode_for_user(self.user, self.course.id), (CourseMode.AUDIT, True),
+            )
+
+        self._clear_enrollment_state_request_cache()
+        self.assertEqual(
+            CourseEnrollment.enrollment_mode_for_user(self.user, self.course.id), (CourseMode.VERIFIED, True),
+        )
+
+    def test_bulk_fetch_enrollment_states_for_user(self):
+        """ Verify the enrollment states of a user in many courses are fetched at once. """
+        other_course_id = CourseKey.from_string('course-v1:edX+Other+Run')
+        unenrolled_course_id = CourseKey.from_string('course-v1:edX+Unenrolled+Run')
+        CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, mode=CourseMode.VERIFIED)
+        CourseEnrollmentFactory.create(user=self.user, course_id=other_course_id, mode=CourseMode.AUDIT)
+        self._clear_enrollment_state_request_cache()
+
+        with self.assertNumQueries(1):
+            enrollment_states = CourseEnrollment.bulk_fetch_enrollment_states_for_user(
+                self.user, [self.course.id, other_course_id, unenrolled_course_id]
+            )
+        self.assertEqual(enrollment_states, {
+            self.course.id: ('verified', True),
+            other_course_id: ('audit', True),
+            unenrolled_course_id: (None, None),
+        })
+        with self.assertNumQueries(0):
+            self.assertEqual(CourseEnrollment.enrollment_mode_for_user(self.user, other_course_id), ('audit', True))
+
     def test_users_enrolled_in_active_only(self):
         """CourseEnrollment.users_enrolled_in should return only Users with active enrollments when
         `include_inactive` has its default value (False)."""
@@ -6,22 +6,30 @@ import json
 import re
 import unittest
 from datetime import timedelta, datetime
+from uuid import uuid4
 
 import ddt
+from completion.models import BlockCompletion
 from completion.test_utils import submit_completions_for_testing, CompletionWaffleTestMixin
 from django.conf import settings
+from django.db import connection
 from django.urls import reverse
 from django.test import RequestFactory, TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils.timezone import now
+from edx_django_utils.cache import RequestCache
 from mock import patch
 from opaque_keys import InvalidKeyError
 
 from bulk_email.models import BulkEmailFlag
 from course_modes.models import CourseMode
+from course_modes.tests.factories import CourseModeFactory
 from entitlements.tests.factories import CourseEntitlementFactory
+from lms.djangoapps.certificates.models import CertificateStatuses
+from lms.djangoapps.certificates.tests.factories import GeneratedCertificateFactory
 from milestones.tests.utils import MilestonesTestCaseMixin
 from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.locator import CourseLocator
 from openedx.core.djangoapps.catalog.tests.factories import ProgramFactory
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
@@ -36,7 +44,8 @@ from openedx.features.course_experience.tests.views.helpers import add_course_mo
 from student.helpers import DISABLE_UNENROLL_CERT_STATES
 from student.models import CourseEnrollment, UserProfile
 from student.signals import REFUND_ORDER
-from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from student.tests.factories import TEST_PASSWORD, CourseEnrollmentFactory, UserFactory
+from student.views.dashboard import DashboardDataLoader
 from util.milestones_helpers import (get_course_milestones,
                                      remove_prerequisite_course,
                                      set_prerequisite_courses)
@@ -69,7 +78,7 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
         self.cert_status = 'processing'
         self.client.login(username=self.user.username, password=PASSWORD)
 
-    def mock_cert(self, _user, _course_overview):
+    def mock_cert(self, _user, _course_overview, _cert_status=None):
         """ Return a preset certificate status. """
         return {
             'status': self.cert_status,
@@ -506,12 +515,12 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
         self.assertIn('Related Programs:', response.content)
 
     @patch('openedx.core.djangoapps.catalog.utils.get_course_runs_for_course')
-    @patch.object(BulkEmailFlag, 'feature_enabled')
+    @patch.object(BulkEmailFlag, 'feature_enabled_for_courses')
     def test_email_settings_fulfilled_entitlement(self, mock_email_feature, mock_get_course_runs):
         """
         Assert that the Email Settings action is shown when the user has a fulfilled entitlement.
         """
-        mock_email_feature.return_value = True
+        mock_email_feature.side_effect = set
         course_overview = CourseOverviewFactory(
             start=self.TOMORROW, self_paced=True, enrollment_end=self.TOMORROW
         )
@@ -527,12 +536,12 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
         self.assertEqual(pq(response.content)(self.EMAIL_SETTINGS_ELEMENT_ID).length, 1)
 
     @patch.object(CourseOverview, 'get_from_id')
-    @patch.object(BulkEmailFlag, 'feature_enabled')
+    @patch.object(BulkEmailFlag, 'feature_enabled_for_courses')
     def test_email_settings_unfulfilled_entitlement(self, mock_email_feature, mock_course_overview):
         """
         Assert that the Email Settings action is not shown when the entitlement is not fulfilled.
         """
-        mock_email_feature.return_value = True
+        mock_email_feature.side_effect = set
         mock_course_overview.return_value = CourseOverviewFactory(start=self.TOMORROW)
         CourseEntitlementFactory(user=self.user)
         response = self.client.get(self.path)
@@ -870,6 +879,102 @@ class StudentDashboardTests(SharedModuleStoreTestCase, MilestonesTestCaseMixin,
             )
 
 
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class DashboardDataLoaderTests(TestCase):
+    """
+    Tests for loading the dashboard data of all of a user's enrollments at once.
+    """
+    def setUp(self):
+        super(DashboardDataLoaderTests, self).setUp()
+        self.user = UserFactory()
+        self.request = RequestFactory().get(reverse('dashboard'))
+        self.request.user = self.user
+        BulkEmailFlag.objects.create(enabled=True, require_course_email_auth=True)
+
+    def _enroll(self, number_of_courses):
+        """
+        Enroll the user as verified in the given number of new courses,
+        complete a block in each, and give them a certificate in each.
+        """
+        for __ in xrange(number_of_courses):
+            course_key = CourseLocator('edX', 'toy', 'run{}'.format(CourseEnrollment.objects.count()))
+            enrollment = CourseEnrollmentFactory(user=self.user, mode=CourseMode.VERIFIED, course__id=course_key)
+            CourseModeFactory(course_id=enrollment.course_id, mode_slug=CourseMode.AUDIT)
+            CourseModeFactory(course_id=enrollment.course_id, mode_slug=CourseMode.VERIFIED)
+            block_key = enrollment.course_id.make_usage_key('video', 'video')
+            BlockCompletion.objects.create(
+                user=self.user,
+                course_key=enrollment.course_id,
+                block_type=block_key.block_type,
+                block_key=block_key,
+                completion=1.0,
+            )
+            GeneratedCertificateFactory(
+                user=self.user,
+                course_id=enrollment.course_id,
+                mode=CourseMode.VERIFIED,
+                status=CertificateStatuses.downloadable,
+                download_url='http://www.example.com/certificate.pdf',
+                grade='0.95',
+                verify_uuid=uuid4().hex,
+            )
+
+    def _load_dashboard_data(self):
+        """
+        Load all the dashboard data of the user's enrollments, and return the
+        number of queries it took.
+        """
+        RequestCache.clear_all_namespaces()
+        course_enrollments = list(CourseEnrollment.enrollments_for_user_with_overviews_preload(self.user))
+        dashboard_data = DashboardDataLoader(self.request, course_enrollments)
+        with CaptureQueriesContext(connection) as queries:
+            __ = dashboard_data.course_mode_info
+            __ = dashboard_data.cert_statuses
+            __ = dashboard_data.show_courseware_links_for
+            __ = dashboard_data.verify_status_by_course
+            __ = dashboard_data.show_email_settings_for
+            __ = dashboard_data.block_courses
+            __ = dashboard_data.enrolled_courses_either_paid
+            __ = dashboard_data.resume_button_urls
+        return dashboard_data, len(queries)
+
+    def test_query_count_does_not_grow_with_enrollments(self):
+        self._enroll(1)
+        __, query_count = self._load_dashboard_data()
+
+        self._enroll(4)
+        dashboard_data, query_count_with_more_enrollments = self._load_dashboard_data()
+
+        self.assertEqual(query_count_with_more_enrollments, query_count)
+        self.assertEqual(len(dashboard_data.resume_button_urls), 5)
+        self.assertTrue(all(dashboard_data.resume_button_urls.values()))
+        self.assertEqual(set(dashboard_data.course_mode_info), set(dashboard_data.course_ids))
+        self.assertTrue(all(dashboard_data.show_courseware_links_for.values()))
+        self.assertTrue(all(
+            cert_status['status'] == 'downloadable' for cert_status in dashboard_data.cert_statuses.values()
+        ))
+
+    def _get_dashboard(self):
+        """
+        Render the dashboard, and return the number of queries it took.  The
+        dashboard is rendered once beforehand, so that the process-wide caches
+        it reads are the same whatever the number of enrollments.
+        """
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_dashboard_query_count_does_not_grow_with_enrollments(self):
+        self.client.login(username=self.user.username, password=TEST_PASSWORD)
+        self._enroll(1)
+        query_count = self._get_dashboard()
+
+        self._enroll(4)
+        self.assertEqual(self._get_dashboard(), query_count)
+
+
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 @override_settings(BRANCH_IO_KEY='test_key')
 class TextMeTheAppViewTests(UrlResetMixin, TestCase):
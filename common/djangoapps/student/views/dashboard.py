@@ -6,16 +6,17 @@ import datetime
 import logging
 from collections import defaultdict
 
-from completion.exceptions import UnavailableCompletionData
-from completion.utilities import get_key_to_last_completed_course_block
+from completion.models import BlockCompletion
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db.models import Max
 from django.urls import reverse
 from django.shortcuts import redirect
 from django.utils.translation import ugettext as _
 from django.views.decorators.csrf import ensure_csrf_cookie
 from edx_django_utils import monitoring as monitoring_utils
+from lazy import lazy
 from opaque_keys.edx.keys import CourseKey
 from pytz import UTC
 from six import text_type, iteritems
@@ -26,7 +27,9 @@ from course_modes.models import CourseMode
 from courseware.access import has_access
 from edxmako.shortcuts import render_to_response, render_to_string
 from entitlements.models import CourseEntitlement
+from lms.djangoapps.certificates.models import certificate_statuses_for_student  # pylint: disable=import-error
 from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=import-error
+from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.catalog.utils import (
     get_programs,
@@ -43,6 +46,7 @@ from openedx.core.djangoapps.user_api.accounts.utils import is_secondary_email_f
 from openedx.core.djangolib.markup import HTML, Text
 from openedx.features.enterprise_support.api import get_dashboard_consent_notification
 from openedx.features.enterprise_support.utils import is_enterprise_learner
+from openedx.features.course_duration_limits.models import CourseDurationLimitConfig
 from openedx.features.journals.api import journals_enabled
 from shoppingcart.api import order_history
 from shoppingcart.models import CourseRegistrationCode, DonationConfiguration
@@ -53,6 +57,7 @@ from student.models import (
     CourseEnrollment,
     CourseEnrollmentAttribute,
     DashboardConfiguration,
+    LinkedInAddToProfileConfiguration,
     UserProfile
 )
 from util.milestones_helpers import get_pre_requisite_courses_not_completed
@@ -519,20 +524,187 @@ def _get_urls_for_resume_buttons(user, enrollments):
     '''
     Checks whether a user has made progress in any of a list of enrollments.
     '''
+    # Find the last completed block of each course, with one query for the
+    # time of the last completion in each course and one for the blocks.
+    course_ids = [enrollment.course_id for enrollment in enrollments]
+    last_completion_times = {
+        completion['course_key']: completion['last_modified']
+        for completion in BlockCompletion.objects.filter(
+            user=user,
+            course_key__in=course_ids,
+        ).values('course_key').annotate(last_modified=Max('modified'))
+    }
+    last_completed_block_keys = {}
+    if last_completion_times:
+        for completion in BlockCompletion.objects.filter(
+            user=user,
+            course_key__in=list(last_completion_times),
+            modified__in=list(last_completion_times.values()),
+        ):
+            if completion.modified == last_completion_times[completion.course_key]:
+                last_completed_block_keys[completion.course_key] = completion.block_key
+
     resume_button_urls = []
     for enrollment in enrollments:
-        try:
-            block_key = get_key_to_last_completed_course_block(user, enrollment.course_id)
+        block_key = last_completed_block_keys.get(enrollment.course_id)
+        if block_key is not None:
             url_to_block = reverse(
                 'jump_to',
                 kwargs={'course_id': enrollment.course_id, 'location': block_key}
             )
-        except UnavailableCompletionData:
+        else:
             url_to_block = ''
         resume_button_urls.append(url_to_block)
     return resume_button_urls
 
 
+class DashboardDataLoader(object):
+    """
+    Loads the data displayed on the dashboard for each of a user's course
+    enrollments, for all of the enrollments at once, so that the number of
+    queries it takes doesn't grow with the number of enrollments.
+    """
+    def __init__(self, request, course_enrollments):
+        self.request = request
+        self.user = request.user
+        self.course_enrollments = course_enrollments
+        self.course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+    @lazy
+    def course_modes_by_course(self):
+        """
+        Returns a dict mapping each course id to a dict of its unexpired
+        course modes, by slug.
+        """
+        __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(self.course_ids)
+        return {
+            course_id: {
+                mode.slug: mode
+                for mode in modes
+            }
+            for course_id, modes in iteritems(unexpired_course_modes)
+        }
+
+    @lazy
+    def course_mode_info(self):
+        """
+        Returns a dict mapping each course id to the course mode information
+        used to render the course list.
+        """
+        return {
+            enrollment.course_id: complete_course_mode_info(
+                enrollment.course_id, enrollment,
+                modes=self.course_modes_by_course[enrollment.course_id]
+            )
+            for enrollment in self.course_enrollments
+        }
+
+    @lazy
+    def cert_statuses(self):
+        """
+        Returns a dict mapping each course id to the user's certificate info
+        for the course.
+        """
+        cert_statuses = certificate_statuses_for_student(self.user, self.course_ids)
+        linkedin_config = LinkedInAddToProfileConfiguration.current()
+        # The certificate info of most statuses includes the user's grade.
+        PersistentCourseGrade.prefetch_for_user(self.user, self.course_ids)
+        try:
+            return {
+                enrollment.course_id: cert_info(
+                    self.user, enrollment.course_overview, cert_statuses[enrollment.course_id], linkedin_config
+                )
+                for enrollment in self.course_enrollments
+            }
+        finally:
+            for course_id in self.course_ids:
+                PersistentCourseGrade.clear_prefetched_data(course_id)
+
+    @lazy
+    def show_courseware_links_for(self):
+        """
+        Returns a dict mapping each course id to whether the user can load
+        the course's courseware.  The enrollments and the course duration
+        limit configurations the access checks depend on are loaded for all
+        the courses at once.
+        """
+        CourseEnrollment.cache_enrollments_in_request(self.course_enrollments)
+        CourseDurationLimitConfig.prefetch_course_configs(self.course_ids)
+        return {
+            enrollment.course_id: has_access(self.user, 'load', enrollment.course_overview)
+            for enrollment in self.course_enrollments
+        }
+
+    @lazy
+    def verify_status_by_course(self):
+        """
+        Returns a dict mapping course ids to the user's verification status
+        for the course, for the courses that have one.
+        """
+        return check_verify_status_by_course(self.user, self.course_enrollments)
+
+    @lazy
+    def show_email_settings_for(self):
+        """
+        Returns the set of the ids of the courses for which bulk email is
+        available.
+        """
+        return frozenset(BulkEmailFlag.feature_enabled_for_courses(self.course_ids))
+
+    @lazy
+    def block_courses(self):
+        """
+        Returns the set of the ids of the courses that are blocked because
+        the registration code the user redeemed in them has an invalid
+        invoice.
+        """
+        redeemed_registration_codes = defaultdict(list)
+        for registration_code in CourseRegistrationCode.objects.filter(
+            course_id__in=self.course_ids,
+            registrationcoderedemption__redeemed_by=self.user
+        ).select_related('invoice_item__invoice'):
+            redeemed_registration_codes[registration_code.course_id].append(registration_code)
+
+        return frozenset(
+            course_id for course_id, registration_codes in iteritems(redeemed_registration_codes)
+            if is_course_blocked(self.request, registration_codes, course_id)
+        )
+
+    @lazy
+    def enrolled_courses_either_paid(self):
+        """
+        Returns the set of the ids of the paid courses the user is enrolled in.
+        """
+        return frozenset(
+            enrollment.course_id for enrollment in self.course_enrollments
+            if CourseMode.is_professional_slug(enrollment.mode) or CourseMode.is_white_label(
+                enrollment.course_id,
+                modes_dict=self._selectable_modes(enrollment.course_id),
+            )
+        )
+
+    def _selectable_modes(self, course_id):
+        """
+        Returns a dict of the unexpired course modes of the given course that
+        are shown to users on the track selection page, by slug, like
+        CourseMode.modes_for_course_dict.
+        """
+        modes = {
+            slug: mode
+            for slug, mode in iteritems(self.course_modes_by_course[course_id])
+            if slug not in CourseMode.CREDIT_MODES
+        }
+        return modes or {CourseMode.DEFAULT_MODE_SLUG: CourseMode.DEFAULT_MODE}
+
+    @lazy
+    def resume_button_urls(self):
+        """
+        Returns a dict mapping each course id to the URL of the last block the
+        user completed in the course, or '' if they haven't completed any.
+        """
+        return dict(zip(self.course_ids, _get_urls_for_resume_buttons(self.user, self.course_enrollments)))
+
+
 @login_required
 @ensure_csrf_cookie
 @add_maintenance_banner
@@ -595,21 +767,13 @@ def student_dashboard(request):
     # Sort the enrollment pairs by the enrollment date
     course_enrollments.sort(key=lambda x: x.created, reverse=True)
 
-    # Retrieve the course modes for each course
-    enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
-    course_modes_by_course = {
-        course_id: {
-            mode.slug: mode
-            for mode in modes
-        }
-        for course_id, modes in iteritems(unexpired_course_modes)
-    }
+    # Load the data displayed for each enrollment, for all of them at once.
+    dashboard_data = DashboardDataLoader(request, course_enrollments)
 
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
     enrollment_message = _create_recent_enrollment_message(
-        course_enrollments, course_modes_by_course
+        course_enrollments, dashboard_data.course_modes_by_course
     )
     course_optouts = Optout.objects.filter(user=user).values_list('course_id', flat=True)
 
@@ -674,10 +838,7 @@ def student_dashboard(request):
         staff_access = True
         errored_courses = modulestore().get_errored_courses()
 
-    show_courseware_links_for = {
-        enrollment.course_id: has_access(request.user, 'load', enrollment.course_overview)
-        for enrollment in course_enrollments
-    }
+    show_courseware_links_for = dashboard_data.show_courseware_links_for
 
     # Find programs associated with course runs being displayed. This information
     # is passed in the template context to allow rendering of program-related
@@ -707,13 +868,7 @@ def student_dashboard(request):
     # Construct a dictionary of course mode information
     # used to render the course list.  We re-use the course modes dict
     # we loaded earlier to avoid hitting the database.
-    course_mode_info = {
-        enrollment.course_id: complete_course_mode_info(
-            enrollment.course_id, enrollment,
-            modes=course_modes_by_course[enrollment.course_id]
-        )
-        for enrollment in course_enrollments
-    }
+    course_mode_info = dashboard_data.course_mode_info
 
     # Determine the per-course verification status
     # This is a dictionary in which the keys are course locators
@@ -729,18 +884,11 @@ def student_dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview)
-        for enrollment in course_enrollments
-    }
+    verify_status_by_course = dashboard_data.verify_status_by_course
+    cert_statuses = dashboard_data.cert_statuses
 
     # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            BulkEmailFlag.feature_enabled(enrollment.course_id)
-        )
-    )
+    show_email_settings_for = dashboard_data.show_email_settings_for
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -751,22 +899,9 @@ def student_dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    block_courses = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if is_course_blocked(
-            request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
-            enrollment.course_id
-        )
-    )
+    block_courses = dashboard_data.block_courses
 
-    enrolled_courses_either_paid = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
-    )
+    enrolled_courses_either_paid = dashboard_data.enrolled_courses_either_paid
 
     # If there are *any* denied reverifications that have not been toggled off,
     # we'll display the banner
@@ -871,8 +1006,8 @@ def student_dashboard(request):
 
     # Gather urls for course card resume buttons.
     resume_button_urls = ['' for entitlement in course_entitlements]
-    for url in _get_urls_for_resume_buttons(user, course_enrollments):
-        resume_button_urls.append(url)
+    for enrollment in course_enrollments:
+        resume_button_urls.append(dashboard_data.resume_button_urls[enrollment.course_id])
     # There must be enough urls for dashboard.html. Template creates course
     # cards for "enrollments + entitlements".
     context.update({
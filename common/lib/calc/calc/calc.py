@@ -8,6 +8,8 @@ from __future__ import absolute_import
 import math
 import numbers
 import operator
+import threading
+from collections import OrderedDict
 
 import numpy
 from pyparsing import (
@@ -83,6 +85,9 @@ SUFFIXES = {
     '%': 0.01,
 }
 
+# How many parsed expressions to keep in each process.
+PARSE_CACHE_SIZE = 1024
+
 
 class UndefinedVariable(Exception):
     """
@@ -242,39 +247,67 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
+    return evaluate_samples([variables], functions, math_expr, case_sensitive)[0]
+
+
+def evaluate_samples(variables_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression once for each dictionary of variables in
+    `variables_list`, and return the list of results.
+
+    The expression is only parsed once (and not at all if it was parsed
+    recently), so prefer this to calling `evaluator` for each sample.
+    """
     # No need to go further.
     if math_expr.strip() == "":
-        return float('nan')
+        return [float('nan')] * len(variables_list)
 
     # Parse the tree.
-    check_parens(math_expr)
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    math_interpreter = parse_cached(math_expr, case_sensitive)
+    compiled_expr = math_interpreter.compile()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    # Get our functions together; only the variables change between samples.
+    default_variables, all_functions = add_defaults({}, functions, case_sensitive)
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
+    results = []
+    for variables in variables_list:
+        all_variables = dict(default_variables)
+        all_variables.update(variables if case_sensitive else lower_dict(variables))
+
+        # ...and check them
+        math_interpreter.check_variables(all_variables, all_functions)
+
+        results.append(compiled_expr(all_variables, all_functions))
+    return results
+
+
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+def parse_cached(math_expr, case_sensitive=False):
+    """
+    Return a parsed `ParseAugmenter` for the expression, reusing one of the
+    last `PARSE_CACHE_SIZE` expressions parsed in this process if possible.
+
+    The returned object is shared, so don't modify it.
+    """
+    key = (math_expr, case_sensitive)
+    with _PARSE_CACHE_LOCK:
+        math_interpreter = _PARSE_CACHE.pop(key, None)
+        if math_interpreter is not None:
+            _PARSE_CACHE[key] = math_interpreter
+            return math_interpreter
+
+    check_parens(math_expr)
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = math_interpreter
+        while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return math_interpreter
 
 
 def check_parens(formula):
@@ -318,6 +351,7 @@ class ParseAugmenter(object):
         self.case_sensitive = case_sensitive
         self.math_expr = math_expr
         self.tree = None
+        self.compiled = None
         self.variables_used = set()
         self.functions_used = set()
 
@@ -449,6 +483,74 @@ class ParseAugmenter(object):
         # Find the value of the entire tree.
         return handle_node(self.tree)
 
+    def compile(self):
+        """
+        Return a function of the variables and functions dictionaries (as
+        given by `add_defaults`) that evaluates the parsed expression.
+
+        The tree is only reduced once; numbers are converted up front, and
+        each node becomes a closure that applies the same evaluation action
+        as `evaluator` used to.
+        """
+        if self.compiled is not None:
+            return self.compiled
+
+        if self.case_sensitive:
+            casify = lambda x: x
+        else:
+            casify = lambda x: x.lower()  # Lowercase for case insens.
+
+        def compile_constant(parse_result):
+            """Evaluate a number now."""
+            value = eval_number(parse_result)
+            return lambda all_variables, all_functions: value
+
+        def compile_variable(parse_result):
+            """Look up a variable at evaluation time."""
+            name = casify(parse_result[0])
+            return lambda all_variables, all_functions: all_variables[name]
+
+        def compile_function(parse_result):
+            """Look up and call a function at evaluation time."""
+            name, argument = casify(parse_result[0]), parse_result[1]
+            return lambda all_variables, all_functions: all_functions[name](argument(all_variables, all_functions))
+
+        def compile_atom(parse_result):
+            """Return the wrapped expression, ignoring parentheses."""
+            return next(k for k in parse_result if callable(k))
+
+        def compile_action(action, skip_single=False):
+            """
+            Return a function that compiles a node into a closure, which
+            calls `action` on the node's evaluated children and operators.
+
+            If `skip_single`, nodes with a single child are compiled to the
+            child's closure; this is only for actions that would return (or
+            only be followed by a sum of) their only input.
+            """
+            def compile_node(parse_result):
+                """Compile a node made of operators and subexpressions."""
+                if skip_single and len(parse_result) == 1:
+                    return parse_result[0]
+                return lambda all_variables, all_functions: action([
+                    k(all_variables, all_functions) if callable(k) else k
+                    for k in parse_result
+                ])
+            return compile_node
+
+        compile_actions = {
+            'number': compile_constant,
+            'variable': compile_variable,
+            'function': compile_function,
+            'atom': compile_atom,
+            'power': compile_action(eval_power),
+            'parallel': compile_action(eval_parallel, skip_single=True),
+            'product': compile_action(eval_product, skip_single=True),
+            'sum': compile_action(eval_sum),
+        }
+        self.compiled = self.reduce_tree(compile_actions)
+        return self.compiled
+
     def check_variables(self, valid_variables, valid_functions):
         """
         Confirm that all the variables used in the tree are valid/defined.
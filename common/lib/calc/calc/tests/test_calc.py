@@ -4,6 +4,7 @@ Unit tests for calc.py
 
 from __future__ import absolute_import
 import unittest
+import mock
 import numpy
 import calc
 from pyparsing import ParseException
@@ -556,3 +557,59 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({}, {}, "(1+2")
         with self.assertRaisesRegexp(calc.UnmatchedParenthesis, 'no matching opening parenthesis'):
             calc.evaluator({}, {}, "(1+2))")
+
+
+class EvaluateSamplesTest(unittest.TestCase):
+    """
+    Run tests for calc.evaluate_samples, and the caching of parsed expressions.
+    """
+
+    def test_expected_values(self):
+        samples = [{'x': x, 'R': 2.0 * x} for x in (-2.5, 0.5, 3.0, 10.0)]
+        expected_values = {
+            "3*x^2 - x/2 + 1": [21.0, 1.5, 26.5, 296.0],
+            # `||` binds tighter than `*`, and `5%` is 0.05.
+            "sin(x)*R || 4 + 5%": [-11.919442882079132, 0.4335404308833624, 0.38868801934368136, -1.763403702964566],
+            # `-2` is a number, so the exponent is (-2)^2.
+            "-(x + 1)^-2^2": [-5.0625, -5.0625, -256.0, -14641.0],
+            "sqrt(x)": [1.5811388300841898j, 0.7071067811865476, 1.7320508075688772, 3.1622776601683795],
+            "-x": [2.5, -0.5, -3.0, -10.0],
+            "1.5k": [1500.0, 1500.0, 1500.0, 1500.0],
+        }
+        for expr, expected in expected_values.items():
+            results = calc.evaluate_samples(samples, {}, expr)
+            self.assertEqual(len(results), len(expected))
+            for result, expected_result in zip(results, expected):
+                self.assertAlmostEqual(result, expected_result, msg=expr)
+
+    def test_empty_expression(self):
+        results = calc.evaluate_samples([{}, {}], {}, "  ")
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(numpy.isnan(result) for result in results))
+
+    def test_case_sensitivity(self):
+        samples = [{'X': 1.0, 'x': 2.0}, {'X': 3.0, 'x': 4.0}]
+        self.assertEqual(calc.evaluate_samples(samples, {}, "X", case_sensitive=True), [1.0, 3.0])
+        self.assertEqual(calc.evaluate_samples([{'X': 1.0}], {}, "x"), [1.0])
+        with self.assertRaises(calc.UndefinedVariable):
+            calc.evaluate_samples([{'X': 1.0}], {}, "x", case_sensitive=True)
+
+    def test_undefined_variable_in_later_sample(self):
+        with self.assertRaisesRegexp(calc.UndefinedVariable, r'y'):
+            calc.evaluate_samples([{'x': 1.0, 'y': 2.0}, {'x': 1.0}], {}, "x + y")
+
+    def test_expressions_are_parsed_once(self):
+        expr = "2*x + 7.25*cos(x)"
+        with mock.patch.object(calc.ParseAugmenter, 'parse_algebra', autospec=True,
+                               side_effect=calc.ParseAugmenter.parse_algebra) as mock_parse:
+            calc.evaluate_samples([{'x': float(x)} for x in range(20)], {}, expr)
+            calc.evaluator({'x': 1.0}, {}, expr)
+            calc.evaluator({'x': 1.0}, {}, expr, case_sensitive=True)
+        self.assertEqual(mock_parse.call_count, 2)
+
+    def test_invalid_expressions_are_not_cached(self):
+        for __ in range(2):
+            with self.assertRaises(calc.UnmatchedParenthesis):
+                calc.evaluator({}, {}, "(1+2")
+            with self.assertRaises(ParseException):
+                calc.evaluator({}, {}, "1 +* 2")
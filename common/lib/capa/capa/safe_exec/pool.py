@@ -0,0 +1,415 @@
+"""
+A pool of warm sandbox workers for Capa's use of codejail.
+
+Launching a new jailed Python for every execution means paying for the
+interpreter startup and the imports of numpy, scipy and the sandbox packages
+every time.  Instead, each worker in the pool is a long-lived "zygote":
+a Python process which imports the assumed modules once and then waits for
+jobs.
+
+The zygote never runs course code itself.  For each job it forks a child,
+which switches to the sandbox user, drops all capabilities, applies
+codejail's resource limits, runs the code in a fresh temporary directory,
+and reports the resulting globals back over a pipe.
+
+So that jobs can't signal, trace or otherwise tamper with it, the zygote
+runs as its own unprivileged user, which is neither root nor the sandbox
+user (it refuses to run as either).  The only privileges it needs are the
+setuid and setgid capabilities, to switch its children to the sandbox
+user.  They are given to it by its own copy of the sandboxed Python,
+separate from the one codejail runs:
+
+* ``setcap cap_setuid,cap_setgid+ep`` on that copy, which only the pool's
+  user may execute (the children can't regain the capabilities through it
+  either way, since they are started with no_new_privs),
+* an AppArmor profile for that copy which allows those two capabilities,
+  leaving codejail's own profile unchanged,
+* and a sudoers rule allowing the web user to run it as the pool's user.
+
+The child then exits and its directory is removed, so nothing a job does
+can be seen by a later job: every job starts from the same pristine,
+pre-imported state.  Workers are also retired after a configurable number
+of jobs.
+
+If a worker misbehaves, the job is run with codejail as usual.
+"""
+
+import base64
+import json
+import logging
+import os
+import select
+import struct
+import subprocess
+import threading
+import time
+
+from codejail import jail_code
+from codejail.safe_exec import safe_exec as codejail_safe_exec
+from codejail.safe_exec import json_safe, SafeExecException
+
+log = logging.getLogger(__name__)
+
+# The code run by each worker.  It must run on the sandbox's Python 2.
+ZYGOTE_CODE = """\
+import base64, ctypes, ctypes.util, json, os, pwd, random, resource, select, shutil, signal, struct, sys
+import tempfile, time, traceback, uuid
+
+os.environ["OPENBLAS_NUM_THREADS"] = "1"    # See TNL-6456
+
+SANDBOX_USER = %(sandbox_user)r
+if SANDBOX_USER is None:
+    SANDBOX = None
+else:
+    SANDBOX = pwd.getpwnam(SANDBOX_USER)
+    if 0 in os.getresuid() or SANDBOX.pw_uid in os.getresuid():
+        sys.exit("The sandbox worker must not run as root or as the sandbox user")
+
+PR_SET_NO_NEW_PRIVS = 38
+LINUX_CAPABILITY_VERSION_3 = 0x20080522
+LIBC = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+class CapHeader(ctypes.Structure):
+    _fields_ = [("version", ctypes.c_uint32), ("pid", ctypes.c_int)]
+
+class CapData(ctypes.Structure):
+    _fields_ = [("effective", ctypes.c_uint32), ("permitted", ctypes.c_uint32), ("inheritable", ctypes.c_uint32)]
+
+for modname in %(preload)r:
+    try:
+        __import__(modname)
+    except Exception:
+        pass
+
+RLIMITS = [("CPU", resource.RLIMIT_CPU), ("VMEM", resource.RLIMIT_AS), ("FSIZE", resource.RLIMIT_FSIZE)]
+OK_TYPES = (type(None), int, long, float, str, unicode, list, tuple, dict)
+
+def read_frame():
+    header = sys.stdin.read(4)
+    if len(header) < 4:
+        return None
+    size, = struct.unpack(">I", header)
+    return json.loads(sys.stdin.read(size))
+
+def write_frame(obj):
+    data = json.dumps(obj)
+    sys.stdout.write(struct.pack(">I", len(data)) + data)
+    sys.stdout.flush()
+
+def jsonable(value):
+    if not isinstance(value, OK_TYPES):
+        return False
+    try:
+        json.dumps(value)
+    except Exception:
+        return False
+    return True
+
+def check_libc(result, name):
+    if result != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, "%%s failed: %%s" %% (name, os.strerror(errno)))
+
+def drop_privileges():
+    if SANDBOX is None:
+        return
+    os.setgroups([])
+    os.setresgid(SANDBOX.pw_gid, SANDBOX.pw_gid, SANDBOX.pw_gid)
+    os.setresuid(SANDBOX.pw_uid, SANDBOX.pw_uid, SANDBOX.pw_uid)
+    # Switching between unprivileged users keeps the capabilities the zygote
+    # was given, so drop them all, and never gain any again through exec.
+    check_libc(LIBC.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "prctl")
+    header = CapHeader(LINUX_CAPABILITY_VERSION_3, 0)
+    check_libc(LIBC.capset(ctypes.byref(header), (CapData * 2)()), "capset")
+    data = (CapData * 2)()
+    check_libc(LIBC.capget(ctypes.byref(header), data), "capget")
+    if any(cap.effective or cap.permitted or cap.inheritable for cap in data):
+        raise OSError("Capabilities were not dropped")
+
+def run_child(job, tmpdir, result_fd):
+    output = os.fdopen(result_fd, "wb")
+    try:
+        drop_privileges()
+        os.mkdir(tmpdir, 0o700)
+    except Exception:
+        output.write(json.dumps({"worker_error": traceback.format_exc()}))
+        output.close()
+        return
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.chdir(tmpdir)
+    for name, content in job["files"]:
+        with open(name, "wb") as f:
+            f.write(base64.b64decode(content))
+    sys.path[0:0] = [os.path.join(tmpdir, path) for path in job["python_path"]]
+    for name, rlimit in RLIMITS:
+        if job["limits"].get(name):
+            resource.setrlimit(rlimit, (job["limits"][name], job["limits"][name]))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    random.seed()
+    if "numpy.random" in sys.modules:
+        sys.modules["numpy.random"].seed()
+
+    g_dict = job["globals"]
+    try:
+        exec compile(job["code"], "<jailed code>", "exec") in g_dict
+        emsg = None
+    except BaseException:
+        emsg = traceback.format_exc()
+    g_dict = dict((k, v) for k, v in g_dict.iteritems() if k != "__builtins__" and jsonable(v))
+    output.write(json.dumps({"emsg": emsg, "globals": g_dict}))
+    output.close()
+
+def remove_tmpdir(tmpdir):
+    # The directory belongs to the sandbox user, so it's removed as them.
+    pid = os.fork()
+    if pid == 0:
+        try:
+            drop_privileges()
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+def run_job(job):
+    # The child creates the directory once it's the sandbox user.
+    tmpdir = os.path.join(tempfile.gettempdir(), "codejail-" + uuid.uuid4().hex)
+    result_r, result_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(result_r)
+            run_child(job, tmpdir, result_w)
+        finally:
+            os._exit(0)
+
+    os.close(result_w)
+    chunks = []
+    deadline = time.time() + (job["limits"].get("REALTIME") or 3600)
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0 or not select.select([result_r], [], [], remaining)[0]:
+            os.kill(pid, signal.SIGKILL)
+            break
+        chunk = os.read(result_r, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(result_r)
+    __, status = os.waitpid(pid, 0)
+    remove_tmpdir(tmpdir)
+    try:
+        return json.loads("".join(chunks))
+    except ValueError:
+        return {"emsg": "Jailed code exited with status %%d" %% status, "globals": {}}
+
+while True:
+    job = read_frame()
+    if job is None:
+        break
+    write_frame(run_job(job))
+"""
+
+
+class SandboxWorkerError(Exception):
+    """A sandbox worker failed, through no fault of the code it was running."""
+    pass
+
+
+class SandboxWorker(object):
+    """
+    A single zygote process, and the protocol to talk to it: each job and
+    each result is a JSON object, prefixed by its big-endian 32-bit length.
+    """
+    def __init__(self, cmdline, preload, sandbox_user=None):
+        self.jobs_run = 0
+        self._stderr = open(os.devnull, 'wb')
+        self.process = subprocess.Popen(
+            cmdline + ['-c', ZYGOTE_CODE % {'preload': preload, 'sandbox_user': sandbox_user}],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            close_fds=True,
+        )
+
+    def run(self, job, timeout):
+        """
+        Run `job` and return its result, or raise SandboxWorkerError if the
+        worker doesn't produce one within `timeout` seconds.
+        """
+        data = json.dumps(job)
+        try:
+            self.process.stdin.write(struct.pack('>I', len(data)) + data)
+            self.process.stdin.flush()
+        except (IOError, OSError) as exc:
+            raise SandboxWorkerError("Couldn't send job: {}".format(exc))
+
+        deadline = time.time() + timeout
+        size, = struct.unpack('>I', self._read(4, deadline))
+        self.jobs_run += 1
+        try:
+            result = json.loads(self._read(size, deadline))
+        except ValueError as exc:
+            raise SandboxWorkerError("Couldn't read result: {}".format(exc))
+        if result.get('worker_error'):
+            raise SandboxWorkerError("Couldn't start the job: {}".format(result['worker_error']))
+        return result
+
+    def _read(self, size, deadline):
+        """Read exactly `size` bytes from the worker before `deadline`."""
+        fd = self.process.stdout.fileno()
+        chunks = []
+        while size:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise SandboxWorkerError("Timed out waiting for the worker")
+            chunk = os.read(fd, size)
+            if not chunk:
+                raise SandboxWorkerError("The worker exited unexpectedly")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return ''.join(chunks)
+
+    def close(self):
+        """Stop the worker."""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self._stderr.close()
+
+
+class SandboxPool(object):
+    """
+    A thread-safe pool of at most `size` warm sandbox workers.
+
+    `max_jobs_per_worker` is the number of jobs a worker runs before it's
+    replaced by a new one.  `cmdline` is the command that starts a worker's
+    Python; by default, when codejail runs code as a sandbox user, it is
+    `python_bin`, run as `user` with the same options codejail uses.  Jobs
+    are run as `sandbox_user`; by default, it is the sandbox user configured
+    in codejail.  See the module docstring for how `user` and `python_bin`
+    must be set up.
+    """
+    def __init__(self, size, max_jobs_per_worker=100, cmdline=None, preload=(), user=None, python_bin=None,
+                 sandbox_user=None):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.preload = list(preload)
+        self.user = user
+        self.python_bin = python_bin
+        self._cmdline = cmdline
+        self._sandbox_user = sandbox_user
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pid = os.getpid()
+
+    @property
+    def cmdline(self):
+        """
+        The command that starts a worker's Python, the way codejail does.
+        Raises SandboxWorkerError if the pool's user and Python aren't
+        configured.
+        """
+        if self._cmdline is not None:
+            return self._cmdline
+        command = jail_code.COMMANDS['python']
+        if not command['user']:
+            return list(command['cmdline_start'])
+        if not self.user or not self.python_bin:
+            raise SandboxWorkerError("The sandbox pool's user and python_bin aren't configured")
+        return ['sudo', '-u', self.user, self.python_bin] + list(command['cmdline_start'][1:])
+
+    @property
+    def sandbox_user(self):
+        """The user that jobs are run as, if they switch users at all."""
+        if self._sandbox_user is not None or self._cmdline is not None:
+            return self._sandbox_user
+        return jail_code.COMMANDS['python']['user']
+
+    @staticmethod
+    def can_run(python_path, extra_files):
+        """
+        Returns whether a job can be run in the pool: jobs may only add
+        files from `extra_files` to the Python path, since workers can't be
+        given access to any file on the host.
+        """
+        names = set(name for name, __ in extra_files or ())
+        return (
+            all(os.path.basename(name) == name for name in names) and
+            all(path in names for path in python_path or ())
+        )
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Execute `code` in a warm worker, with the same signature and
+        semantics as `codejail.safe_exec.safe_exec`.
+        """
+        if not self.can_run(python_path, extra_files):
+            return codejail_safe_exec(
+                code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug,
+            )
+
+        limits = dict(jail_code.LIMITS)
+        job = {
+            'code': code,
+            'globals': json_safe(globals_dict),
+            'python_path': list(python_path or ()),
+            'files': [(name, base64.b64encode(content)) for name, content in extra_files or ()],
+            'limits': limits,
+        }
+        try:
+            result = self._run(job, timeout=(limits.get('REALTIME') or 3600) + 5)
+        except SandboxWorkerError:
+            log.warning("Sandbox worker failed running %s, running it with codejail instead", slug, exc_info=True)
+            return codejail_safe_exec(
+                code, globals_dict, python_path=python_path, extra_files=extra_files, slug=slug,
+            )
+
+        if result['emsg']:
+            raise SafeExecException("Couldn't execute jailed code: {}".format(result['emsg']))
+        globals_dict.update(result['globals'])
+
+    def _run(self, job, timeout):
+        """Run `job` in an idle worker, starting one if needed."""
+        with self._slots:
+            worker = self._checkout()
+            try:
+                result = worker.run(job, timeout)
+            except SandboxWorkerError:
+                worker.close()
+                raise
+            self._checkin(worker)
+            return result
+
+    def _checkout(self):
+        """Take an idle worker, or start a new one."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # We've been forked: the idle workers belong to our parent.
+                self._idle = []
+                self._pid = os.getpid()
+            if self._idle:
+                return self._idle.pop()
+        cmdline = self.cmdline
+        try:
+            return SandboxWorker(cmdline, self.preload, self.sandbox_user)
+        except OSError as exc:
+            raise SandboxWorkerError("Couldn't start a worker: {}".format(exc))
+
+    def _checkin(self, worker):
+        """Return a worker to the pool, or stop it if it's done enough jobs."""
+        if worker.jobs_run >= self.max_jobs_per_worker:
+            worker.close()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def close(self):
+        """Stop all the idle workers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
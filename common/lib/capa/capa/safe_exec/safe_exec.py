@@ -3,10 +3,15 @@
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
+from codejail.jail_code import is_configured
 from . import lazymod
+from .pool import SandboxPool
 from six import text_type
 
+from collections import OrderedDict
 import hashlib
+import json
+import threading
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -50,6 +55,147 @@ for name, modname in ASSUMED_IMPORTS:
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
 
+class ResultCache(object):
+    """
+    A thread-safe, process-local LRU cache of safe_exec results, kept in
+    front of the cache passed to `safe_exec`, and bounded by the total
+    size of the cached results once serialized to JSON.
+
+    It also keeps hit and miss metrics for both levels of caching, even if
+    it's disabled.
+    """
+    def __init__(self, max_size=0):
+        """
+        Arguments:
+            max_size (int): The maximum total size, in bytes, of the cached
+                results.  A value of 0 disables the cache.
+        """
+        self.max_size = max_size
+        self.current_size = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, shared_cache):
+        """
+        Return the result cached for `key`, here or in `shared_cache`, or
+        None if it isn't cached.
+        """
+        with self._lock:
+            serialized = self._entries.pop(key, None)
+            if serialized is not None:
+                self._entries[key] = serialized
+                self.hits += 1
+                return tuple(json.loads(serialized))
+
+        result = shared_cache.get(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self._set_local(key, result)
+        return result
+
+    def set(self, key, result, shared_cache):
+        """
+        Cache `result` under `key`, here and in `shared_cache`.
+        """
+        shared_cache.set(key, result)
+        self._set_local(key, result)
+
+    def _set_local(self, key, result):
+        """
+        Cache `result` in this process, evicting the least recently used
+        results until the cache fits in `max_size`.  Results are stored
+        serialized, so that callers can't change them.
+        """
+        if not self.max_size:
+            return
+
+        serialized = json.dumps(result)
+        size = len(serialized)
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_size -= len(previous)
+
+            self._entries[key] = serialized
+            self.current_size += size
+
+            while self.current_size > self.max_size:
+                __, evicted = self._entries.popitem(last=False)
+                self.current_size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all cached results and reset the metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+            self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return a dict of the cache size and hit/miss/eviction metrics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.current_size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+RESULT_CACHE = ResultCache()
+
+# The pool of warm sandbox workers, if there is one.  See `configure`.
+SANDBOX_POOL = None
+
+
+def configure(result_cache_size=None, pool_size=None, pool_max_jobs_per_worker=100, pool_user=None,
+              pool_python_bin=None):
+    """
+    Configure Capa's sandboxed execution in this process.
+
+    `result_cache_size` is the maximum total size, in bytes, of the results
+    cached in this process, in front of the cache passed to `safe_exec`.
+
+    `pool_size` is the number of warm sandbox workers to run code in, each
+    of which will be replaced after `pool_max_jobs_per_worker` jobs.  The
+    workers run `pool_python_bin` as `pool_user`, an unprivileged user which
+    can only switch to codejail's sandbox user: see `capa.safe_exec.pool`.
+    The pool is only used once codejail is configured for Python.
+
+    A size of 0 disables the corresponding feature, and None leaves it as
+    it is.
+    """
+    global RESULT_CACHE, SANDBOX_POOL  # pylint: disable=global-statement
+    if result_cache_size is not None and result_cache_size != RESULT_CACHE.max_size:
+        RESULT_CACHE = ResultCache(result_cache_size)
+
+    if pool_size is not None:
+        if SANDBOX_POOL is not None:
+            SANDBOX_POOL.close()
+        SANDBOX_POOL = None
+        if pool_size:
+            SANDBOX_POOL = SandboxPool(
+                pool_size,
+                max_jobs_per_worker=pool_max_jobs_per_worker,
+                user=pool_user,
+                python_bin=pool_python_bin,
+                preload=[modname for __, modname in ASSUMED_IMPORTS],
+            )
+
+
 def update_hash(hasher, obj):
     """
     Update a `hashlib` hasher with a nested object.
@@ -101,7 +247,7 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  Results are also cached in this process (see `configure`).
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -116,7 +262,7 @@ def safe_exec(
         md5er.update(repr(code))
         update_hash(md5er, safe_globals)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
-        cached = cache.get(key)
+        cached = RESULT_CACHE.get(key, cache)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
             # message, if any, else None; and the resulting globals dictionary.
@@ -132,6 +278,8 @@ def safe_exec(
     # Decide which code executor to use.
     if unsafely:
         exec_fn = codejail_not_safe_exec
+    elif SANDBOX_POOL is not None and is_configured("python"):
+        exec_fn = SANDBOX_POOL.safe_exec
     else:
         exec_fn = codejail_safe_exec
 
@@ -150,7 +298,7 @@ def safe_exec(
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
-        cache.set(key, (emsg, cleaned_results))
+        RESULT_CACHE.set(key, (emsg, cleaned_results), cache)
 
     # If an exception happened, raise it now.
     if emsg:
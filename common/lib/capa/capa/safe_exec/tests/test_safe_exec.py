@@ -1,16 +1,23 @@
 """Test safe_exec.py"""
 
+import getpass
 import hashlib
 import os
 import os.path
 import random
+import sys
 import textwrap
 import unittest
+import zipfile
+from StringIO import StringIO
 
+import mock
 import pytest
 from six import text_type
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec.pool import SandboxPool
+from capa.safe_exec.safe_exec import ResultCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -178,6 +185,129 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestResultCache(unittest.TestCase):
+    """Test the process-local cache of safe_exec results."""
+
+    def test_local_hit(self):
+        shared = DictCache({})
+        result_cache = ResultCache(max_size=1024)
+        result_cache.set('key', (None, {'a': 17}), shared)
+
+        # Results found locally don't go to the shared cache.
+        shared.cache.clear()
+        self.assertEqual(result_cache.get('key', shared), (None, {'a': 17}))
+        self.assertEqual(result_cache.stats()['hits'], 1)
+
+    def test_shared_hit(self):
+        shared = DictCache({'key': (None, {'a': 17})})
+        result_cache = ResultCache(max_size=1024)
+        self.assertEqual(result_cache.get('key', shared), (None, {'a': 17}))
+        self.assertIsNone(result_cache.get('other', shared))
+
+        # The shared result is now cached locally.
+        shared.cache.clear()
+        self.assertEqual(result_cache.get('key', shared), (None, {'a': 17}))
+        stats = result_cache.stats()
+        self.assertEqual((stats['hits'], stats['shared_hits'], stats['misses']), (1, 1, 1))
+
+    def test_results_are_copied(self):
+        result_cache = ResultCache(max_size=1024)
+        result_cache.set('key', (None, {'a': [1]}), DictCache({}))
+        result_cache.get('key', DictCache({}))[1]['a'].append(2)
+        self.assertEqual(result_cache.get('key', DictCache({})), (None, {'a': [1]}))
+
+    def test_eviction(self):
+        shared = DictCache({})
+        result = (None, {'a': 'x' * 100})
+        result_cache = ResultCache(max_size=250)
+        for key in ('one', 'two', 'three'):
+            result_cache.set(key, result, shared)
+
+        shared.cache.clear()
+        self.assertIsNone(result_cache.get('one', shared))
+        self.assertEqual(result_cache.get('three', shared), result)
+        stats = result_cache.stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (2, 1))
+        self.assertLessEqual(stats['size'], 250)
+
+    def test_disabled(self):
+        shared = DictCache({})
+        result_cache = ResultCache(max_size=0)
+        result_cache.set('key', (None, {'a': 17}), shared)
+        self.assertEqual(shared.cache, {'key': (None, {'a': 17})})
+        self.assertEqual(result_cache.stats()['entries'], 0)
+
+
+class TestSandboxPool(unittest.TestCase):
+    """Test running code in warm workers, started here without a sandbox."""
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        self.pool = SandboxPool(1, max_jobs_per_worker=3, cmdline=[sys.executable], preload=['math'])
+        self.addCleanup(self.pool.close)
+
+    def test_set_values(self):
+        g = {'b': 2}
+        self.pool.safe_exec("import math\na = int(math.pi) + b", g)
+        self.assertEqual(g['a'], 5)
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            self.pool.safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", text_type(cm.exception))
+
+    def test_jobs_dont_share_state(self):
+        g = {}
+        self.pool.safe_exec("import os, sys\nsys.leaked = True\npid = os.getpid()", g)
+        first_pid = g['pid']
+        self.pool.safe_exec("import os, sys\nleaked = hasattr(sys, 'leaked')\npid = os.getpid()", g)
+        self.assertFalse(g['leaked'])
+        self.assertNotEqual(g['pid'], first_pid)
+
+    def test_workers_are_reused_then_replaced(self):
+        code = "import os\nzygote = os.getppid()"
+        zygotes = []
+        for __ in range(4):
+            g = {}
+            self.pool.safe_exec(code, g)
+            zygotes.append(g['zygote'])
+        self.assertEqual(len(set(zygotes[:3])), 1)
+        self.assertNotEqual(zygotes[3], zygotes[0])
+
+    def test_python_lib(self):
+        zip_file = StringIO()
+        with zipfile.ZipFile(zip_file, "w") as lib:
+            lib.write(os.path.dirname(__file__) + "/test_files/pylib/constant.py", "constant.py")
+        g = {}
+        self.pool.safe_exec(
+            "import constant; a = constant.THE_CONST", g,
+            python_path=["python_lib.zip"], extra_files=[("python_lib.zip", zip_file.getvalue())],
+        )
+        self.assertEqual(g['a'], 23)
+
+    def test_workers_dont_run_as_the_sandbox_user(self):
+        pool = SandboxPool(1, cmdline=[sys.executable], sandbox_user=getpass.getuser())
+        self.addCleanup(pool.close)
+        with mock.patch('capa.safe_exec.pool.codejail_safe_exec') as mock_codejail_safe_exec:
+            pool.safe_exec("a = 17", {})
+        self.assertTrue(mock_codejail_safe_exec.called)
+
+    def test_workers_need_their_own_user_and_python(self):
+        command = {'cmdline_start': ['/sandbox/bin/python', '-E', '-B'], 'user': 'sandbox'}
+        with mock.patch.dict('codejail.jail_code.COMMANDS', {'python': command}):
+            pool = SandboxPool(1, user='sandbox_pool', python_bin='/sandbox/bin/python-pool')
+            self.assertEqual(
+                pool.cmdline,
+                ['sudo', '-u', 'sandbox_pool', '/sandbox/bin/python-pool', '-E', '-B'],
+            )
+            self.assertEqual(pool.sandbox_user, 'sandbox')
+
+            pool = SandboxPool(1)
+            with mock.patch('capa.safe_exec.pool.codejail_safe_exec') as mock_codejail_safe_exec:
+                pool.safe_exec("a = 17", {})
+            self.assertTrue(mock_codejail_safe_exec.called)
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -3,8 +3,10 @@ MongoDB/GridFS-level code for the contentstore.
 """
 import os
 import json
+import logging
 import pymongo
 import gridfs
+from concurrent.futures import ThreadPoolExecutor
 from gridfs.errors import NoFile
 from fs.osfs import OSFS
 from bson.son import SON
@@ -18,6 +20,26 @@ from xmodule.util.misc import escape_invalid_characters
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from .content import StaticContent, ContentStore, StaticContentStream
 
+log = logging.getLogger(__name__)
+
+# The number of assets exported at once by export_all_for_course.
+EXPORT_WORKERS = 4
+
+# How often export_all_for_course logs its progress, in exported assets.
+EXPORT_PROGRESS_INTERVAL = 100
+
+
+def _makedirs(directory):
+    """
+    Creates `directory` and its missing parents, unless it already exists,
+    possibly created concurrently by another export thread.
+    """
+    try:
+        os.makedirs(directory)
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+
 
 class MongoContentStore(ContentStore):
     """
@@ -153,28 +175,40 @@ class MongoContentStore(ContentStore):
                 return None
 
     def export(self, location, output_directory):
-        content = self.find(location)
+        """
+        Export the asset at `location` to `output_directory`, one GridFS
+        chunk at a time, and return its length in bytes.
+        """
+        content = self.find(location, as_stream=True)
+        try:
+            filename = content.name
+            if content.import_path is not None:
+                output_directory = output_directory + '/' + os.path.dirname(content.import_path)
 
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+            if not os.path.exists(output_directory):
+                _makedirs(output_directory)
 
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
 
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
+            disk_fs = OSFS(output_directory)
 
-        disk_fs = OSFS(output_directory)
+            with disk_fs.open(export_name, 'wb') as asset_file:
+                for chunk in content.stream_data():
+                    asset_file.write(chunk)
+        finally:
+            content.close()
 
-        with disk_fs.open(export_name, 'wb') as asset_file:
-            asset_file.write(content.data)
+        return content.length
 
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
 
+        Up to EXPORT_WORKERS assets are exported at once, and the progress of the export is
+        logged every EXPORT_PROGRESS_INTERVAL assets.
+
         Args:
             course_key (CourseKey): the :class:`CourseKey` identifying the course
             output_directory: the directory under which to put all the asset files
@@ -185,19 +219,35 @@ class MongoContentStore(ContentStore):
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
-            # TODO: On 6/19/14, I had to put a try/except around this
-            # to export a course. The course failed on JSON files in
-            # the /static/ directory placed in it with an import.
-            #
-            # If this hasn't been looked at in a while, remove this comment.
-            #
-            # When debugging course exports, this might be a good place
-            # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
 
+        # TODO: On 6/19/14, I had to put a try/except around this
+        # to export a course. The course failed on JSON files in
+        # the /static/ directory placed in it with an import.
+        #
+        # If this hasn't been looked at in a while, remove this comment.
+        #
+        # When debugging course exports, this might be a good place
+        # to look. -- pmitros
+        exported_bytes = 0
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+            lengths = executor.map(
+                lambda asset: self.export(asset['asset_key'], output_directory),
+                assets,
+            )
+            for exported_count, length in enumerate(lengths, 1):
+                exported_bytes += length or 0
+                if exported_count % EXPORT_PROGRESS_INTERVAL == 0 or exported_count == len(assets):
+                    log.info(
+                        u'Exported %d of %d assets (%d bytes) of %s',
+                        exported_count, len(assets), exported_bytes, course_key,
+                    )
+
+        policy_directory = os.path.dirname(assets_policy_file)
+        if policy_directory:
+            _makedirs(policy_directory)
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
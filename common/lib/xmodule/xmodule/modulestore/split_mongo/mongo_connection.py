@@ -8,6 +8,8 @@ import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
@@ -15,6 +17,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
     DJANGO_AVAILABLE = True
 except ImportError:
@@ -203,21 +206,139 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class StructureLRUCache(object):
+    """
+    A thread-safe, process-local LRU cache of pickled course structures,
+    bounded by their total (uncompressed) size.
+
+    Split structures are immutable and keyed by their version guid, so an
+    entry never needs to be invalidated; it only ever needs to be evicted.
+    The structures are cached pickled, rather than deserialized, because
+    split modifies the structures it loads (e.g. `cache_items` merges the
+    definition fields into the blocks' fields), so each caller must get its
+    own copy.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int): The maximum total size, in bytes, of the cached
+                structures. A value of 0 disables the cache.
+        """
+        self.max_size = max_size
+        self.current_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the pickled structure cached for `key` (marking it as most
+        recently used), or None if it isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, pickled_structure):
+        """
+        Cache `pickled_structure` under `key`, and evict least recently used
+        structures until the cache fits in `max_size`.
+
+        Structures larger than `max_size` are not cached at all.
+        """
+        size = len(pickled_structure)
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_size -= previous[1]
+
+            self._entries[key] = (pickled_structure, size)
+            self.current_size += size
+
+            while self.current_size > self.max_size:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self.current_size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all cached structures and reset the metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return a dict of the cache size and hit/miss/eviction metrics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.current_size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+_LOCAL_STRUCTURE_CACHE = None
+_LOCAL_STRUCTURE_CACHE_LOCK = threading.Lock()
+
+
+def get_local_structure_cache():
+    """
+    Return the process-local :class:`StructureLRUCache`, or None if it has been
+    disabled by setting COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE to 0.
+
+    The cache is (re)created whenever the configured size changes, so that
+    tests can enable it with `override_settings`.
+    """
+    global _LOCAL_STRUCTURE_CACHE  # pylint: disable=global-statement
+    if not DJANGO_AVAILABLE:
+        return None
+
+    max_size = getattr(settings, 'COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE', 0)
+    if not max_size:
+        return None
+
+    with _LOCAL_STRUCTURE_CACHE_LOCK:
+        if _LOCAL_STRUCTURE_CACHE is None or _LOCAL_STRUCTURE_CACHE.max_size != max_size:
+            _LOCAL_STRUCTURE_CACHE = StructureLRUCache(max_size)
+        return _LOCAL_STRUCTURE_CACHE
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    Pickled structures are also kept in a process-local LRU cache (see
+    :class:`StructureLRUCache`) in front of the django cache, so that hot
+    structures don't need to be fetched and decompressed again.  They are
+    still unpickled on every get, so that callers never share a structure.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
     def __init__(self):
         self.cache = None
+        self.local_cache = None
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
             except InvalidCacheBackendError:
                 pass
+            else:
+                self.local_cache = get_local_structure_cache()
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
@@ -225,6 +346,12 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.local_cache is not None:
+                pickled_data = self.local_cache.get(key)
+                tagger.tag(from_local_cache=str(pickled_data is not None).lower())
+                if pickled_data is not None:
+                    return pickle.loads(pickled_data)
+
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
@@ -238,6 +365,9 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            if self.local_cache is not None:
+                self.local_cache.set(key, pickled_data)
+
             return pickle.loads(pickled_data)
 
     def set(self, key, structure, course_context=None):
@@ -256,6 +386,9 @@ class CourseStructureCache(object):
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
 
+            if self.local_cache is not None:
+                self.local_cache.set(key, pickled_data)
+
 
 class MongoConnection(object):
     """
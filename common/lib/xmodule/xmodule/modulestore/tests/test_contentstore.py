@@ -145,6 +145,23 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    def test_export_asset_content(self):
+        """
+        Test that exported assets have the content of the stored assets, and
+        that their policy file is written to a directory that didn't exist yet.
+        """
+        self.set_up_assets(False)
+        root_dir = path.Path(mkdtemp())
+        self.addCleanup(shutil.rmtree, root_dir)
+        self.contentstore.export_all_for_course(
+            self.course1_key, root_dir / "static",
+            path.Path(root_dir / "policies" / "assets.json"),
+        )
+        for filename in self.course1_files:
+            with open("{}/static/{}".format(DATA_DIR, filename), "rb") as original:
+                self.assertEqual(path.Path(root_dir / "static" / filename).bytes(), original.read())
+        self.assertTrue(path.Path(root_dir / "policies" / "assets.json").isfile())
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
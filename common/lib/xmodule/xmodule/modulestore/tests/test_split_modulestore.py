@@ -13,6 +13,7 @@ import os
 import ddt
 from contracts import contract
 from django.core.cache import caches, InvalidCacheBackendError
+from django.test.utils import override_settings
 
 from openedx.core.lib import tempdir
 from openedx.core.lib.tests import attr
@@ -32,6 +33,7 @@ from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import get_local_structure_cache
 from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import mock_tab_from_json
@@ -987,6 +989,31 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_local_cache(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+
+        with override_settings(COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE=10 * 1024 * 1024):
+            local_cache = get_local_structure_cache()
+            local_cache.clear()
+            self.addCleanup(local_cache.clear)
+
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # the structure is served from the process-local cache, without
+            # touching the django cache
+            self.cache.clear()
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+
+            self.assertEqual(cached_structure, not_cached_structure)
+            self.assertEqual(local_cache.stats()['hits'], 1)
+
+            # each get returns a copy of the structure, which callers may modify
+            cached_structure['blocks'].clear()
+            self.assertEqual(self._get_structure(self.new_course), not_cached_structure)
+
     def test_dummy_cache(self):
         with check_mongo_calls(1):
             not_cached_structure = self._get_structure(self.new_course)
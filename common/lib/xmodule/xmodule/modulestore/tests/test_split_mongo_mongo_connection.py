@@ -1,7 +1,7 @@
 """ Test the behavior of split_mongo/MongoConnection """
 import unittest
 from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, StructureLRUCache
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -18,3 +18,51 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestStructureLRUCache(unittest.TestCase):
+    """ Test the process-local LRU cache of course structures """
+
+    def setUp(self):
+        super(TestStructureLRUCache, self).setUp()
+        self.cache = StructureLRUCache(max_size=100)
+
+    def test_get_and_set(self):
+        structure = 'a' * 10
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', structure)
+        self.assertIs(self.cache.get('a'), structure)
+        self.assertDictContainsSubset(
+            {'entries': 1, 'size': 10, 'hits': 1, 'misses': 1, 'evictions': 0},
+            self.cache.stats(),
+        )
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 'a' * 40)
+        self.cache.set('b', 'b' * 40)
+        # touch 'a', so that 'b' is the least recently used structure
+        self.cache.get('a')
+        self.cache.set('c', 'c' * 40)
+
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('c'))
+        self.assertEqual(self.cache.stats()['size'], 80)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_replace_entry(self):
+        self.cache.set('a', 'a' * 40)
+        self.cache.set('a', 'a' * 60)
+        self.assertEqual(self.cache.stats()['size'], 60)
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+    def test_oversized_structure_not_cached(self):
+        self.cache.set('a', 'a' * 101)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_clear(self):
+        self.cache.set('a', {'_id': 'a'}, 10)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['size'], 0)
@@ -1,6 +1,7 @@
 """
 Tests for XML importer.
 """
+import hashlib
 import mock
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import String, Scope, ScopeIds, List
@@ -386,3 +387,22 @@ class StaticContentImporterTest(unittest.TestCase):
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.assert_called_once()
+
+    def test_import_unchanged_static_file(self):
+        base_dir = path('/path/to/dir')
+        full_file_path = os.path.join(base_dir, 'static/some_file.txt')
+        self.mocked_content_store.find.return_value = mock.Mock(
+            content_digest=hashlib.md5("data").hexdigest(),
+            content_type='text/plain',
+            import_path='static/some_file.txt',
+            locked=False,
+        )
+        self.mocked_content_store.find.return_value.name = 'some_file.txt'
+        with mock.patch("__builtin__.open", mock.mock_open(read_data="data")):
+            self.static_content_importer.import_static_file(
+                full_file_path=full_file_path,
+                base_dir=base_dir
+            )
+        self.mocked_content_store.find.return_value.close.assert_called_once_with()
+        self.mocked_content_store.generate_thumbnail.assert_not_called()
+        self.mocked_content_store.save.assert_not_called()
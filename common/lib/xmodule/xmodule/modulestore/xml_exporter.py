@@ -4,6 +4,7 @@ Methods for exporting course data to XML
 
 import logging
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from six import text_type
 import lxml.etree
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -133,6 +134,19 @@ class ExportManager(object):
         Perform any additional tasks to the root XML node.
         """
 
+    def export_assets(self, root_courselike_dir):
+        """
+        Export the static assets and their policy file from the contentstore.
+        This runs alongside the export of the block tree, so it mustn't use
+        the modulestore.
+        """
+        if self.contentstore:
+            self.contentstore.export_all_for_course(
+                self.courselike_key,
+                root_courselike_dir + '/static/',
+                root_courselike_dir + '/policies/assets.json',
+            )
+
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         """
         Process additional content, like static assets.
@@ -153,7 +167,11 @@ class ExportManager(object):
         """
         Perform the export given the parameters handed to this class at init.
         """
-        with self.modulestore.bulk_operations(self.courselike_key):
+        root_courselike_dir = self.root_dir + '/' + self.target_dir
+
+        with self.modulestore.bulk_operations(self.courselike_key), ThreadPoolExecutor(max_workers=1) as executor:
+            # The static assets don't depend on the block tree: export them at the same time.
+            assets_export = executor.submit(self.export_assets, root_courselike_dir)
 
             fsm = OSFS(self.root_dir)
             root = lxml.etree.Element('unknown')
@@ -172,8 +190,10 @@ class ExportManager(object):
             # Make any needed adjustments to the root node.
             self.process_root(root, export_fs)
 
-            # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            # Wait for the assets, re-raising any error exporting them.
+            assets_export.result()
+
+            # Process extra items-- drafts, course image, etc
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
@@ -215,15 +235,9 @@ class CourseExportManager(ExportManager):
         with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file, encoding='utf-8')
 
-        # export the static assets
+        # the static assets have been exported by export_assets
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
-
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
             if courselike.course_image == courselike.fields['course_image'].default:
@@ -233,6 +247,7 @@ class CourseExportManager(ExportManager):
                             courselike.id,
                             courselike.course_image
                         ),
+                        as_stream=True,
                     )
                 except NotFoundError:
                     pass
@@ -240,8 +255,12 @@ class CourseExportManager(ExportManager):
                     output_dir = root_courselike_dir + '/static/images/'
                     if not os.path.isdir(output_dir):
                         os.makedirs(output_dir)
-                    with OSFS(output_dir).open(u'course_image.jpg', 'wb') as course_image_file:
-                        course_image_file.write(course_image.data)
+                    try:
+                        with OSFS(output_dir).open(u'course_image.jpg', 'wb') as course_image_file:
+                            for chunk in course_image.stream_data():
+                                course_image_file.write(chunk)
+                    finally:
+                        course_image.close()
 
         # export the static tabs
         export_extra_content(
@@ -313,16 +332,9 @@ class LibraryExportManager(ExportManager):
         Notionally, libraries may have assets. This is currently unsupported, but the structure is here
         to ease in duck typing during import. This may be expanded as a useful feature eventually.
         """
-        # export the static assets
+        # the static assets have been exported by export_assets
         export_fs.makedir('policies', recreate=True)
 
-        if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
-
     def post_process(self, root, export_fs):
         """
         Because Libraries are XBlocks, they aren't exported in the same way Course Modules
@@ -21,12 +21,14 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
 from __future__ import print_function
+import hashlib
 import json
 import logging
 import mimetypes
 import os
 import re
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import xblock
 from lxml import etree
@@ -58,6 +60,9 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# The number of static files imported at once by StaticContentImporter.
+STATIC_IMPORT_WORKERS = 4
+
 
 class LocationMixin(XBlockMixin):
     """
@@ -98,9 +103,14 @@ class StaticContentImporter:
         self.mimetypes_list = mimetypes.types_map.values()
 
     def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):
+        """
+        Import all the files of the static content directory, up to
+        STATIC_IMPORT_WORKERS of them at once.
+        """
         remap_dict = {}
 
         static_dir = self.course_data_path / content_subdir
+        file_paths = []
         for dirname, _, filenames in os.walk(static_dir):
             for filename in filenames:
 
@@ -111,11 +121,18 @@ class StaticContentImporter:
                         log.debug('skipping static content %s...', file_path)
                     continue
 
-                if verbose:
-                    log.debug('importing static content %s...', file_path)
+                file_paths.append(file_path)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+        def import_file(file_path):
+            """
+            Import the static file at `file_path`.
+            """
+            if verbose:
+                log.debug('importing static content %s...', file_path)
+            return self.import_static_file(file_path, base_dir=static_dir)
 
+        with ThreadPoolExecutor(max_workers=STATIC_IMPORT_WORKERS) as executor:
+            for imported_file_attrs in executor.map(import_file, file_paths):
                 if imported_file_attrs:
                     # store the remapping information which will be needed
                     # to subsitute in the module data
@@ -160,6 +177,10 @@ class StaticContentImporter:
             import_path=file_subpath, locked=locked
         )
 
+        # Skip the asset if it's already stored, unchanged, e.g. by an earlier attempt at this import
+        if self._is_stored(content, hashlib.md5(data).hexdigest()):
+            return file_subpath, asset_key
+
         # first let's save a thumbnail so we can get back a thumbnail location
         thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
 
@@ -176,6 +197,26 @@ class StaticContentImporter:
 
         return file_subpath, asset_key
 
+    def _is_stored(self, content, content_digest):
+        """
+        Returns whether `content`, whose data has the given md5 digest, is
+        already stored in the static content store with the same data and
+        attributes.
+        """
+        stored_content = self.static_content_store.find(content.location, throw_on_not_found=False, as_stream=True)
+        if stored_content is None:
+            return False
+        try:
+            return (
+                stored_content.content_digest == content_digest and
+                stored_content.name == content.name and
+                stored_content.content_type == content.content_type and
+                stored_content.import_path == content.import_path and
+                stored_content.locked == content.locked
+            )
+        finally:
+            stored_content.close()
+
 
 class ImportManager(object):
     """
@@ -497,12 +538,13 @@ class ImportManager(object):
                 continue
 
             # This bulk operation wraps all the operations to populate the published branch.
-            with self.store.bulk_operations(dest_id):
+            with self.store.bulk_operations(dest_id), ThreadPoolExecutor(max_workers=1) as executor:
                 # Retrieve the course itself.
                 source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
-                # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                # Import all static pieces, which only uses the static content store,
+                # while the modulestore is populated.
+                static_import = executor.submit(self.import_static, data_path, dest_id)
 
                 # Import asset metadata stored in XML.
                 self.import_asset_metadata(data_path, dest_id)
@@ -510,6 +552,9 @@ class ImportManager(object):
                 # Import all children
                 self.import_children(source_courselike, courselike, courselike_key, dest_id)
 
+                # Wait for the static pieces, re-raising any error importing them.
+                static_import.result()
+
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
             # Drafts must be imported in a separate bulk operation from published items to import properly,
@@ -38,3 +38,20 @@ def get_python_lib_zip(contentstore, course_id):
         return zip_lib.data
     else:
         return None
+
+
+def configure_safe_exec():
+    """
+    Configure the process-local caching and worker pool of Capa's sandboxed
+    execution from the CODE_JAIL setting.
+    """
+    from capa.safe_exec import configure
+
+    code_jail = getattr(settings, 'CODE_JAIL', {})
+    configure(
+        result_cache_size=code_jail.get('result_cache_size', 0),
+        pool_size=code_jail.get('pool_size', 0),
+        pool_max_jobs_per_worker=code_jail.get('pool_max_jobs_per_worker', 100),
+        pool_user=code_jail.get('pool_user'),
+        pool_python_bin=code_jail.get('pool_python_bin'),
+    )
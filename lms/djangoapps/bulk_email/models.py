@@ -486,6 +486,25 @@ class BulkEmailFlag(ConfigurationModel):
         else:  # implies enabled == True and require_course_email == False, so email is globally enabled
             return True
 
+    @classmethod
+    def feature_enabled_for_courses(cls, course_ids):
+        """
+        Returns the set of the given course ids for which the bulk email feature
+        is available, as determined by feature_enabled, using at most one query
+        for the course-specific authorizations.
+        """
+        if not BulkEmailFlag.is_enabled():
+            return set()
+        elif BulkEmailFlag.current().require_course_email_auth:
+            return set(
+                CourseAuthorization.objects.filter(
+                    course_id__in=course_ids,
+                    email_enabled=True,
+                ).values_list('course_id', flat=True)
+            )
+        else:
+            return set(course_ids)
+
     class Meta(object):
         app_label = "bulk_email"
 
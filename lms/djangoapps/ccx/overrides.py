@@ -7,10 +7,12 @@ import logging
 
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
 from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from openedx.core.lib.cache_utils import get_cache
-from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider
+from lms.djangoapps.courseware.field_overrides import FieldOverrideProvider, invalidate_override_index
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
@@ -217,3 +219,12 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+
+
+@receiver(post_save, sender=CcxFieldOverride)
+@receiver(post_delete, sender=CcxFieldOverride)
+def _invalidate_override_index(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the overrides indexed during the request when a CCX's overrides change.
+    """
+    invalidate_override_index()
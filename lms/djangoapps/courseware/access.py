@@ -20,6 +20,7 @@ from opaque_keys.edx.keys import CourseKey, UsageKey
 from six import text_type
 from xblock.core import XBlock
 
+from courseware.access_cache import cache_access_decisions, get_cached_value
 from courseware.access_response import (
     MilestoneAccessError,
     MobileAvailabilityError,
@@ -100,6 +101,7 @@ def has_ccx_coach_role(user, course_key):
     return False
 
 
+@cache_access_decisions
 def has_access(user, action, obj, course_key=None):
     """
     Check whether a user has the access to do action on obj.  Handles any magic
@@ -129,6 +131,9 @@ def has_access(user, action, obj, course_key=None):
 
     Returns an AccessResponse object.  It is up to the caller to actually
     deny access in a way that makes sense in context.
+
+    While the access decision cache is enabled for the current request (see
+    courseware.access_cache), decisions are cached for the rest of it.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
@@ -440,6 +445,29 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
+def _get_user_partition(descriptor, partition_id, course_key):
+    """
+    Returns the user partition of the descriptor's course with the given id,
+    looking the course's partitions up once per request while the access
+    decision cache is enabled.  Raises `NoSuchUserPartitionError` if there
+    is no such partition.
+    """
+    if not course_key:
+        return descriptor._get_user_partition(partition_id)  # pylint: disable=protected-access
+
+    partitions_by_id = get_cached_value(
+        ('user_partitions', course_key),
+        lambda: {
+            partition.id: partition
+            for partition in descriptor.runtime.service(descriptor, 'partitions').course_partitions
+        },
+    )
+    try:
+        return partitions_by_id[partition_id]
+    except KeyError:
+        raise NoSuchUserPartitionError(u"could not find a UserPartition with ID [{}]".format(partition_id))
+
+
 def _has_group_access(descriptor, user, course_key):
     """
     This function returns a boolean indicating whether or not `user` has
@@ -461,7 +489,7 @@ def _has_group_access(descriptor, user, course_key):
     partitions = []
     for partition_id, group_ids in merged_access.items():
         try:
-            partition = descriptor._get_user_partition(partition_id)  # pylint: disable=protected-access
+            partition = _get_user_partition(descriptor, partition_id, course_key)
 
             # check for False in merged_access, which indicates that at least one
             # partition's group list excludes all students.
@@ -0,0 +1,166 @@
+"""
+A cache of the access decisions made by courseware.access.has_access, for
+the duration of a request.
+
+Rendering a page of courseware checks access to the same few objects for
+the same user many times over.  While the cache is enabled for a request
+(see courseware.middleware.AccessDecisionCacheMiddleware), each decision is
+cached by the user, the action, the object's type and location, and the
+course key, and the decisions are thrown away whenever something they may
+depend on changes during the request: the user, their roles or enrollments,
+or their masquerade settings.
+
+The number of access checks made during the request, how many of them were
+answered from the cache, and the time spent making the others are reported
+as custom metrics.
+"""
+import time
+from functools import wraps
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import set_custom_metric
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from student.models import CourseAccessRole, CourseEnrollment
+
+DECISIONS_CACHE_NAMESPACE = u'courseware.access_cache.decisions'
+STATS_CACHE_NAMESPACE = u'courseware.access_cache.stats'
+
+
+def _get_stats():
+    """
+    Returns the access check statistics of the current request.
+    """
+    return RequestCache(STATS_CACHE_NAMESPACE).data
+
+
+def _get_decisions():
+    """
+    Returns the cached access decisions of the current request.
+    """
+    return RequestCache(DECISIONS_CACHE_NAMESPACE).data
+
+
+def enable_access_cache():
+    """
+    Enables the access decision cache for the rest of the current request.
+    """
+    _get_stats().update(enabled=True, count=0, cached_count=0, duration=0.0, depth=0)
+
+
+def is_access_cache_enabled():
+    """
+    Returns whether the access decision cache is enabled for the current request.
+    """
+    return _get_stats().get('enabled', False)
+
+
+def invalidate_access_cache():
+    """
+    Forgets all the access decisions cached during the current request.
+    """
+    RequestCache(DECISIONS_CACHE_NAMESPACE).clear()
+
+
+def get_cached_value(key, compute):
+    """
+    Returns the value cached with the given key among the current request's
+    access decisions, computing it with `compute` if it isn't cached.  Values
+    are neither cached nor looked up if the cache isn't enabled.
+
+    This is for the values access decisions are based on, and which are
+    shared by many of them, such as the user partitions of a course.
+    """
+    if not is_access_cache_enabled():
+        return compute()
+    decisions = _get_decisions()
+    if key not in decisions:
+        decisions[key] = compute()
+    return decisions[key]
+
+
+def _get_cache_key(user, action, obj, course_key):
+    """
+    Returns the key to cache the decision of the given access check with, or
+    None if it mustn't be cached.
+    """
+    if isinstance(obj, (CourseKey, UsageKey, basestring)):
+        obj_key = obj
+    else:
+        location = getattr(obj, 'location', None)
+        if location is None:
+            return None
+        obj_key = (type(obj), location)
+    return (
+        getattr(user, 'id', None),
+        hasattr(user, 'masquerade_settings'),
+        action,
+        obj_key,
+        course_key,
+    )
+
+
+def cache_access_decisions(has_access_func):
+    """
+    Decorator for has_access, which caches its decisions while the access
+    decision cache is enabled, and records how many checks were made and how
+    long the ones that weren't cached took.
+    """
+    @wraps(has_access_func)
+    def _has_access(user, action, obj, course_key=None):
+        """
+        Returns the possibly cached decision of has_access.
+        """
+        stats = _get_stats()
+        if not stats.get('enabled'):
+            return has_access_func(user, action, obj, course_key)
+
+        stats['count'] += 1
+        cache_key = _get_cache_key(user, action, obj, course_key)
+        decisions = _get_decisions()
+        if cache_key is not None and cache_key in decisions:
+            stats['cached_count'] += 1
+            return decisions[cache_key]
+
+        # Access checks may make other access checks: only time the outermost.
+        stats['depth'] += 1
+        start_time = time.time()
+        try:
+            decision = has_access_func(user, action, obj, course_key)
+        finally:
+            stats['depth'] -= 1
+            if not stats['depth']:
+                stats['duration'] += time.time() - start_time
+
+        if cache_key is not None:
+            decisions[cache_key] = decision
+        return decision
+    return _has_access
+
+
+def report_access_metrics():
+    """
+    Reports the access checks made during the current request as custom metrics.
+    """
+    stats = _get_stats()
+    if stats.get('count'):
+        set_custom_metric('access_checks_count', stats['count'])
+        set_custom_metric('access_checks_cached_count', stats['cached_count'])
+        set_custom_metric('access_checks_duration_ms', int(stats['duration'] * 1000))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def _invalidate_access_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the cached access decisions when the users, roles or enrollments
+    they may depend on change.
+    """
+    invalidate_access_cache()
@@ -13,13 +13,19 @@ Currently, this module is used in the `module_render` module in this same
 package and is used to wrap the `authored_data` when constructing an
 `LmsFieldData`.  This means overrides will be in effect for all scopes covered
 by `authored_data`, e.g. course content and settings stored in Mongo.
+
+The overrides found by the providers are indexed for the rest of the request
+by user, block and field, so that each field of each block is only ever looked
+up once from the providers, however often it is read, whether directly or
+through inheritance.  Providers whose overrides may change during a request
+should call `invalidate_override_index` when they do.
 """
 import threading
 from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 
 from django.conf import settings
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -27,6 +33,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+OVERRIDE_INDEX_NAMESPACE = u'courseware.field_overrides.index'
 
 
 def resolve_dotted(name):
@@ -89,6 +96,13 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def invalidate_override_index():
+    """
+    Forgets all the overrides indexed during the current request.
+    """
+    RequestCache(OVERRIDE_INDEX_NAMESPACE).clear()
+
+
 class FieldOverrideProvider(object):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -198,17 +212,36 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self._index_key = (type(self), getattr(user, 'id', None), tuple(providers))
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
-                if value is not NOTSET:
-                    return value
+        if overrides_disabled():
+            return NOTSET
+
+        usage_id = getattr(getattr(block, 'scope_ids', None), 'usage_id', None)
+        if usage_id is None:
+            return self._get_provider_override(block, name)
+
+        index = RequestCache(OVERRIDE_INDEX_NAMESPACE).data.setdefault(self._index_key, {})
+        key = (usage_id, name)
+        if key not in index:
+            index[key] = self._get_provider_override(block, name)
+        return index[key]
+
+    def _get_provider_override(self, block, name):
+        """
+        Asks each provider in turn for an override for the field identified
+        by `name` in `block`.  Returns the first overridden value found or
+        `NOTSET` if no override is found.
+        """
+        for provider in self.providers:
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
         return NOTSET
 
     def get(self, block, name):
@@ -18,6 +18,7 @@ from pytz import utc
 from web_fragments.fragment import Fragment
 from xblock.runtime import KeyValueStore
 
+from courseware.access_cache import invalidate_access_cache
 from openedx.core.djangoapps.util.user_messages import PageLevelMessages
 from openedx.core.djangolib.markup import HTML
 from student.models import CourseEnrollment
@@ -122,6 +123,8 @@ def setup_masquerade(request, course_key, staff_access=False, reset_masquerade_d
     masquerade_settings = request.session.setdefault(MASQUERADE_SETTINGS_KEY, {})
     # Store the masquerade settings on the user so it can be accessed without the request
     request.user.masquerade_settings = masquerade_settings
+    # Access decisions made so far during this request didn't account for the masquerade.
+    invalidate_access_cache()
     course_masquerade = masquerade_settings.get(course_key, None)
     masquerade_user = None
     if course_masquerade and course_masquerade.user_name:
@@ -4,6 +4,7 @@ Middleware for the courseware app
 
 from django.shortcuts import redirect
 
+from courseware.access_cache import enable_access_cache, report_access_metrics
 from lms.djangoapps.courseware.exceptions import Redirect
 from openedx.core.lib.request_utils import COURSE_REGEX
 
@@ -35,3 +36,24 @@ class CacheCourseIdMiddleware(object):
 
             if course_id and course_id != request.session.get('course_id'):
                 request.session['course_id'] = course_id
+
+
+class AccessDecisionCacheMiddleware(object):
+    """
+    Middleware that caches the access decisions made during each request,
+    and reports how many access checks were made, and what they cost.
+
+    Must come after edx_django_utils' RequestCacheMiddleware.
+    """
+    def process_request(self, _request):
+        """
+        Enable the access decision cache for the request.
+        """
+        enable_access_cache()
+
+    def process_response(self, _request, response):
+        """
+        Report the access checks made during the request.
+        """
+        report_access_metrics()
+        return response
@@ -37,6 +37,7 @@ from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
 from courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.lib.cache_utils import get_cache
 from xmodule.modulestore.django import modulestore
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
@@ -722,13 +723,21 @@ class FieldDataCache(object):
             ),
         }
         self.scorable_locations = set()
+        self.cached_locations = set()
         self.add_descriptors_to_cache(descriptors)
 
     def add_descriptors_to_cache(self, descriptors):
         """
         Add all `descriptors` to this FieldDataCache.
+
+        Descriptors that were already added, e.g. when the descendants of a
+        block that has already been prefetched are added, aren't loaded again.
         """
         if self.user.is_authenticated:
+            descriptors = [desc for desc in descriptors if desc.location not in self.cached_locations]
+            if not descriptors:
+                return
+            self.cached_locations.update(desc.location for desc in descriptors)
             self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
             for scope, fields in self._fields_to_cache(descriptors).items():
                 if scope not in self.cache:
@@ -939,6 +948,8 @@ class ScoresClient(object):
     """
     Score = namedtuple('Score', 'correct total created')
 
+    _CACHE_NAMESPACE = u'courseware.model_data.ScoresClient'
+
     def __init__(self, course_key, user_id):
         self.course_key = course_key
         self.user_id = user_id
@@ -985,9 +996,47 @@ class ScoresClient(object):
     def create_for_locations(cls, course_id, user_id, scorable_locations):
         """Create a ScoresClient with pre-fetched data for the given locations."""
         client = cls(course_id, user_id)
-        client.fetch_scores(scorable_locations)
+        prefetched = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_id))
+        if prefetched is not None and user_id in prefetched['user_ids']:
+            client._locations_to_scores = dict(prefetched['scores'].get(user_id, {}))
+            client._has_fetched = True
+        else:
+            client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def prefetch(cls, course_id, user_ids, scorable_locations):
+        """
+        Prefetches, with a single query, the scores of all the given
+        users for the given locations, for use by create_for_locations.
+        """
+        user_ids = set(user_ids)
+        scores = defaultdict(dict)
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=user_ids,
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            scores[user_id][location.map_into_course(course_id)] = cls.Score(correct, total, created)
+        get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(course_id)] = {
+            'user_ids': user_ids,
+            'scores': dict(scores),
+        }
+
+    @classmethod
+    def clear_prefetched_data(cls, course_id):
+        """
+        Clears prefetched scores for the course from the RequestCache.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(cls._cache_key(course_id), None)
+
+    @classmethod
+    def _cache_key(cls, course_id):
+        return u'scores_cache.{}'.format(course_id)
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -457,7 +457,8 @@ def get_module_system_for_user(
         static_asset_path='',
         user_location=None,
         disable_staff_debug_info=False,
-        course=None
+        course=None,
+        user_services=None,
 ):
     """
     Helper function that returns a module system and student_data bound to a user and a descriptor.
@@ -474,6 +475,10 @@ def get_module_system_for_user(
     Arguments:
         see arguments for get_module()
         request_token (str): A token unique to the request use by xblock initialization
+        user_services (dict): The XBlock services bound to the user, other than 'field-data', if they
+            have already been built for another block of the course, such as the parent of this one.
+            The modules loaded by this module system share them, so that rendering a sequential or
+            a vertical builds them only once rather than for every one of its descendants.
 
     Returns:
         (LmsModuleSystem, KvsFieldData):  (module system, student_data) bound to, primarily, the user and descriptor
@@ -529,6 +534,7 @@ def get_module_system_for_user(
             request_token=request_token,
             course=course,
             will_recheck_access=True,
+            user_services=user_services,
         )
 
     def get_event_handler(event_type):
@@ -771,6 +777,20 @@ def get_module_system_for_user(
 
     user_is_staff = bool(has_access(user, u'staff', descriptor.location, course_id))
 
+    if user_services is None:
+        user_services = {
+            'fs': FSService(),
+            'user': DjangoXBlockUserService(user, user_is_staff=user_is_staff),
+            'verification': XBlockVerificationService(),
+            'proctoring': ProctoringService(),
+            'milestones': milestones_helpers.get_service(),
+            'credit': CreditService(),
+            'bookmarks': BookmarksService(user=user),
+            'gating': GatingService(),
+        }
+    services = dict(user_services)
+    services['field-data'] = field_data
+
     system = LmsModuleSystem(
         track_function=track_function,
         render_template=render_to_string,
@@ -811,17 +831,7 @@ def get_module_system_for_user(
         mixins=descriptor.runtime.mixologist._mixins,  # pylint: disable=protected-access
         wrappers=block_wrappers,
         get_real_user=user_by_anonymous_id,
-        services={
-            'fs': FSService(),
-            'field-data': field_data,
-            'user': DjangoXBlockUserService(user, user_is_staff=user_is_staff),
-            'verification': XBlockVerificationService(),
-            'proctoring': ProctoringService(),
-            'milestones': milestones_helpers.get_service(),
-            'credit': CreditService(),
-            'bookmarks': BookmarksService(user=user),
-            'gating': GatingService(),
-        },
+        services=services,
         get_user_role=lambda: get_user_role(user, course_id),
         descriptor_runtime=descriptor._runtime,  # pylint: disable=protected-access
         rebind_noauth_module_to_user=rebind_noauth_module_to_user,
@@ -859,7 +869,7 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
                                        track_function, xqueue_callback_url_prefix, request_token,
                                        position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                                        static_asset_path='', user_location=None, disable_staff_debug_info=False,
-                                       course=None, will_recheck_access=False):
+                                       course=None, will_recheck_access=False, user_services=None):
     """
     Actually implement get_module, without requiring a request.
 
@@ -867,6 +877,7 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
 
     Arguments:
         request_token (str): A unique token for this request, used to isolate xblock rendering
+        user_services (dict): see get_module_system_for_user()
     """
 
     (system, student_data) = get_module_system_for_user(
@@ -883,7 +894,8 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
         user_location=user_location,
         request_token=request_token,
         disable_staff_debug_info=disable_staff_debug_info,
-        course=course
+        course=course,
+        user_services=user_services,
     )
 
     descriptor.bind_for_student(
@@ -1076,7 +1088,8 @@ def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_inf
         raise Http404("Invalid location")
 
     try:
-        descriptor = modulestore().get_item(usage_key)
+        # Load all the descendants at once, since their state is prefetched below.
+        descriptor = modulestore().get_item(usage_key, depth=None)
         descriptor_orig_usage_key, descriptor_orig_version = modulestore().get_block_original_usage(usage_key)
     except ItemNotFoundError:
         log.warn(
@@ -1,13 +1,33 @@
 """
 API related to providing field overrides for individual students.  This is used
 by the individual due dates feature.
+
+All of a student's overrides in a course are fetched at once, and cached for
+the duration of the request and, until they change, in the django cache.
 """
 import json
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_django_utils.cache import RequestCache
 
 from courseware.models import StudentFieldOverride
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, invalidate_override_index
+
+OVERRIDES_CACHE_NAMESPACE = u'courseware.student_field_overrides'
+OVERRIDES_CACHE_KEY = u'courseware.student_field_overrides.{user_id}.{course_id}.versioned'
+OVERRIDES_CACHE_TIMEOUT = 60 * 60
+
+# The django cache stores (version, overrides) tuples, which are only valid
+# while their version is the current one, cached without expiry under this
+# key.  Changing an override starts a new version once committed, so that
+# overrides read from the database before the change are ignored.
+OVERRIDES_VERSION_CACHE_KEY = u'courseware.student_field_overrides.{user_id}.{course_id}.version'
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -31,19 +51,17 @@ def get_override_for_user(user, block, name, default=None):
     specify the block and the name of the field.  If the field is not
     overridden for the given user, returns `default`.
     """
-    if not hasattr(block, '_student_overrides'):
-        block._student_overrides = {}  # pylint: disable=protected-access
-    overrides = block._student_overrides.get(user.id)  # pylint: disable=protected-access
-    if overrides is None:
-        overrides = _get_overrides_for_user(user, block)
-        block._student_overrides[user.id] = overrides  # pylint: disable=protected-access
-    return overrides.get(name, default)
+    overrides = _get_overrides_for_user(user, block)
+    if name not in overrides:
+        return default
+    return block.fields[name].from_json(overrides[name])
 
 
 def _get_overrides_for_user(user, block):
     """
     Gets all of the individual student overrides for given user and block.
-    Returns a dictionary of field override values keyed by field name.
+    Returns a dictionary of the JSON values of the overrides keyed by field
+    name.
     """
     if (
         hasattr(block, "scope_ids") and
@@ -54,17 +72,35 @@ def _get_overrides_for_user(user, block):
     else:
         location = block.location
 
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=location,
-        student_id=user.id,
-    )
-    overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
-    return overrides
+    course_overrides = _get_course_overrides_for_user(user, block.runtime.course_id)
+    return course_overrides.get(unicode(location), {})
+
+
+def _get_course_overrides_for_user(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the given
+    course.  Returns a dictionary keyed by block location, of dictionaries of
+    the JSON values of the overrides of the block keyed by field name.
+    """
+    if user.id is None:
+        return {}
+
+    request_cache = RequestCache(OVERRIDES_CACHE_NAMESPACE).data
+    cache_key = OVERRIDES_CACHE_KEY.format(user_id=user.id, course_id=course_id)
+    if cache_key not in request_cache:
+        version_cache_key = OVERRIDES_VERSION_CACHE_KEY.format(user_id=user.id, course_id=course_id)
+        cached = cache.get_many([cache_key, version_cache_key])
+        version = cached.get(version_cache_key)
+        if cache_key in cached and cached[cache_key][0] == version:
+            overrides = cached[cache_key][1]
+        else:
+            overrides = {}
+            query = StudentFieldOverride.objects.filter(course_id=course_id, student_id=user.id)
+            for override in query:
+                overrides.setdefault(unicode(override.location), {})[override.field] = json.loads(override.value)
+            cache.set(cache_key, (version, overrides), OVERRIDES_CACHE_TIMEOUT)
+        request_cache[cache_key] = overrides
+    return request_cache[cache_key]
 
 
 def override_field_for_user(user, block, name, value):
@@ -98,3 +134,20 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+
+
+@receiver(post_save, sender=StudentFieldOverride)
+@receiver(post_delete, sender=StudentFieldOverride)
+def _invalidate_overrides_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the cached overrides of the student in the course of the override
+    that changed.  A new version of the overrides is started in the django
+    cache once the change is committed, so that overrides that other
+    processes read before the change, and cache afterwards, are ignored.
+    """
+    cache_key = OVERRIDES_CACHE_KEY.format(user_id=instance.student_id, course_id=instance.course_id)
+    version_cache_key = OVERRIDES_VERSION_CACHE_KEY.format(user_id=instance.student_id, course_id=instance.course_id)
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.set(version_cache_key, uuid.uuid4().hex, None))
+    RequestCache(OVERRIDES_CACHE_NAMESPACE).data.pop(cache_key, None)
+    invalidate_override_index()
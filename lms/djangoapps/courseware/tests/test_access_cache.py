@@ -0,0 +1,63 @@
+"""
+Tests for the courseware access decision cache.
+"""
+from django.test.client import RequestFactory
+from mock import call, patch
+
+import courseware.access as access
+from courseware.access_cache import enable_access_cache
+from lms.djangoapps.courseware.middleware import AccessDecisionCacheMiddleware
+from student.roles import CourseStaffRole
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+class AccessDecisionCacheTestCase(SharedModuleStoreTestCase):
+    """
+    Tests for caching the decisions of has_access.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(AccessDecisionCacheTestCase, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(AccessDecisionCacheTestCase, self).setUp()
+        self.user = UserFactory.create()
+
+    def test_not_cached_unless_enabled(self):
+        with patch('courseware.access._has_access_course', wraps=access._has_access_course) as mock_has_access:
+            access.has_access(self.user, 'load', self.course)
+            access.has_access(self.user, 'load', self.course)
+        self.assertEqual(mock_has_access.call_count, 2)
+
+    def test_decisions_cached(self):
+        enable_access_cache()
+        with patch('courseware.access._has_access_course', wraps=access._has_access_course) as mock_has_access:
+            first_decision = access.has_access(self.user, 'load', self.course)
+            self.assertEqual(access.has_access(self.user, 'load', self.course), first_decision)
+            self.assertEqual(mock_has_access.call_count, 1)
+
+            access.has_access(self.user, 'staff', self.course)
+            access.has_access(UserFactory.create(), 'load', self.course)
+            self.assertEqual(mock_has_access.call_count, 3)
+
+    def test_invalidated_when_roles_change(self):
+        enable_access_cache()
+        self.assertFalse(access.has_access(self.user, 'staff', self.course.id))
+        CourseStaffRole(self.course.id).add_users(self.user)
+        self.assertTrue(access.has_access(self.user, 'staff', self.course.id))
+
+    def test_metrics_reported(self):
+        middleware = AccessDecisionCacheMiddleware()
+        request = RequestFactory().get('dummy_url')
+        middleware.process_request(request)
+        access.has_access(self.user, 'staff', 'global')
+        access.has_access(self.user, 'staff', 'global')
+        with patch('courseware.access_cache.set_custom_metric') as mock_set_custom_metric:
+            middleware.process_response(request, None)
+        mock_set_custom_metric.assert_has_calls([
+            call('access_checks_count', 2),
+            call('access_checks_cached_count', 1),
+        ])
@@ -2,21 +2,35 @@
 Tests for `field_overrides` module.
 """
 # pylint: disable=missing-docstring
+import datetime
 import unittest
 
+import pytz
+from django.core.cache import cache
 from django.test.utils import override_settings
+from edx_django_utils.cache import RequestCache
+from mock import patch
 from xblock.field_data import DictFieldData
 
+from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
     disable_overrides,
+    invalidate_override_index,
     resolve_dotted
 )
+from ..student_field_overrides import (
+    OVERRIDES_CACHE_NAMESPACE,
+    OVERRIDES_VERSION_CACHE_KEY,
+    clear_override_for_user,
+    get_override_for_user,
+    override_field_for_user
+)
 from ..testutils import FieldOverrideTestMixin
 
 TESTUSER = "testuser"
@@ -44,6 +58,21 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestBlockOverrideProvider(FieldOverrideProvider):
+    """
+    A concrete implementation of `FieldOverrideProvider` for testing with
+    actual blocks.
+    """
+    def get(self, block, name, default):
+        if name == 'display_name':
+            return 'Overridden'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -146,6 +175,92 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.TestBlockOverrideProvider',))
+class OverrideIndexTests(OverrideFieldBase):
+    """
+    Tests for the indexing of the overrides found by the providers.
+    """
+
+    def setUp(self):
+        super(OverrideIndexTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+
+    def tearDown(self):
+        super(OverrideIndexTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self):
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({'display_name': 'Original'}))
+
+    def test_overrides_indexed(self):
+        with patch.object(TestBlockOverrideProvider, 'get', autospec=True) as mock_get:
+            mock_get.side_effect = TestBlockOverrideProvider.get.__func__
+            self.assertEqual(self.make_one().get(self.course, 'display_name'), 'Overridden')
+            self.assertEqual(self.make_one().get(self.course, 'display_name'), 'Overridden')
+            self.assertEqual(mock_get.call_count, 1)
+
+            invalidate_override_index()
+            self.assertEqual(self.make_one().get(self.course, 'display_name'), 'Overridden')
+            self.assertEqual(mock_get.call_count, 2)
+
+    def test_index_ignored_when_overrides_disabled(self):
+        data = self.make_one()
+        self.assertEqual(data.get(self.course, 'display_name'), 'Overridden')
+        with disable_overrides():
+            self.assertEqual(data.get(self.course, 'display_name'), 'Original')
+
+
+class IndividualStudentOverridesTests(SharedModuleStoreTestCase):
+    """
+    Tests for the fetching and caching of individual student overrides.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(IndividualStudentOverridesTests, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        cls.chapter = ItemFactory.create(parent=cls.course, category='chapter')
+        cls.sequential = ItemFactory.create(parent=cls.chapter, category='sequential')
+
+    def setUp(self):
+        super(IndividualStudentOverridesTests, self).setUp()
+        self.user = UserFactory.create()
+
+    def test_course_overrides_fetched_once(self):
+        due = datetime.datetime(2018, 1, 1, tzinfo=pytz.UTC)
+        override_field_for_user(self.user, self.chapter, 'due', due)
+        override_field_for_user(self.user, self.sequential, 'display_name', 'Renamed')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_override_for_user(self.user, self.chapter, 'due'), due)
+            self.assertEqual(get_override_for_user(self.user, self.sequential, 'display_name'), 'Renamed')
+            self.assertIsNone(get_override_for_user(self.user, self.sequential, 'due'))
+
+    def test_changed_overrides_refetched(self):
+        self.assertIsNone(get_override_for_user(self.user, self.chapter, 'display_name'))
+        override_field_for_user(self.user, self.chapter, 'display_name', 'Renamed')
+        self.assertEqual(get_override_for_user(self.user, self.chapter, 'display_name'), 'Renamed')
+        clear_override_for_user(self.user, self.chapter, 'display_name')
+        self.assertIsNone(get_override_for_user(self.user, self.chapter, 'display_name'))
+
+    def test_overrides_read_before_committed_change_ignored(self):
+        cache_set = cache.set
+
+        def set_after_committed_change(key, value, timeout):
+            """
+            Caches the overrides read from the database after a change to them
+            is committed, which starts a new version of the cached overrides.
+            """
+            override_field_for_user(self.user, self.chapter, 'display_name', 'Renamed')
+            cache_set(OVERRIDES_VERSION_CACHE_KEY.format(user_id=self.user.id, course_id=self.course.id), 'new', None)
+            cache_set(key, value, timeout)
+
+        with patch.object(cache, 'set', side_effect=set_after_committed_change):
+            self.assertIsNone(get_override_for_user(self.user, self.chapter, 'display_name'))
+
+        RequestCache(OVERRIDES_CACHE_NAMESPACE).clear()
+        self.assertEqual(get_override_for_user(self.user, self.chapter, 'display_name'), 'Renamed')
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
@@ -130,6 +130,14 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
         with self.assertNumQueries(0):
             self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
 
+    def test_add_cached_descriptor(self):
+        "Test that adding a descriptor that is already cached doesn't read from the database again"
+        descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+        field_data_cache = FieldDataCache([descriptor], course_id, self.user)
+        with self.assertNumQueries(0):
+            field_data_cache.add_descriptors_to_cache([descriptor])
+        self.assertEquals('a_value', DjangoKeyValueStore(field_data_cache).get(user_state_key('a_field')))
+
     def test_get_missing_field(self):
         "Test that getting a missing field from an existing StudentModule raises a KeyError"
         # This should only read from the cache, not the database
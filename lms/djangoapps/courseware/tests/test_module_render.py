@@ -2410,6 +2410,48 @@ BLOCK_TYPES = ['xblock', 'xmodule']
 USER_NUMBERS = range(2)
 
 
+@patch('courseware.module_render.has_access', Mock(return_value=True, autospec=True))
+class TestSharedUserServices(SharedModuleStoreTestCase):
+    """
+    Tests that the descendants of a block share the services bound to the user.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(TestSharedUserServices, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(TestSharedUserServices, self).setUp()
+        self.user = UserFactory()
+
+    @XBlock.register_temp_plugin(PureXBlockWithChildren, identifier='xblock')
+    @XBlock.register_temp_plugin(PureXBlock, identifier='pure')
+    def test_descendants_share_user_services(self):
+        parent = ItemFactory(category='xblock', parent=self.course)
+        for __ in range(3):
+            ItemFactory(category='pure', parent=parent)
+        parent = modulestore().get_item(parent.location, depth=None)
+
+        with patch('courseware.module_render.BookmarksService', wraps=render.BookmarksService) as mock_service:
+            block = render.get_module_for_descriptor_internal(
+                self.user,
+                parent,
+                Mock(),
+                self.course.id,
+                Mock(),
+                Mock(),
+                Mock(),
+                course=self.course,
+            )
+            children = block.get_children()
+
+        self.assertEqual(len(children), 3)
+        self.assertEqual(mock_service.call_count, 1)
+        for child in children:
+            self.assertIs(child.runtime.service(child, 'bookmarks'), block.runtime.service(block, 'bookmarks'))
+            self.assertIsNot(child.runtime.service(child, 'field-data'), block.runtime.service(block, 'field-data'))
+
+
 @ddt.ddt
 class TestFilteredChildren(SharedModuleStoreTestCase):
     """
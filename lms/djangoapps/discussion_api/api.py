@@ -3,6 +3,7 @@ Discussion API internal interface
 """
 import itertools
 from collections import defaultdict
+from functools import partial
 from urllib import urlencode
 from urlparse import urlunparse
 
@@ -41,7 +42,8 @@ from lms.djangoapps.courseware.exceptions import CourseAccessRedirect
 from lms.djangoapps.discussion_api.pagination import DiscussionAPIPagination
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
-from lms.lib.comment_client.utils import CommentClientRequestError
+from lms.lib.comment_client.user import User as CommentClientUser
+from lms.lib.comment_client.utils import CommentClientRequestError, perform_requests_concurrently
 from openedx.core.djangoapps.user_api.accounts.views import AccountViewSet
 from openedx.core.lib.exceptions import CourseNotFoundError, DiscussionNotFoundError, PageNotFoundError
 
@@ -86,13 +88,16 @@ def _get_course(course_key, user):
     return course
 
 
-def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
+def _get_thread_and_context(request, thread_id, retrieve_kwargs=None, concurrent_requester=False):
     """
     Retrieve the given thread and build a serializer context for it, returning
     both. This function also enforces access control for the thread (checking
     both the user's access to the course and to the thread's cohort if
     applicable). Raises ThreadNotFoundError if the thread does not exist or the
     user cannot access it.
+
+    If concurrent_requester is True, the requester's comments service user is
+    retrieved concurrently with the thread, rather than after it.
     """
     retrieve_kwargs = retrieve_kwargs or {}
     try:
@@ -100,10 +105,19 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
             retrieve_kwargs["with_responses"] = False
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        cc_requester = None
+        if concurrent_requester:
+            cc_thread, cc_requester = perform_requests_concurrently(
+                partial(Thread(id=thread_id).retrieve, **retrieve_kwargs),
+                CommentClientUser.from_django_user(request.user).retrieve,
+            )
+        else:
+            cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        if cc_requester is not None:
+            cc_requester["course_id"] = course.id
+        context = get_context(course, request, cc_thread, cc_requester=cc_requester)
         course_discussion_settings = get_course_discussion_settings(course_key)
         if (
                 not context["is_requester_privileged"] and
@@ -536,7 +550,9 @@ def get_thread_list(
         })
 
     course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    # The requester's comments service user is retrieved along with the threads below.
+    cc_requester = CommentClientUser.from_django_user(request.user)
+    context = get_context(course, request, cc_requester=cc_requester)
 
     query_params = {
         "user_id": unicode(request.user.id),
@@ -559,12 +575,16 @@ def get_thread_list(
             })
 
     if following:
-        paginated_results = context["cc_requester"].subscribed_threads(query_params)
+        cc_subscriber = CommentClientUser.from_django_user(request.user)
+        cc_subscriber["course_id"] = course.id
+        get_threads = partial(cc_subscriber.subscribed_threads, query_params)
     else:
         query_params["course_id"] = unicode(course.id)
         query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
         query_params["text"] = text_search
-        paginated_results = Thread.search(query_params)
+        get_threads = partial(Thread.search, query_params)
+    __, paginated_results = perform_requests_concurrently(cc_requester.retrieve, get_threads)
+    cc_requester["course_id"] = course.id
     # The comments service returns the last page of results if the requested
     # page is beyond the last page, but we want be consistent with DRF's general
     # behavior and return a PageNotFoundError in that case
@@ -624,7 +644,8 @@ def get_comment_list(request, thread_id, endorsed, page, page_size, requested_fi
             "user_id": request.user.id,
             "response_skip": response_skip,
             "response_limit": page_size,
-        }
+        },
+        concurrent_requester=True,
     )
 
     # Responses to discussion threads cannot be separated by endorsed, but
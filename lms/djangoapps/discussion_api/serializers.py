@@ -28,10 +28,14 @@ from lms.lib.comment_client.utils import CommentClientRequestError
 from student.models import get_user_by_username_or_email
 
 
-def get_context(course, request, thread=None):
+def get_context(course, request, thread=None, cc_requester=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
+
+    If cc_requester (the requester's comments service user) is provided, the
+    caller is responsible for retrieving it and setting its course_id before
+    the context is used; otherwise, it is retrieved here.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -48,8 +52,9 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
-    cc_requester["course_id"] = course.id
+    if cc_requester is None:
+        cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+        cc_requester["course_id"] = course.id
     course_discussion_settings = get_course_discussion_settings(course.id)
     return {
         "course": course,
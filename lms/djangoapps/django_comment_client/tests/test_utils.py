@@ -7,6 +7,7 @@ import mock
 
 from django.urls import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 from pytz import UTC
@@ -33,7 +34,13 @@ from django_comment_common.utils import (
     set_course_discussion_settings
 )
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    CommentClientRequestError,
+    get_request_stats,
+    perform_request,
+    perform_requests_concurrently
+)
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
@@ -1813,7 +1820,7 @@ class ClientConfigurationTestCase(TestCase):
         with self.assertRaises(CommentClientMaintenanceError):
             perform_request('GET', 'http://www.google.com')
 
-    @patch('requests.request')
+    @patch('lms.lib.comment_client.utils.request')
     def test_enabled(self, mock_request):
         """Ensures that requests proceed normally when forums are enabled."""
         config = ForumsConfig.current()
@@ -1830,6 +1837,67 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+@ddt.ddt
+class PerformRequestsConcurrentlyTestCase(TestCase):
+    """Tests for sending independent requests to the comments service concurrently."""
+
+    def setUp(self):
+        super(PerformRequestsConcurrentlyTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        patcher = patch('lms.lib.comment_client.utils.request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_request.side_effect = self._respond
+
+    def _respond(self, method, url, **kwargs):
+        """Responds to a request with its URL and the forums API key it was sent with."""
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {'url': url, 'api_key': kwargs['headers']['X-Edx-Api-Key']}
+        return response
+
+    def _call(self, name):
+        """Returns a function requesting the given URL."""
+        return lambda: perform_request('get', 'http://localhost/' + name, metric_action='test.' + name)
+
+    @ddt.data(1, 4)
+    def test_results_in_order(self, max_concurrent_requests):
+        with override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=max_concurrent_requests):
+            results = perform_requests_concurrently(self._call('first'), self._call('second'), self._call('third'))
+        self.assertEqual(
+            [result['url'] for result in results],
+            ['http://localhost/first', 'http://localhost/second', 'http://localhost/third'],
+        )
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_forums_config_shared(self):
+        config = ForumsConfig.current()
+        config.api_key = 'test-api-key'
+        config.save()
+
+        results = perform_requests_concurrently(self._call('first'), self._call('second'))
+        self.assertEqual([result['api_key'] for result in results], ['test-api-key', 'test-api-key'])
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_first_failure_raised(self):
+        def fail(message):
+            def call():
+                raise CommentClientRequestError(message)
+            return call
+
+        with self.assertRaisesRegexp(CommentClientRequestError, 'first'):
+            perform_requests_concurrently(self._call('ok'), fail('first'), fail('second'))
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_request_stats(self):
+        before = get_request_stats().get('test.stats', {}).get('count', 0)
+        perform_requests_concurrently(self._call('stats'), self._call('stats'))
+        self.assertEqual(get_request_stats()['test.stats']['count'], before + 2)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -5,11 +5,14 @@ controlling persistent grades.
 from config_models.models import ConfigurationModel
 from django.conf import settings
 from django.db.models import BooleanField, IntegerField, TextField
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
 
 from openedx.core.lib.cache_utils import request_cached
 
+_CURRENT_CACHE_NAMESPACE = u'grades.config.models.PersistentGradesEnabledFlag.current'
+
 
 class PersistentGradesEnabledFlag(ConfigurationModel):
     """
@@ -38,13 +41,27 @@ class PersistentGradesEnabledFlag(ConfigurationModel):
         """
         if settings.FEATURES.get('PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS'):
             return True
-        if not PersistentGradesEnabledFlag.is_enabled():
+        current = cls._current()
+        if not current.enabled:
             return False
-        elif not PersistentGradesEnabledFlag.current().enabled_for_all_courses and course_id:
+        elif not current.enabled_for_all_courses and course_id:
             effective = CoursePersistentGradesFlag.objects.filter(course_id=course_id).order_by('-change_date').first()
             return effective.enabled if effective is not None else False
         return True
 
+    @classmethod
+    @request_cached(namespace=_CURRENT_CACHE_NAMESPACE)
+    def _current(cls):
+        """
+        Returns the current configuration, loading it once per request
+        however many courses the feature is checked for.
+        """
+        return cls.current()
+
+    def save(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        super(PersistentGradesEnabledFlag, self).save(*args, **kwargs)
+        RequestCache(_CURRENT_CACHE_NAMESPACE).clear()
+
     class Meta(object):
         app_label = "grades"
 
@@ -2,10 +2,12 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 from six import text_type
 
+from courseware.model_data import ScoresClient
 from openedx.core.djangoapps.signals.signals import (COURSE_GRADE_CHANGED,
                                                      COURSE_GRADE_NOW_PASSED,
                                                      COURSE_GRADE_NOW_FAILED)
@@ -13,7 +15,17 @@ from openedx.core.djangoapps.signals.signals import (COURSE_GRADE_CHANGED,
 from .config import assume_zero_if_absent, should_persist_grades
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade, prefetch
+from .models import (
+    PersistentCourseGrade,
+    PersistentSubsectionGrade,
+    VisibleBlocks,
+    clear_prefetched_data_for_users,
+    prefetch,
+    prefetch_for_users
+)
+from .scores import possibly_scored
+from .shared_structures import SharedCourseStructures
+from .subsection_grade_factory import SubsectionGradeFactory
 
 log = getLogger(__name__)
 
@@ -84,6 +96,7 @@ class CourseGradeFactory(object):
             collected_block_structure=None,
             course_key=None,
             force_update=False,
+            batch_size=None,
     ):
         """
         Given a course and an iterable of students (User), yield a GradeResult
@@ -93,6 +106,11 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If batch_size is given, students are graded in batches of that size:
+        the grading data of each batch is prefetched with a fixed number of
+        queries, and transformed course structures are shared among students
+        with identical views of the course.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -103,10 +121,72 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if batch_size:
+            shared_structures = SharedCourseStructures(course_data)
+            users = iter(users)
+            users_batch = list(islice(users, batch_size))
+            try:
+                while users_batch:
+                    for result in self._iter_batch_grade_results(
+                            users_batch, course_data, force_update, shared_structures,
+                    ):
+                        yield result
+                    users_batch = list(islice(users, batch_size))
+            finally:
+                VisibleBlocks.clear_prefetched_course_data(course_data.course_key)
+        else:
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update)
+
+    def _iter_batch_grade_results(self, users, course_data, force_update, shared_structures):
+        """
+        Yields a GradeResult for each of the given users, after
+        prefetching their grading data in bulk.
+        """
+        self._prefetch_batch(users, course_data, force_update)
+        try:
+            for user in users:
+                try:
+                    course_structure = shared_structures.get(user)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(
+                        u'Grades: Could not share course structure for user %s in course %s',
+                        user.id,
+                        course_data.course_key,
+                    )
+                    course_structure = None
+                yield self._iter_grade_result(user, course_data, force_update, course_structure)
+        finally:
+            self._clear_prefetched_batch(users, course_data)
+
+    @staticmethod
+    def _prefetch_batch(users, course_data, force_update):
+        """
+        Prefetches the persisted grades of the given users and, if grades
+        are to be computed rather than read, their scores.
+        """
+        course_key = course_data.course_key
+        should_persist = should_persist_grades(course_key)
+        if should_persist:
+            prefetch_for_users(users, course_key)
+        if force_update or not should_persist:
+            scorable_locations = [
+                block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+            ]
+            ScoresClient.prefetch(course_key, [user.id for user in users], scorable_locations)
+            SubsectionGradeFactory.prefetch_submissions_scores(course_key, users)
+
+    @staticmethod
+    def _clear_prefetched_batch(users, course_data):
+        """
+        Clears the data prefetched by _prefetch_batch.
+        """
+        course_key = course_data.course_key
+        clear_prefetched_data_for_users(users, course_key)
+        ScoresClient.clear_prefetched_data(course_key)
+        SubsectionGradeFactory.clear_prefetched_submissions_scores(course_key)
 
-    def _iter_grade_result(self, user, course_data, force_update):
+    def _iter_grade_result(self, user, course_data, force_update, course_structure=None):
         try:
             kwargs = {
                 'user': user,
@@ -114,6 +194,8 @@ class CourseGradeFactory(object):
                 'collected_block_structure': course_data.collected_structure,
                 'course_key': course_data.course_key,
             }
+            if course_structure is not None:
+                kwargs['course_structure'] = course_structure
             if force_update:
                 kwargs['force_update_subsections'] = True
 
@@ -177,7 +259,8 @@ class CourseGradeFactory(object):
             course_data,
             force_update_subsections=force_update_subsections
         )
-        course_grade = course_grade.update()
+        with PersistentSubsectionGrade.deferred_writes(user.id, course_data.course_key):
+            course_grade = course_grade.update()
 
         should_persist = should_persist and course_grade.attempted
         if should_persist:
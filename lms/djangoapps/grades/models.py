@@ -11,11 +11,13 @@ persisted, course grades are also immune to changes in course content.
 import json
 import logging
 from base64 import b64encode
-from collections import defaultdict, namedtuple
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 from hashlib import sha1
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Case, Value, When
 from django.utils.timezone import now
 from lazy import lazy
 from model_utils.models import TimeStampedModel
@@ -222,11 +224,51 @@ class VisibleBlocks(models.Model):
         """
         Bulk creates VisibleBlocks for the given iterator of
         BlockRecordList objects for the given user and course_key, but
-        only for those that aren't already created.
+        only for those that aren't already created.  Records missing from
+        the cache may have been created for other users, so they're first
+        read from the database, with a single query.
         """
         cached_records = cls.bulk_read(user_id, course_key)
-        non_existent_brls = {brl.hash_value for brl in block_record_lists if brl.hash_value not in cached_records}
-        cls.bulk_create(user_id, course_key, non_existent_brls)
+        missing_brls = {brl.hash_value: brl for brl in block_record_lists if brl.hash_value not in cached_records}
+        if missing_brls:
+            cls._update_cache(user_id, course_key, cls.objects.filter(hashed__in=list(missing_brls)))
+            cls.bulk_create(user_id, course_key, [
+                brl for hash_value, brl in missing_brls.iteritems() if hash_value not in cached_records
+            ])
+
+    @classmethod
+    def prefetch_for_course(cls, course_key, users):
+        """
+        Shares the visible blocks of the given users' prefetched
+        subsection grades among them, along with those prefetched for
+        earlier users of the course, so that blocks created while grading
+        one user are reused for the others.  No query is made, as the
+        visible blocks are prefetched with the subsection grades.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        prefetched = cache.setdefault(cls._course_cache_key(course_key), {})
+        for user in users:
+            for grade in PersistentSubsectionGrade.bulk_read_grades(user.id, course_key):
+                prefetched.setdefault(grade.visible_blocks_id, grade.visible_blocks)
+        for user in users:
+            cache[cls._cache_key(user.id, course_key)] = prefetched
+
+    @classmethod
+    def clear_prefetched_data(cls, course_key, users):
+        """
+        Clears prefetched visible blocks for the given users from the RequestCache.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user in users:
+            cache.pop(cls._cache_key(user.id, course_key), None)
+
+    @classmethod
+    def clear_prefetched_course_data(cls, course_key):
+        """
+        Clears the visible blocks prefetched for all users of the course
+        from the RequestCache.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(cls._course_cache_key(course_key), None)
 
     @classmethod
     def _initialize_cache(cls, user_id, course_key):
@@ -257,6 +299,10 @@ class VisibleBlocks(models.Model):
     def _cache_key(cls, user_id, course_key):
         return u"visible_blocks_cache.{}.{}".format(course_key, user_id)
 
+    @classmethod
+    def _course_cache_key(cls, course_key):
+        return u"visible_blocks_cache.{}".format(course_key)
+
 
 class PersistentSubsectionGrade(TimeStampedModel):
     """
@@ -318,6 +364,18 @@ class PersistentSubsectionGrade(TimeStampedModel):
 
     _CACHE_NAMESPACE = u'grades.models.PersistentSubsectionGrade'
 
+    # Fields written by save_pending_grades when updating existing grades.
+    _UPDATABLE_FIELDS = (
+        'course_version',
+        'subtree_edited_timestamp',
+        'earned_all',
+        'possible_all',
+        'earned_graded',
+        'possible_graded',
+        'first_attempted',
+        'visible_blocks_id',
+    )
+
     @property
     def full_usage_key(self):
         """
@@ -354,7 +412,7 @@ class PersistentSubsectionGrade(TimeStampedModel):
         Prefetches grades for the given users in the given course.
         """
         cache_key = cls._cache_key(course_key)
-        get_cache(cls._CACHE_NAMESPACE)[cache_key] = defaultdict(list)
+        get_cache(cls._CACHE_NAMESPACE)[cache_key] = {user.id: [] for user in users}
         cached_grades = get_cache(cls._CACHE_NAMESPACE)[cache_key]
         queryset = cls.objects.select_related('visible_blocks', 'override').filter(
             user_id__in=[user.id for user in users],
@@ -370,6 +428,21 @@ class PersistentSubsectionGrade(TimeStampedModel):
         """
         get_cache(cls._CACHE_NAMESPACE).pop(cls._cache_key(course_key), None)
 
+    @classmethod
+    def get_prefetched_grade(cls, user_id, usage_key):
+        """
+        Returns a (prefetched, grade) tuple for the given user and
+        subsection.  prefetched is False if the grades of the user were
+        not prefetched for the course, in which case grade is always None.
+        """
+        prefetched_grades = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(usage_key.course_key), {})
+        if user_id not in prefetched_grades:
+            return False, None
+        for grade in prefetched_grades[user_id]:
+            if grade.usage_key == usage_key:
+                return True, grade
+        return True, None
+
     @classmethod
     def read_grade(cls, user_id, usage_key):
         """
@@ -396,16 +469,11 @@ class PersistentSubsectionGrade(TimeStampedModel):
             user_id: The user associated with the desired grades
             course_key: The course identifier for the desired grades
         """
+        prefetched_grades = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_key), {})
         try:
-            prefetched_grades = get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(course_key)]
-            try:
-                return prefetched_grades[user_id]
-            except KeyError:
-                # The user's grade is not in the cached dict of subsection grades,
-                # so return an empty list.
-                return []
+            return prefetched_grades[user_id]
         except KeyError:
-            # subsection grades were not prefetched for the course, so get them from the DB
+            # subsection grades of the user were not prefetched for the course, so get them from the DB
             return cls.objects.select_related('visible_blocks', 'override').filter(
                 user_id=user_id,
                 course_id=course_key,
@@ -417,6 +485,23 @@ class PersistentSubsectionGrade(TimeStampedModel):
         Wrapper for objects.update_or_create.
         """
         cls._prepare_params(params)
+
+        prefetched, saved_grade = cls.get_prefetched_grade(params['user_id'], params['usage_key'])
+        if saved_grade is not None and cls._is_unchanged(saved_grade, params):
+            # Avoid a redundant write when a prefetched grade already
+            # matches the recalculated one, e.g. during bulk regrades.
+            saved_grade.override = PersistentSubsectionGradeOverride.get_override(
+                params['user_id'], params['usage_key'],
+            )
+            cls._emit_grade_calculated_event(saved_grade)
+            return saved_grade
+
+        if prefetched and params['user_id'] in get_cache(cls._CACHE_NAMESPACE).get(
+            cls._deferred_cache_key(params['course_id']), (),
+        ):
+            # Grades of prefetched users are written in bulk; see deferred_writes.
+            return cls._update_pending_grade(saved_grade, params)
+
         VisibleBlocks.cached_get_or_create(params['user_id'], params['visible_blocks'])
         cls._prepare_params_visible_blocks_id(params)
 
@@ -437,6 +522,7 @@ class PersistentSubsectionGrade(TimeStampedModel):
             grade.save()
 
         cls._emit_grade_calculated_event(grade)
+        cls._update_prefetched_grade(grade)
         return grade
 
     @classmethod
@@ -461,6 +547,108 @@ class PersistentSubsectionGrade(TimeStampedModel):
             cls._emit_grade_calculated_event(grade)
         return grades
 
+    @classmethod
+    @contextmanager
+    def deferred_writes(cls, user_id, course_key):
+        """
+        Context manager deferring the writes by update_or_create_grade of
+        the grades of the given user in the course, if they're prefetched,
+        until the end of the block, where save_pending_grades writes them
+        in bulk.  Writes are otherwise immediate.
+        """
+        deferred_user_ids = get_cache(cls._CACHE_NAMESPACE).setdefault(cls._deferred_cache_key(course_key), set())
+        deferred_user_ids.add(user_id)
+        try:
+            yield
+        finally:
+            deferred_user_ids.discard(user_id)
+            cls.save_pending_grades(user_id, course_key)
+
+    @classmethod
+    def save_pending_grades(cls, user_id, course_key):
+        """
+        Writes the grades of the given user in the course that were
+        updated or created since their grades were prefetched, with at
+        most one query to create new grades and one to update existing
+        ones, besides the queries to get or create their VisibleBlocks.
+        """
+        pending_grades = get_cache(cls._CACHE_NAMESPACE).get(cls._pending_cache_key(course_key), {}).pop(user_id, {})
+        if not pending_grades:
+            return
+
+        VisibleBlocks.bulk_get_or_create(
+            user_id, course_key, [visible_blocks for _, visible_blocks, _ in pending_grades.itervalues()]
+        )
+
+        new_grades = [grade for grade, _, created in pending_grades.itervalues() if created]
+        if new_grades:
+            cls.objects.bulk_create(new_grades)
+
+        updated_grades = [grade for grade, _, created in pending_grades.itervalues() if not created]
+        if updated_grades:
+            modified = now()
+            updates = {
+                field_name: Case(
+                    *[
+                        When(usage_key=grade.usage_key, then=Value(getattr(grade, field_name)))
+                        for grade in updated_grades
+                    ],
+                    output_field=cls._get_db_field(field_name)
+                )
+                for field_name in cls._UPDATABLE_FIELDS
+            }
+            cls.objects.filter(
+                user_id=user_id,
+                course_id=course_key,
+                usage_key__in=[grade.usage_key for grade in updated_grades],
+            ).update(modified=modified, **updates)
+            for grade in updated_grades:
+                grade.modified = modified
+
+        for grade, _, _ in pending_grades.itervalues():
+            cls._emit_grade_calculated_event(grade)
+
+    @classmethod
+    def _get_db_field(cls, field_name):
+        """
+        Returns the field that stores the given field in the database.
+        """
+        field = cls._meta.get_field(field_name)  # pylint: disable=no-member
+        return field.target_field if field.is_relation else field
+
+    @classmethod
+    def _update_pending_grade(cls, saved_grade, params):
+        """
+        Updates the given prefetched grade, or creates a new grade if it's
+        None, from the given prepared params, without writing it, and
+        returns it.  The grade is written by save_pending_grades at the
+        end of deferred_writes.
+        """
+        visible_blocks = params['visible_blocks']
+        cls._prepare_params_visible_blocks_id(params)
+        first_attempted = params.pop('first_attempted')
+
+        user_pending_grades = get_cache(cls._CACHE_NAMESPACE).setdefault(
+            cls._pending_cache_key(params['course_id']), {},
+        ).setdefault(params['user_id'], OrderedDict())
+        created = saved_grade is None or user_pending_grades.get(saved_grade.usage_key, (None, None, False))[2]
+        if saved_grade is None:
+            grade = cls(first_attempted=first_attempted, **params)
+        else:
+            grade = saved_grade
+            for field_name, value in params.iteritems():
+                setattr(grade, field_name, value)
+            # Reload the visible blocks of the grade when they're next accessed.
+            visible_blocks_field = cls._meta.get_field('visible_blocks')  # pylint: disable=no-member
+            grade.__dict__.pop(visible_blocks_field.get_cache_name(), None)
+            if first_attempted is not None and grade.first_attempted is None:
+                grade.first_attempted = first_attempted
+        grade.override = PersistentSubsectionGradeOverride.get_override(grade.user_id, grade.usage_key)
+
+        user_pending_grades[grade.usage_key] = (grade, visible_blocks, created)
+        cls._update_prefetched_grade(grade)
+        return grade
+
     @classmethod
     def _prepare_params(cls, params):
         """
@@ -471,6 +659,24 @@ class PersistentSubsectionGrade(TimeStampedModel):
         params['course_version'] = params.get('course_version', None) or ""
         params['visible_blocks'] = BlockRecordList.from_list(params['visible_blocks'], params['course_id'])
 
+    @staticmethod
+    def _is_unchanged(grade, params):
+        """
+        Returns whether saving the given prepared params would leave
+        the given grade record as is.
+        """
+        if grade.first_attempted is None and params['first_attempted'] is not None:
+            return False
+        return (
+            grade.visible_blocks_id == params['visible_blocks'].hash_value and
+            grade.course_version == params['course_version'] and
+            grade.subtree_edited_timestamp == params['subtree_edited_timestamp'] and
+            grade.earned_all == params['earned_all'] and
+            grade.possible_all == params['possible_all'] and
+            grade.earned_graded == params['earned_graded'] and
+            grade.possible_graded == params['possible_graded']
+        )
+
     @classmethod
     def _prepare_params_visible_blocks_id(cls, params):
         """
@@ -484,6 +690,18 @@ class PersistentSubsectionGrade(TimeStampedModel):
         params['visible_blocks_id'] = params['visible_blocks'].hash_value
         del params['visible_blocks']
 
+    @classmethod
+    def _update_prefetched_grade(cls, grade):
+        """
+        Replaces the given grade in the prefetched grades for its
+        course, iff the grades of its user were prefetched for the course.
+        """
+        prefetched_grades = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(grade.course_id), {})
+        if grade.user_id in prefetched_grades:
+            user_grades = prefetched_grades[grade.user_id]
+            user_grades[:] = [saved for saved in user_grades if saved.usage_key != grade.usage_key]
+            user_grades.append(grade)
+
     @staticmethod
     def _emit_grade_calculated_event(grade):
         events.subsection_grade_calculated(grade)
@@ -492,6 +710,14 @@ class PersistentSubsectionGrade(TimeStampedModel):
     def _cache_key(cls, course_id):
         return u"subsection_grades_cache.{}".format(course_id)
 
+    @classmethod
+    def _pending_cache_key(cls, course_id):
+        return u"subsection_grades_pending.{}".format(course_id)
+
+    @classmethod
+    def _deferred_cache_key(cls, course_id):
+        return u"subsection_grades_deferred.{}".format(course_id)
+
 
 class PersistentCourseGrade(TimeStampedModel):
     """
@@ -560,6 +786,17 @@ class PersistentCourseGrade(TimeStampedModel):
             cls.objects.filter(user_id__in=[user.id for user in users], course_id=course_id)
         }
 
+    @classmethod
+    def prefetch_for_user(cls, user, course_ids):
+        """
+        Prefetches the given user's grades for the given courses.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for course_id in course_ids:
+            cache.setdefault(cls._cache_key(course_id), {})
+        for grade in cls.objects.filter(user_id=user.id, course_id__in=course_ids):
+            cache[cls._cache_key(grade.course_id)][user.id] = grade
+
     @classmethod
     def clear_prefetched_data(cls, course_key):
         """
@@ -601,6 +838,13 @@ class PersistentCourseGrade(TimeStampedModel):
         if kwargs.get('course_version', None) is None:
             kwargs['course_version'] = ""
 
+        saved_grade = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_id), {}).get(user_id)
+        if saved_grade is not None and cls._is_unchanged(saved_grade, passed, kwargs):
+            # Avoid a redundant write when a prefetched grade already
+            # matches the recalculated one, e.g. during bulk regrades.
+            cls._emit_grade_calculated_event(saved_grade)
+            return saved_grade
+
         grade, _ = cls.objects.update_or_create(
             user_id=user_id,
             course_id=course_id,
@@ -614,6 +858,16 @@ class PersistentCourseGrade(TimeStampedModel):
         cls._update_cache(course_id, user_id, grade)
         return grade
 
+    @staticmethod
+    def _is_unchanged(grade, passed, fields):
+        """
+        Returns whether saving the given fields would leave the given
+        grade record as is.
+        """
+        if passed and not grade.passed_timestamp:
+            return False
+        return all(getattr(grade, field) == value for field, value in fields.iteritems())
+
     @classmethod
     def _update_cache(cls, course_id, user_id, grade):
         course_cache = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_id))
@@ -673,6 +927,33 @@ class PersistentSubsectionGradeOverride(models.Model):
             cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
         }
 
+    @classmethod
+    def prefetch_from_grades(cls, course_key, users):
+        """
+        Prefetches overrides for the given users from the subsection
+        grades already prefetched for the course, without querying.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user in users:
+            cache[(user.id, str(course_key))] = {
+                grade.usage_key: grade.override
+                for grade in PersistentSubsectionGrade.bulk_read_grades(user.id, course_key)
+                if hasattr(grade, 'override')
+            }
+
+    @classmethod
+    def clear_prefetched_data(cls, course_key, users):
+        """
+        Clears prefetched overrides for the given users from the RequestCache.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user in users:
+            cache.pop((user.id, str(course_key)), None)
+
+    @classmethod
+    def is_prefetched(cls, user_id, course_key):
+        return (user_id, str(course_key)) in get_cache(cls._CACHE_NAMESPACE)
+
     @classmethod
     def get_override(cls, user_id, usage_key):
         prefetch_values = get_cache(cls._CACHE_NAMESPACE).get((user_id, str(usage_key.course_key)), None)
@@ -796,5 +1077,31 @@ class PersistentSubsectionGradeOverrideHistory(models.Model):
 
 
 def prefetch(user, course_key):
-    PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
+    if not PersistentSubsectionGradeOverride.is_prefetched(user.id, course_key):
+        PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
     VisibleBlocks.bulk_read(user.id, course_key)
+
+
+def prefetch_for_users(users, course_key):
+    """
+    Prefetches the persisted grades, overrides, and visible blocks of
+    all the given users in the course with a fixed number of queries,
+    regardless of the number of users.
+    """
+    PersistentCourseGrade.prefetch(course_key, users)
+    PersistentSubsectionGrade.prefetch(course_key, users)
+    PersistentSubsectionGradeOverride.prefetch_from_grades(course_key, users)
+    VisibleBlocks.prefetch_for_course(course_key, users)
+
+
+def clear_prefetched_data_for_users(users, course_key):
+    """
+    Clears the data prefetched by prefetch_for_users from the RequestCache,
+    after writing any grades still pending.
+    """
+    for user in users:
+        PersistentSubsectionGrade.save_pending_grades(user.id, course_key)
+    PersistentCourseGrade.clear_prefetched_data(course_key)
+    PersistentSubsectionGrade.clear_prefetched_data(course_key)
+    PersistentSubsectionGradeOverride.clear_prefetched_data(course_key, users)
+    VisibleBlocks.clear_prefetched_data(course_key, users)
@@ -0,0 +1,82 @@
+"""
+Sharing of transformed course structures among learners whose view of
+the course is known to be identical, for use when grading many
+learners of a course at once.
+"""
+from lazy import lazy
+
+from lms.djangoapps.course_blocks.api import get_course_blocks, has_individual_student_override_provider
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
+from lms.djangoapps.courseware.access import has_access
+from openedx.features.content_type_gating.models import ContentTypeGatingConfig
+from student.roles import CourseBetaTesterRole
+from xmodule.partitions.partitions_service import get_user_partition_groups
+
+
+class SharedCourseStructures(object):
+    """
+    Transforms the collected course structure once per distinct
+    visibility signature of the learners being graded, rather than once
+    per learner.
+
+    A learner's signature captures every input of the default course
+    block access transformers that may vary among learners: their group
+    in each of the course's user partitions (which include enrollment
+    tracks) and whether content type gating applies to them.  Learners
+    whose view of the course depends on anything else (staff, beta
+    testers, and any learner in a course with randomized library
+    content or individual due date overrides) don't share structures.
+    """
+    def __init__(self, course_data):
+        self.course_data = course_data
+        self._structures = {}
+
+    def get(self, user):
+        """
+        Returns the transformed course structure for the given user,
+        shared with previous users of the same signature, or None if
+        the structure can't be shared for this user.
+        """
+        if not self._is_sharing_enabled:
+            return None
+
+        signature = self._get_signature(user)
+        if signature is None:
+            return None
+
+        if signature not in self._structures:
+            self._structures[signature] = get_course_blocks(
+                user,
+                self.course_data.location,
+                collected_block_structure=self.course_data.collected_structure,
+            )
+        return self._structures[signature]
+
+    @lazy
+    def _is_sharing_enabled(self):
+        """
+        Returns whether structures can be shared at all in this course.
+        """
+        return not (
+            has_individual_student_override_provider() or
+            any(block_key.block_type == 'library_content' for block_key in self.course_data.collected_structure)
+        )
+
+    def _get_signature(self, user):
+        """
+        Returns a hashable value that is equal for any two users who
+        are guaranteed to see the same course structure, or None if the
+        user's course structure must be computed individually.
+        """
+        course_key = self.course_data.course_key
+        if has_access(user, 'staff', course_key) or CourseBetaTesterRole(course_key).has_user(user):
+            return None
+
+        user_partitions = self.course_data.collected_structure.get_transformer_data(
+            UserPartitionTransformer, 'user_partitions',
+        ) or []
+        partition_groups = get_user_partition_groups(course_key, user_partitions, user, 'id')
+        return (
+            bool(ContentTypeGatingConfig.enabled_for_enrollment(user=user, course_key=course_key)),
+            tuple(sorted((partition_id, group.id) for partition_id, group in partition_groups.iteritems())),
+        )
@@ -1,4 +1,4 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from logging import getLogger
 
 from lazy import lazy
@@ -7,9 +7,12 @@ from courseware.model_data import ScoresClient
 from lms.djangoapps.grades.config import assume_zero_if_absent, should_persist_grades
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 from student.models import anonymous_id_for_user
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
 
 from .course_data import CourseData
 from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSubsectionGrade
@@ -21,6 +24,8 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
+    _SUBMISSIONS_CACHE_NAMESPACE = u'grades.subsection_grade_factory.submissions_scores'
+
     def __init__(self, student, course=None, course_structure=None, course_data=None):
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
@@ -113,9 +118,43 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        prefetched = get_cache(self._SUBMISSIONS_CACHE_NAMESPACE).get(str(self.course_data.course_key))
+        if prefetched is not None and self.student.id in prefetched:
+            return prefetched[self.student.id]
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
+    @classmethod
+    def prefetch_submissions_scores(cls, course_key, users):
+        """
+        Prefetches, with a single query, the scores stored by the
+        Submissions API for all the given users in the course, in the
+        format returned by submissions_api.get_scores.
+        """
+        anonymous_user_ids = {user.id: anonymous_id_for_user(user, course_key) for user in users}
+        scores_by_anonymous_id = defaultdict(dict)
+        score_summaries = ScoreSummary.objects.filter(
+            student_item__course_id=str(course_key),
+            student_item__student_id__in=anonymous_user_ids.values(),
+        ).select_related('latest', 'latest__submission', 'student_item')
+        for summary in score_summaries:
+            if not summary.latest.is_hidden():
+                student_item = summary.student_item
+                scores_by_anonymous_id[student_item.student_id][student_item.item_id] = (
+                    UnannotatedScoreSerializer(summary.latest).data
+                )
+        get_cache(cls._SUBMISSIONS_CACHE_NAMESPACE)[str(course_key)] = {
+            user_id: scores_by_anonymous_id.get(anonymous_user_id, {})
+            for user_id, anonymous_user_id in anonymous_user_ids.iteritems()
+        }
+
+    @classmethod
+    def clear_prefetched_submissions_scores(cls, course_key):
+        """
+        Clears prefetched submissions scores for the course from the RequestCache.
+        """
+        get_cache(cls._SUBMISSIONS_CACHE_NAMESPACE).pop(str(course_key), None)
+
     def _get_bulk_cached_grade(self, subsection):
         """
         Returns the student's SubsectionGrade for the subsection,
@@ -18,6 +18,7 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from ..config.waffle import ASSUME_ZERO_GRADE_IF_ABSENT, waffle
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
+from ..shared_structures import get_course_blocks
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
 from .base import GradeTestBase
 from .utils import mock_get_score
@@ -241,6 +242,7 @@ class TestCourseGradeFactory(GradeTestBase):
         self.assertEqual(expected_summary, actual_summary)
 
 
+@ddt.ddt
 class TestGradeIteration(SharedModuleStoreTestCase):
     """
     Test iteration through student course grades.
@@ -295,6 +297,34 @@ class TestGradeIteration(SharedModuleStoreTestCase):
             self.assertIsNone(course_grade.letter_grade)
             self.assertEqual(course_grade.percent, 0.0)
 
+    @ddt.data(True, False)
+    def test_batched_iteration(self, force_update):
+        """
+        Grading students in batches gives the same results as grading
+        them one at a time, while transforming the course structure
+        only once for students with the same view of the course.
+        """
+        expected_grades = {
+            student: course_grade.percent
+            for student, course_grade, _ in CourseGradeFactory().iter(
+                self.students, self.course, force_update=force_update,
+            )
+        }
+        with patch(
+            'lms.djangoapps.grades.shared_structures.get_course_blocks',
+            wraps=get_course_blocks,
+        ) as mock_get_course_blocks:
+            grade_results = list(CourseGradeFactory().iter(
+                self.students, self.course, force_update=force_update, batch_size=2,
+            ))
+            self.assertEqual(mock_get_course_blocks.call_count, 1)
+
+        self.assertEqual([error for _, _, error in grade_results], [None] * len(self.students))
+        self.assertEqual(
+            {student: course_grade.percent for student, course_grade, _ in grade_results},
+            expected_grades,
+        )
+
     @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read')
     def test_grading_exception(self, mock_course_grade):
         """Test that we correctly capture exception messages that bubble up from
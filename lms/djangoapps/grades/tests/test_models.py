@@ -24,7 +24,9 @@ from lms.djangoapps.grades.models import (
     PersistentSubsectionGrade,
     PersistentSubsectionGradeOverride,
     PersistentSubsectionGradeOverrideHistory,
-    VisibleBlocks
+    VisibleBlocks,
+    clear_prefetched_data_for_users,
+    prefetch_for_users
 )
 from student.tests.factories import UserFactory
 from track.event_transaction_utils import get_event_transaction_id, get_event_transaction_type
@@ -288,6 +290,69 @@ class PersistentSubsectionGradeTest(GradesModelTestCase):
         self.assertIsInstance(grade.first_attempted, datetime)
         self.assertEqual(grade.earned_all, 6.0)
 
+    def test_update_unchanged_prefetched_grade(self):
+        self.params['subtree_edited_timestamp'] = datetime(2016, 8, 1, 18, 53, 24, 354741, tzinfo=pytz.UTC)
+        created_grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        prefetch_for_users([self.user], self.course_key)
+        self.addCleanup(clear_prefetched_data_for_users, [self.user], self.course_key)
+
+        with patch('lms.djangoapps.grades.events.tracker') as tracker_mock:
+            with self.assertNumQueries(0):
+                grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        self.assertEqual(grade.id, created_grade.id)
+        self._assert_tracker_emitted_event(tracker_mock, grade)
+
+        self.params['earned_all'] = 7.0
+        with PersistentSubsectionGrade.deferred_writes(self.user.id, self.course_key):
+            PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        self.assertEqual(PersistentSubsectionGrade.read_grade(self.user.id, self.usage_key).earned_all, 7.0)
+        with self.assertNumQueries(0):
+            grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        self.assertEqual(grade.earned_all, 7.0)
+
+    def test_save_pending_grades(self):
+        self.params['subtree_edited_timestamp'] = datetime(2016, 8, 1, 18, 53, 24, 354741, tzinfo=pytz.UTC)
+        PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        prefetch_for_users([self.user], self.course_key)
+        self.addCleanup(clear_prefetched_data_for_users, [self.user], self.course_key)
+
+        self.params['earned_all'] = 7.0
+        new_usage_keys = [
+            BlockUsageLocator(course_key=self.course_key, block_type='subsection', block_id=block_id)
+            for block_id in ('new_subsection_a', 'new_subsection_b')
+        ]
+        with patch('lms.djangoapps.grades.events.tracker') as tracker_mock:
+            with PersistentSubsectionGrade.deferred_writes(self.user.id, self.course_key):
+                with self.assertNumQueries(0):
+                    for usage_key in [self.usage_key] + new_usage_keys:
+                        PersistentSubsectionGrade.update_or_create_grade(**dict(self.params, usage_key=usage_key))
+                self.assertEqual(tracker_mock.emit.call_count, 0)
+
+                # one query to create the new grades, and one to update the existing one
+                with self.assertNumQueries(2):
+                    PersistentSubsectionGrade.save_pending_grades(self.user.id, self.course_key)
+                self.assertEqual(tracker_mock.emit.call_count, 3)
+
+        for usage_key in [self.usage_key] + new_usage_keys:
+            grade = PersistentSubsectionGrade.read_grade(self.user.id, usage_key)
+            self.assertEqual(grade.earned_all, 7.0)
+            self.assertEqual(grade.visible_blocks.blocks, self.block_records)
+
+    def test_prefetched_grade_written_unless_deferred(self):
+        other_user = UserFactory()
+        prefetch_for_users([self.user], self.course_key)
+        self.addCleanup(clear_prefetched_data_for_users, [self.user], self.course_key)
+        self.assertEqual(
+            PersistentSubsectionGrade.get_prefetched_grade(self.user.id, self.usage_key), (True, None),
+        )
+        self.assertEqual(
+            PersistentSubsectionGrade.get_prefetched_grade(other_user.id, self.usage_key), (False, None),
+        )
+
+        for user_id in (self.user.id, other_user.id):
+            PersistentSubsectionGrade.update_or_create_grade(**dict(self.params, user_id=user_id))
+            self.assertEqual(PersistentSubsectionGrade.read_grade(user_id, self.usage_key).earned_all, 6.0)
+
     def test_update_or_create_event(self):
         with patch('lms.djangoapps.grades.events.tracker') as tracker_mock:
             grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
@@ -463,10 +528,36 @@ class PersistentCourseGradesTest(GradesModelTestCase):
         with self.assertRaises(error):
             PersistentCourseGrade.update_or_create(**self.params)
 
+    def test_update_unchanged_prefetched_grade(self):
+        created_grade = PersistentCourseGrade.update_or_create(**self.params)
+        PersistentCourseGrade.prefetch(self.course_key, [UserFactory(id=self.params['user_id'])])
+        self.addCleanup(PersistentCourseGrade.clear_prefetched_data, self.course_key)
+
+        with self.assertNumQueries(0):
+            grade = PersistentCourseGrade.update_or_create(**self.params)
+        self.assertEqual(grade.id, created_grade.id)
+
+        self.params['percent_grade'] = 88.8
+        PersistentCourseGrade.update_or_create(**self.params)
+        self.assertEqual(PersistentCourseGrade.objects.get(id=created_grade.id).percent_grade, 88.8)
+
     def test_grade_does_not_exist(self):
         with self.assertRaises(PersistentCourseGrade.DoesNotExist):
             PersistentCourseGrade.read(self.params["user_id"], self.params["course_id"])
 
+    def test_prefetch_for_user(self):
+        created_grade = PersistentCourseGrade.update_or_create(**self.params)
+        other_course_key = CourseLocator(org='some_org', course='some_other_course', run='some_run')
+        user = UserFactory(id=self.params['user_id'])
+        PersistentCourseGrade.prefetch_for_user(user, [self.course_key, other_course_key])
+        self.addCleanup(PersistentCourseGrade.clear_prefetched_data, self.course_key)
+        self.addCleanup(PersistentCourseGrade.clear_prefetched_data, other_course_key)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(PersistentCourseGrade.read(user.id, self.course_key), created_grade)
+            with self.assertRaises(PersistentCourseGrade.DoesNotExist):
+                PersistentCourseGrade.read(user.id, other_course_key)
+
     def test_update_or_create_event(self):
         with patch('lms.djangoapps.grades.events.tracker') as tracker_mock:
             grade = PersistentCourseGrade.update_or_create(**self.params)
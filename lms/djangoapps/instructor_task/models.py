@@ -18,12 +18,13 @@ import hashlib
 import json
 import logging
 import os.path
+from tempfile import TemporaryFile
 from uuid import uuid4
 
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files import File
 from django.db import models, transaction
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
@@ -267,18 +268,44 @@ class DjangoStorageReportStore(ReportStore):
         path = self.path_to(course_id, filename)
         self.storage.save(path, buff)
 
-    def store_rows(self, course_id, filename, rows):
+    def store_rows(self, course_id, filename, rows, include_bom=True):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        include_bom should only be False for files that are not
+        downloaded as is, e.g. parts of a report to be concatenated.
+        """
+        # Rows are written to a temporary file as they are consumed, so that
+        # memory use doesn't grow with the size of the report when rows is
+        # a generator.
+        with TemporaryFile() as output_file:
+            if include_bom:
+                # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+                output_file.write(codecs.BOM_UTF8)
+            csvwriter = csv.writer(output_file)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file))
+
+    def open(self, course_id, filename):
+        """
+        Returns a file-like object for reading the file with the given
+        filename for the given course.
+        """
+        return self.storage.open(self.path_to(course_id, filename))
+
+    def exists(self, course_id, filename):
+        """
+        Returns whether a file with the given filename exists for the given course.
+        """
+        return self.storage.exists(self.path_to(course_id, filename))
+
+    def delete(self, course_id, filename):
+        """
+        Deletes the file with the given filename for the given course.
         """
-        output_buffer = ContentFile('')
-        # Adding unicode signature (BOM) for MS Excel 2013 compatibility
-        output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -187,6 +187,41 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(
+    routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+    soft_time_limit=CourseGradeReport.SHARD_SOFT_TIME_LIMIT,
+    time_limit=CourseGradeReport.SHARD_TIME_LIMIT,
+)
+def calculate_grades_csv_shard(entry_id, xmodule_instance_args, shard, subtask_status_dict):
+    """
+    Grade a shard of the enrollees of a course, as a subtask of a
+    parallel calculate_grades_csv task.
+    """
+    return CourseGradeReport.generate_shard(entry_id, xmodule_instance_args, shard, subtask_status_dict)
+
+
+@task(
+    routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+    soft_time_limit=CourseGradeReport.SHARD_SOFT_TIME_LIMIT,
+    time_limit=CourseGradeReport.SHARD_TIME_LIMIT,
+)
+def merge_grades_csv_shards(entry_id, xmodule_instance_args, report, subtask_status_dict):
+    """
+    Merge the shards computed by calculate_grades_csv_shard subtasks and
+    push the results to an S3 bucket for download.
+    """
+    return CourseGradeReport.merge_shards(entry_id, xmodule_instance_args, report, subtask_status_dict)
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
+def check_grades_csv_shards(entry_id, xmodule_instance_args, report):
+    """
+    Check for subtasks of a parallel calculate_grades_csv task that are
+    not done past their deadline, and fail them if so.
+    """
+    return CourseGradeReport.check_shards(entry_id, xmodule_instance_args, report)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
@@ -1,15 +1,22 @@
 """
 Functionality for generating grade reports.
 """
+import cPickle
+import json
 import logging
 import re
+import traceback
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain, izip, izip_longest
+from itertools import chain, islice, izip, izip_longest
+from tempfile import TemporaryFile
 from time import time
+from uuid import uuid4
 
+from celery.states import FAILURE, READY_STATES, SUCCESS
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.db import transaction
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -19,11 +26,17 @@ from course_blocks.api import get_course_blocks
 from courseware.courses import get_course_by_id
 from courseware.user_state_client import DjangoXBlockUserStateClient
 from instructor_analytics.basic import list_problem_responses
-from instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.certificates.models import CertificateWhitelist, GeneratedCertificate, certificate_info_for_user
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.instructor_task.models import PROGRESS, QUEUING, InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    initialize_subtask_info,
+    update_subtask_status
+)
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -34,14 +47,16 @@ from student.models import CourseEnrollment
 from student.roles import BulkRoleCache
 from xmodule.modulestore.django import modulestore
 from xmodule.partitions.partitions_service import PartitionService
+from util.db import outer_atomic
 from xmodule.split_test_module import get_split_user_partitions
 
 from .runner import TaskProgress
-from .utils import upload_csv_to_report_store
+from .utils import ReportCSVWriter, upload_csv_parts_to_report_store
 
 WAFFLE_NAMESPACE = 'instructor_task'
 WAFFLE_SWITCHES = WaffleSwitchNamespace(name=WAFFLE_NAMESPACE)
 OPTIMIZE_GET_LEARNERS_FOR_COURSE = 'optimize_get_learners_for_course'
+PARALLEL_GRADE_REPORTS = 'parallel_grade_reports'
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
@@ -201,11 +216,32 @@ class CourseGradeReport(object):
     # Batch size for chunking the list of enrollees in the course.
     USER_BATCH_SIZE = 100
 
+    # Number of enrollees graded by each subtask of a parallel grade report.
+    USERS_PER_SHARD = 5000
+
+    # Soft and hard time limits, in seconds, of the subtasks grading the
+    # shards of a parallel grade report, and of the one merging them.
+    SHARD_SOFT_TIME_LIMIT = 60 * 60
+    SHARD_TIME_LIMIT = SHARD_SOFT_TIME_LIMIT + 5 * 60
+
+    # Interval, in seconds, between checks for subtasks of a parallel
+    # grade report that were killed before recording their status.
+    SHARD_CHECK_INTERVAL = 5 * 60
+
+    # Time, in seconds, within which a queued subtask of a parallel grade
+    # report must start running.  It expires afterwards, and is failed.
+    SHARD_QUEUE_TIMEOUT = 24 * 60 * 60
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
         Public method to generate a grade report.
         """
+        if WAFFLE_SWITCHES.is_enabled(PARALLEL_GRADE_REPORTS):
+            progress = cls._queue_shards(_xmodule_instance_args, _entry_id, course_id, action_name)
+            if progress is not None:
+                return progress
+
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
             return CourseGradeReport()._generate(context)
@@ -215,15 +251,15 @@ class CourseGradeReport(object):
         Internal method for generating a grade report for the given context.
         """
         context.update_status(u'Starting grades')
-        success_headers = self._success_headers(context)
-        error_headers = self._error_headers()
-        batched_rows = self._batched_rows(context)
+        with ReportCSVWriter(self._success_headers(context)) as success_writer, \
+                ReportCSVWriter(self._error_headers()) as error_writer:
+            batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+            context.update_status(u'Compiling grades')
+            self._compile(context, batched_rows, success_writer, error_writer)
 
-        context.update_status(u'Uploading grades')
-        self._upload(context, success_headers, success_rows, error_headers, error_rows)
+            context.update_status(u'Uploading grades')
+            self._upload(context, success_writer, error_writer)
 
         return context.update_status(u'Completed grades')
 
@@ -256,32 +292,30 @@ class CourseGradeReport(object):
             users = filter(lambda u: u is not None, users)
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, success_writer, error_writer):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        Writes the given batched_rows to the given writers of successes
+        and errors, batch by batch, so that the complete lists of rows
+        are never held in memory.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = izip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        for success_rows, error_rows in batched_rows:
+            success_writer.writerows(success_rows)
+            error_writer.writerows(error_rows)
 
         # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
+        context.task_progress.succeeded = success_writer.num_rows
+        context.task_progress.failed = error_writer.num_rows
         context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
         context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
 
-    def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
+    def _upload(self, context, success_writer, error_writer):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Uploads the CSVs written by the given writers.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
-        if len(error_rows) > 0:
-            error_rows = [error_headers] + error_rows
-            upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
+        success_writer.upload('grade_report', context.course_id, date)
+        if error_writer.num_rows > 0:
+            error_writer.upload('grade_report_err', context.course_id, date)
 
     def _grades_header(self, context):
         """
@@ -469,6 +503,399 @@ class CourseGradeReport(object):
         )
         return certificate_info
 
+    @classmethod
+    def _queue_shards(cls, xmodule_instance_args, entry_id, course_id, action_name):
+        """
+        Splits the report into shards of enrollees, ordered by user id,
+        and queues a subtask to compute the rows of each shard.  Once all
+        shards are computed, a final subtask merges and uploads them.
+
+        Progress is aggregated in the InstructorTask of the report, which
+        counts the merge stage as a subtask so that the report is only
+        marked as completed once it is uploaded.  The InstructorTask also
+        records a deadline for each subtask, by which it must be done; a
+        last subtask periodically fails the subtasks past their deadline,
+        such as those killed before they could record their status.  See
+        check_shards.
+
+        Returns the initial task progress, or None if the course has no
+        enrollees to shard.
+        """
+        # Imported here to avoid a circular import, since tasks import this module.
+        from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard, check_grades_csv_shards
+
+        user_ids = list(
+            get_user_model().objects.filter(courseenrollment__course_id=course_id).values_list(
+                'id', flat=True,
+            ).order_by('id')
+        )
+        if not user_ids:
+            return None
+
+        shard_ranges = [
+            (user_ids[start], user_ids[min(start + cls.USERS_PER_SHARD, len(user_ids)) - 1])
+            for start in xrange(0, len(user_ids), cls.USERS_PER_SHARD)
+        ]
+        shard_subtask_ids = [str(uuid4()) for _ in shard_ranges]
+        merge_subtask_id = str(uuid4())
+
+        report = {
+            'merge_subtask_id': merge_subtask_id,
+            'num_shards': len(shard_ranges),
+            'action_name': action_name,
+        }
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        with outer_atomic():
+            progress = initialize_subtask_info(
+                entry, action_name, len(user_ids), shard_subtask_ids + [merge_subtask_id],
+            )
+            # The merge subtask only gets a deadline once it is queued.
+            deadline = time() + cls.SHARD_QUEUE_TIMEOUT
+            subtask_dict = json.loads(entry.subtasks)
+            subtask_dict['deadlines'] = dict.fromkeys(shard_subtask_ids, deadline)
+            subtask_dict['deadlines'][merge_subtask_id] = None
+            entry.subtasks = json.dumps(subtask_dict)
+            entry.save_now()
+
+        TASK_LOG.info(
+            u'Task: %s, InstructorTask ID: %s, Course: %s, Queuing %s grade report shards for %s users',
+            entry.task_id, entry_id, course_id, len(shard_ranges), len(user_ids),
+        )
+        for index, (subtask_id, (min_user_id, max_user_id)) in enumerate(izip(shard_subtask_ids, shard_ranges)):
+            shard = {
+                'index': index,
+                'min_user_id': min_user_id,
+                'max_user_id': max_user_id,
+                'report': report,
+            }
+            calculate_grades_csv_shard.apply_async(
+                args=(entry_id, xmodule_instance_args, shard, SubtaskStatus.create(subtask_id).to_dict()),
+                task_id=subtask_id,
+                expires=cls.SHARD_QUEUE_TIMEOUT,
+            )
+        check_grades_csv_shards.apply_async(
+            args=(entry_id, xmodule_instance_args, report),
+            countdown=cls.SHARD_CHECK_INTERVAL,
+        )
+        return progress
+
+    @classmethod
+    def generate_shard(cls, entry_id, xmodule_instance_args, shard, subtask_status_dict):
+        """
+        Computes the rows of the given shard of a parallel grade report
+        and stores them as parts of the report, then queues the merge
+        stage if this was the last shard to complete.
+
+        Rows are written to the parts batch by batch, and the progress of
+        the shard is recorded after each batch.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+        subtask_status.increment(state=PROGRESS)
+        if not cls._record_subtask_progress(entry_id, subtask_status, cls._running_deadline()):
+            return subtask_status.to_dict()
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        course_id = entry.course_id
+        try:
+            with modulestore().bulk_operations(course_id):
+                context = _CourseGradeReportContext(
+                    xmodule_instance_args, entry_id, course_id, json.loads(entry.task_input),
+                    shard['report']['action_name'],
+                )
+                report = CourseGradeReport()
+                with ReportCSVWriter() as success_writer, ReportCSVWriter() as error_writer:
+                    for users in report._users_in_range(course_id, shard['min_user_id'], shard['max_user_id']):
+                        success_rows, error_rows = report._rows_for_users(context, users)
+                        success_writer.writerows(success_rows)
+                        error_writer.writerows(error_rows)
+                        subtask_status.increment(succeeded=len(success_rows), failed=len(error_rows))
+                        if not cls._record_subtask_progress(entry_id, subtask_status):
+                            return subtask_status.to_dict()
+
+                    success_writer.store(course_id, cls._shard_part_name(entry_id, 'grade_report', shard['index']))
+                    if error_writer.num_rows > 0:
+                        error_writer.store(
+                            course_id, cls._shard_part_name(entry_id, 'grade_report_err', shard['index']),
+                        )
+        except Exception:  # pylint: disable=broad-except
+            TASK_LOG.exception(
+                u'InstructorTask ID: %s, Course: %s, Failed to compute grade report shard %s',
+                entry_id, course_id, shard['index'],
+            )
+            subtask_status.increment(state=FAILURE)
+        else:
+            subtask_status.increment(state=SUCCESS)
+
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        cls._queue_merge_if_completed(entry_id, xmodule_instance_args, shard['report'])
+        return subtask_status.to_dict()
+
+    @classmethod
+    def merge_shards(cls, entry_id, xmodule_instance_args, report, subtask_status_dict):
+        """
+        Assembles the stored parts of all shards of a parallel grade
+        report into the final grade report (and error report, if any
+        learner could not be graded), uploads them, and deletes the parts.
+        The report is marked as failed if any shard failed.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+        subtask_status.increment(state=PROGRESS)
+        if not cls._record_subtask_progress(entry_id, subtask_status, cls._running_deadline()):
+            return subtask_status.to_dict()
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        course_id = entry.course_id
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        part_names = [
+            cls._shard_part_name(entry_id, 'grade_report', index) for index in xrange(report['num_shards'])
+        ]
+        error_part_names = [
+            part_name for part_name in (
+                cls._shard_part_name(entry_id, 'grade_report_err', index) for index in xrange(report['num_shards'])
+            )
+            if report_store.exists(course_id, part_name)
+        ]
+        failure = None
+        try:
+            if not cls._shards_completed(entry_id, current_task_id, required_state=SUCCESS):
+                raise ValueError(u'Not all shards of the grade report were computed successfully.')
+
+            with modulestore().bulk_operations(course_id):
+                context = _CourseGradeReportContext(
+                    xmodule_instance_args, entry_id, course_id, json.loads(entry.task_input), report['action_name'],
+                )
+                grade_report = CourseGradeReport()
+                date = datetime.now(UTC)
+                upload_csv_parts_to_report_store(
+                    grade_report._success_headers(context), part_names, 'grade_report', course_id, date,
+                )
+                if error_part_names:
+                    upload_csv_parts_to_report_store(
+                        grade_report._error_headers(), error_part_names, 'grade_report_err', course_id, date,
+                    )
+        except Exception as exception:  # pylint: disable=broad-except
+            TASK_LOG.exception(u'InstructorTask ID: %s, Course: %s, Failed to merge grade report', entry_id, course_id)
+            failure = (exception, traceback.format_exc())
+            subtask_status.increment(state=FAILURE)
+        else:
+            subtask_status.increment(state=SUCCESS)
+        finally:
+            for part_name in part_names + error_part_names:
+                if report_store.exists(course_id, part_name):
+                    report_store.delete(course_id, part_name)
+
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        if failure is not None:
+            cls._mark_failed(entry_id, *failure)
+        return subtask_status.to_dict()
+
+    @classmethod
+    def check_shards(cls, entry_id, xmodule_instance_args, report):
+        """
+        Records the failure of the subtasks of a parallel grade report
+        that are not done past their deadline, such as subtasks killed
+        for exceeding their hard time limit, or lost before they started.
+        Then queues the merge stage if all shards are done, and checks
+        again later, until the report is done.
+
+        Only the InstructorTask is checked, so that this works whether
+        or not celery stores the results of tasks.
+        """
+        # Imported here to avoid a circular import, since tasks import this module.
+        from lms.djangoapps.instructor_task.tasks import check_grades_csv_shards
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        if entry.task_state != PROGRESS:
+            return
+
+        for subtask_id in cls._fail_expired_subtasks(entry_id):
+            TASK_LOG.error(
+                u'InstructorTask ID: %s, Grade report subtask %s did not record its status by its deadline',
+                entry_id, subtask_id,
+            )
+            if subtask_id == report['merge_subtask_id']:
+                cls._mark_failed(entry_id, ValueError(u'The grade report could not be merged.'), None)
+                return
+
+        cls._queue_merge_if_completed(entry_id, xmodule_instance_args, report)
+        check_grades_csv_shards.apply_async(
+            args=(entry_id, xmodule_instance_args, report),
+            countdown=cls.SHARD_CHECK_INTERVAL,
+        )
+
+    @classmethod
+    def _queue_merge_if_completed(cls, entry_id, xmodule_instance_args, report):
+        """
+        Queues the merge stage of a parallel grade report if all of its
+        shards are done, unless it was already queued.
+        """
+        # Imported here to avoid a circular import, since tasks import this module.
+        from lms.djangoapps.instructor_task.tasks import merge_grades_csv_shards
+
+        if cls._claim_merge(entry_id, report['merge_subtask_id']):
+            merge_subtask_status = SubtaskStatus.create(report['merge_subtask_id'])
+            merge_grades_csv_shards.apply_async(
+                args=(entry_id, xmodule_instance_args, report, merge_subtask_status.to_dict()),
+                task_id=report['merge_subtask_id'],
+                expires=cls.SHARD_QUEUE_TIMEOUT,
+            )
+
+    @classmethod
+    def _running_deadline(cls):
+        """
+        Returns the deadline of a subtask of a parallel grade report that
+        starts running now.  Subtasks are killed at their hard time limit,
+        and always record their status before, barring clock skew between
+        servers, which the check interval leaves room for.
+        """
+        return time() + cls.SHARD_TIME_LIMIT + cls.SHARD_CHECK_INTERVAL
+
+    @staticmethod
+    @transaction.atomic
+    def _record_subtask_progress(entry_id, subtask_status, deadline=None):
+        """
+        Records the status of the given subtask of the given InstructorTask
+        while it runs, and its new deadline if given.  Counts are only
+        aggregated into the progress of the InstructorTask once subtasks
+        are done, see update_subtask_status.
+
+        Returns False, without recording anything, if the subtask was
+        already failed meanwhile, in which case it should stop.
+
+        Uses select_for_update to lock the InstructorTask object, so that
+        the subtask can't be failed meanwhile.
+        """
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        if subtask_dict['status'][subtask_status.task_id]['state'] in READY_STATES:
+            TASK_LOG.warning(
+                u'InstructorTask ID: %s, Grade report subtask %s was already done, stopping',
+                entry_id, subtask_status.task_id,
+            )
+            return False
+
+        subtask_dict['status'][subtask_status.task_id] = subtask_status.to_dict()
+        if deadline is not None:
+            subtask_dict['deadlines'][subtask_status.task_id] = deadline
+        entry.subtasks = json.dumps(subtask_dict)
+        entry.save()
+        return True
+
+    @staticmethod
+    @transaction.atomic
+    def _fail_expired_subtasks(entry_id):
+        """
+        Marks the subtasks of the given InstructorTask that are not done
+        past their deadline as failed, and returns their ids.
+
+        Uses select_for_update to lock the InstructorTask object, so that
+        subtasks can't record their progress meanwhile.
+        """
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        now = time()
+        expired_subtask_ids = [
+            subtask_id
+            for subtask_id, deadline in subtask_dict['deadlines'].iteritems()
+            if deadline is not None and deadline < now
+            and subtask_dict['status'][subtask_id]['state'] not in READY_STATES
+        ]
+        for subtask_id in expired_subtask_ids:
+            subtask_status = SubtaskStatus.from_dict(subtask_dict['status'][subtask_id])
+            subtask_status.increment(state=FAILURE)
+            update_subtask_status(entry_id, subtask_id, subtask_status)
+        return expired_subtask_ids
+
+    @classmethod
+    @transaction.atomic
+    def _claim_merge(cls, entry_id, merge_subtask_id):
+        """
+        Returns whether all shard subtasks of the given InstructorTask are
+        done and the merge subtask wasn't yet claimed, in which case it's
+        claimed for the caller to queue, and given a deadline.
+
+        Uses select_for_update to lock the InstructorTask object, so that
+        the merge subtask is only ever claimed once.
+        """
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        subtask_dict = json.loads(entry.subtasks)
+        subtask_status_info = subtask_dict['status']
+        if subtask_status_info[merge_subtask_id]['state'] != QUEUING:
+            return False
+        if not all(
+            status['state'] in READY_STATES
+            for subtask_id, status in subtask_status_info.iteritems()
+            if subtask_id != merge_subtask_id
+        ):
+            return False
+
+        subtask_status_info[merge_subtask_id]['state'] = PROGRESS
+        subtask_dict['deadlines'][merge_subtask_id] = time() + cls.SHARD_QUEUE_TIMEOUT
+        entry.subtasks = json.dumps(subtask_dict)
+        entry.save()
+        return True
+
+    @staticmethod
+    @transaction.atomic
+    def _mark_failed(entry_id, exception, traceback_string):
+        """
+        Marks the given InstructorTask as failed with the given exception.
+        """
+        entry = InstructorTask.objects.select_for_update().get(pk=entry_id)
+        entry.task_state = FAILURE
+        entry.task_output = InstructorTask.create_output_for_failure(exception, traceback_string)
+        entry.save()
+
+    @staticmethod
+    def _shards_completed(entry_id, merge_subtask_id, required_state=None):
+        """
+        Returns whether all shard subtasks of the given InstructorTask
+        are done, i.e. all subtasks other than the merge subtask.  If
+        required_state is given, the shards must all be in that state.
+        """
+        entry = InstructorTask.objects.get(pk=entry_id)
+        subtask_status_info = json.loads(entry.subtasks)['status']
+        return all(
+            status['state'] == required_state if required_state else status['state'] in READY_STATES
+            for subtask_id, status in subtask_status_info.iteritems()
+            if subtask_id != merge_subtask_id
+        )
+
+    @staticmethod
+    def _shard_part_name(entry_id, csv_name, index):
+        """
+        Returns the name of the stored part of the given shard.  Parts are
+        stored in a subdirectory so that they are not listed as reports.
+        """
+        return u'grade_report_parts/{entry_id}/{csv_name}_{index:05d}.csv'.format(
+            entry_id=entry_id, csv_name=csv_name, index=index,
+        )
+
+    def _users_in_range(self, course_id, min_user_id, max_user_id):
+        """
+        Returns a generator of batches of the users enrolled in the
+        course whose ids are in the given (inclusive) range.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': course_id,
+            'id__gte': min_user_id,
+            'id__lte': max_user_id,
+        }
+        user_ids = list(get_user_model().objects.filter(**filter_kwargs).values_list('id', flat=True).order_by('id'))
+        for start in xrange(0, len(user_ids), self.USER_BATCH_SIZE):
+            yield list(
+                get_user_model().objects.filter(
+                    id__in=user_ids[start:start + self.USER_BATCH_SIZE],
+                ).select_related('profile').order_by('id')
+            )
+
     def _rows_for_users(self, context, users):
         """
         Returns a list of rows for the given users for this report.
@@ -519,59 +946,80 @@ class ProblemGradeReport(object):
         header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
 
         course = get_course_by_id(course_id)
+        course_structure = get_course_in_cache(course_id)
         graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course)
 
         # Just generate the static fields for now.
-        rows = [list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())]
-        error_rows = [list(header_row.values()) + ['error_msg']]
+        rows_writer = ReportCSVWriter(
+            list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())
+        )
+        error_rows_writer = ReportCSVWriter(list(header_row.values()) + ['error_msg'])
         current_step = {'step': 'Calculating Grades'}
 
-        # Bulk fetch and cache enrollment states so we can efficiently determine
-        # whether each user is currently enrolled in the course.
-        CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
-
-        for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
-            student_fields = [getattr(student, field_name) for field_name in header_row]
-            task_progress.attempted += 1
-
-            if not course_grade:
-                err_msg = text_type(error)
-                # There was an error grading this student.
-                if not err_msg:
-                    err_msg = u'Unknown error'
-                error_rows.append(student_fields + [err_msg])
-                task_progress.failed += 1
-                continue
-
-            enrollment_status = _user_enrollment_status(student, course_id)
-
-            earned_possible_values = []
-            for block_location in graded_scorable_blocks:
-                try:
-                    problem_score = course_grade.problem_scores[block_location]
-                except KeyError:
-                    earned_possible_values.append([u'Not Available', u'Not Available'])
-                else:
-                    if problem_score.first_attempted:
-                        earned_possible_values.append([problem_score.earned, problem_score.possible])
-                    else:
-                        earned_possible_values.append([u'Not Attempted', problem_score.possible])
-
-            rows.append(student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values))
+        with rows_writer, error_rows_writer:
+            for students in cls._batch_students(enrolled_students):
+                # Bulk fetch and cache enrollment states so we can efficiently determine
+                # whether each user is currently enrolled in the course.
+                CourseEnrollment.bulk_fetch_enrollment_states(students, course_id)
+
+                for student, course_grade, error in CourseGradeFactory().iter(
+                        students, course, collected_block_structure=course_structure,
+                ):
+                    student_fields = [getattr(student, field_name) for field_name in header_row]
+                    task_progress.attempted += 1
+
+                    if not course_grade:
+                        err_msg = text_type(error)
+                        # There was an error grading this student.
+                        if not err_msg:
+                            err_msg = u'Unknown error'
+                        error_rows_writer.writerow(student_fields + [err_msg])
+                        task_progress.failed += 1
+                        continue
+
+                    enrollment_status = _user_enrollment_status(student, course_id)
+
+                    earned_possible_values = []
+                    for block_location in graded_scorable_blocks:
+                        try:
+                            problem_score = course_grade.problem_scores[block_location]
+                        except KeyError:
+                            earned_possible_values.append([u'Not Available', u'Not Available'])
+                        else:
+                            if problem_score.first_attempted:
+                                earned_possible_values.append([problem_score.earned, problem_score.possible])
+                            else:
+                                earned_possible_values.append([u'Not Attempted', problem_score.possible])
+
+                    rows_writer.writerow(
+                        student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values)
+                    )
 
-            task_progress.succeeded += 1
-            if task_progress.attempted % status_interval == 0:
-                task_progress.update_task_state(extra_meta=current_step)
+                    task_progress.succeeded += 1
+                    if task_progress.attempted % status_interval == 0:
+                        task_progress.update_task_state(extra_meta=current_step)
 
-        # Perform the upload if any students have been successfully graded
-        if len(rows) > 1:
-            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-        # If there are any error rows, write them out as well
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+            # Perform the upload if any students have been successfully graded
+            if rows_writer.num_rows > 0:
+                rows_writer.upload('problem_grade_report', course_id, start_date)
+            # If there are any error rows, write them out as well
+            if error_rows_writer.num_rows > 0:
+                error_rows_writer.upload('problem_grade_report_err', course_id, start_date)
 
         return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
 
+    @classmethod
+    def _batch_students(cls, students):
+        """
+        Returns a generator of lists of at most USER_BATCH_SIZE of the
+        given students, without loading all of them at once.
+        """
+        students = students.iterator()
+        batch = list(islice(students, CourseGradeReport.USER_BATCH_SIZE))
+        while batch:
+            yield batch
+            batch = list(islice(students, CourseGradeReport.USER_BATCH_SIZE))
+
     @classmethod
     def _graded_scorable_blocks_to_header(cls, course):
         """
@@ -644,18 +1092,37 @@ class ProblemResponses(object):
                 containing the student data which will be included in the
                 final csv, and the features/keys to include in that CSV.
         """
+        student_data_keys = set()
+        student_data = list(cls._iter_student_data(user_id, course_key, usage_key_str, student_data_keys))
+        return student_data, cls._student_data_keys_list(student_data_keys)
+
+    @classmethod
+    def _iter_student_data(cls, user_id, course_key, usage_key_str, student_data_keys):
+        """
+        Generates the problem responses for all problems under the
+        ``problem_location`` root, one at a time.
+
+        Arguments:
+            user_id (int): The user id for the user generating the report
+            course_key (CourseKey): The ``CourseKey`` for the course whose report
+                is being generated
+            usage_key_str (str): The generated report will include this
+                block and it child blocks.
+            student_data_keys (set): The keys of the student data returned
+                by xblock report generators are added to this set.
+
+        Yields:
+            Dict: the student data of a response, to be included in the final csv.
+        """
         usage_key = UsageKey.from_string(usage_key_str).map_into_course(course_key)
         user = get_user_model().objects.get(pk=user_id)
         course_blocks = get_course_blocks(user, usage_key)
 
-        student_data = []
         max_count = settings.FEATURES.get('MAX_PROBLEM_RESPONSES_COUNT')
 
         store = modulestore()
         user_state_client = DjangoXBlockUserStateClient()
 
-        student_data_keys = set()
-
         with store.bulk_operations(course_key):
             for title, path, block_key in cls._build_problem_list(course_blocks, usage_key):
                 # Chapter and sequential blocks are filtered out since they include state
@@ -681,7 +1148,6 @@ class ProblemResponses(object):
 
                 responses = list_problem_responses(course_key, block_key, max_count)
 
-                student_data += responses
                 for response in responses:
                     response['title'] = title
                     # A human-readable location for the current block
@@ -690,23 +1156,28 @@ class ProblemResponses(object):
                     response['block_key'] = str(block_key)
                     user_data = generated_report_data.get(response['username'], {})
                     response.update(user_data)
-                    student_data_keys = student_data_keys.union(user_data.keys())
+                    student_data_keys.update(user_data.keys())
+                    yield response
                 if max_count is not None:
                     max_count -= len(responses)
                     if max_count <= 0:
                         break
 
+    @staticmethod
+    def _student_data_keys_list(student_data_keys):
+        """
+        Returns the ordered list of the CSV columns for the given keys
+        returned by xblock report generators.
+        """
         # Keep the keys in a useful order, starting with username, title and location,
         # then the columns returned by the xblock report generator in sorted order and
         # finally end with the more machine friendly block_key and state.
-        student_data_keys_list = (
+        return (
             ['username', 'title', 'location'] +
             sorted(student_data_keys) +
             ['block_key', 'state']
         )
 
-        return student_data, student_data_keys_list
-
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, task_input, action_name):
         """
@@ -720,32 +1191,39 @@ class ProblemResponses(object):
         current_step = {'step': 'Calculating students answers to problem'}
         task_progress.update_task_state(extra_meta=current_step)
         problem_location = task_input.get('problem_location')
+        problem_location_name = re.sub(r'[:/]', '_', problem_location)
+        csv_name = 'student_state_from_{}'.format(problem_location_name)
 
-        # Compute result table and format it
-        student_data, student_data_keys = cls._build_student_data(
-            user_id=task_input.get('user_id'),
-            course_key=course_id,
-            usage_key_str=problem_location
-        )
-
-        for data in student_data:
-            for key in student_data_keys:
-                data.setdefault(key, '')
-
-        header, rows = format_dictlist(student_data, student_data_keys)
+        # The columns of the report are only known once all responses
+        # are computed, so responses are spooled to a temporary file
+        # rather than held in memory until the CSV can be written.
+        student_data_keys = set()
+        num_rows = 0
+        with TemporaryFile() as spool_file:
+            for data in cls._iter_student_data(
+                user_id=task_input.get('user_id'),
+                course_key=course_id,
+                usage_key_str=problem_location,
+                student_data_keys=student_data_keys,
+            ):
+                cPickle.dump(data, spool_file, cPickle.HIGHEST_PROTOCOL)
+                num_rows += 1
 
-        task_progress.attempted = task_progress.succeeded = len(rows)
-        task_progress.skipped = task_progress.total - task_progress.attempted
+            task_progress.attempted = task_progress.succeeded = num_rows
+            task_progress.skipped = task_progress.total - task_progress.attempted
 
-        rows.insert(0, header)
+            current_step = {'step': 'Uploading CSV'}
+            task_progress.update_task_state(extra_meta=current_step)
 
-        current_step = {'step': 'Uploading CSV'}
-        task_progress.update_task_state(extra_meta=current_step)
+            # Perform the upload
+            header = cls._student_data_keys_list(student_data_keys)
+            spool_file.seek(0)
+            with ReportCSVWriter(header) as writer:
+                for _ in xrange(num_rows):
+                    data = cPickle.load(spool_file)
+                    writer.writerow([data.get(key, '') for key in header])
+                report_name = writer.upload(csv_name, course_id, start_date)
 
-        # Perform the upload
-        problem_location = re.sub(r'[:/]', '_', problem_location)
-        csv_name = 'student_state_from_{}'.format(problem_location)
-        report_name = upload_csv_to_report_store(rows, csv_name, course_id, start_date)
         current_step = {'step': 'CSV uploaded', 'report_name': report_name}
 
         return task_progress.update_task_state(extra_meta=current_step)
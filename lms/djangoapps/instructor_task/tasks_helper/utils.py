@@ -1,3 +1,9 @@
+import codecs
+import csv
+import shutil
+from tempfile import TemporaryFile
+
+from django.core.files import File
 from eventtracking import tracker
 from lms.djangoapps.instructor_task.models import ReportStore
 from util.file import course_filename_prefix_generator
@@ -31,17 +37,130 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
         report_name: string - Name of the generated report
     """
     report_store = ReportStore.from_config(config_name)
-    report_name = u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-        course_prefix=course_filename_prefix_generator(course_id),
-        csv_name=csv_name,
-        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-    )
+    report_name = _report_name(csv_name, course_id, timestamp)
 
     report_store.store_rows(course_id, report_name, rows)
     tracker_emit(csv_name)
     return report_name
 
 
+def upload_csv_parts_to_report_store(header_row, part_names, csv_name, course_id, timestamp,
+                                     config_name='GRADES_DOWNLOAD'):
+    """
+    Upload a CSV assembled from previously stored parts using ReportStore.
+
+    Arguments:
+        header_row: the first row of the resulting CSV
+        part_names: names of the parts in the report store, in order.
+            Each part is a CSV stored without a unicode signature (BOM).
+        csv_name: Name of the resulting CSV
+        course_id: ID of the course
+
+    Returns:
+        report_name: string - Name of the generated report
+    """
+    report_store = ReportStore.from_config(config_name)
+    with ReportCSVWriter(header_row) as writer:
+        for part_name in part_names:
+            with report_store.open(course_id, part_name) as part_file:
+                writer.write_csv_file(part_file)
+        return writer.upload(csv_name, course_id, timestamp, config_name)
+
+
+class ReportCSVWriter(object):
+    """
+    Writes the rows of a CSV report to a temporary file as they are
+    produced, then uploads the file using ReportStore.  Memory use
+    doesn't depend on the number of rows written.
+
+    Can be used as a context manager, which discards the temporary file
+    on exit.
+
+    Without a header_row, neither a header nor a unicode signature (BOM)
+    is written, so that the file can be stored as a part of a report to
+    be assembled later with write_csv_file.
+    """
+    def __init__(self, header_row=None):
+        self.num_rows = 0
+        self._file = TemporaryFile()
+        self._csv_writer = csv.writer(self._file)
+        if header_row is not None:
+            # Adding unicode signature (BOM) for MS Excel 2013 compatibility
+            self._file.write(codecs.BOM_UTF8)
+            self._csv_writer.writerow(_utf8_encoded_row(header_row))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def writerow(self, row):
+        """
+        Writes the given row, an iterable of unicode strings or values.
+        """
+        self._csv_writer.writerow(_utf8_encoded_row(row))
+        self.num_rows += 1
+
+    def writerows(self, rows):
+        """
+        Writes each of the given rows.
+        """
+        for row in rows:
+            self.writerow(row)
+
+    def write_csv_file(self, csv_file):
+        """
+        Appends the contents of the given file, which must contain utf-8
+        encoded CSV rows without a unicode signature (BOM).
+        """
+        shutil.copyfileobj(csv_file, self._file)
+
+    def upload(self, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
+        """
+        Uploads the rows written so far as a CSV report.
+
+        Returns:
+            report_name: string - Name of the generated report
+        """
+        report_name = _report_name(csv_name, course_id, timestamp)
+        self.store(course_id, report_name, config_name)
+        tracker_emit(csv_name)
+        return report_name
+
+    def store(self, course_id, filename, config_name='GRADES_DOWNLOAD'):
+        """
+        Stores the rows written so far under the given filename.
+        """
+        report_store = ReportStore.from_config(config_name)
+        self._file.seek(0)
+        report_store.store(course_id, filename, File(self._file))
+
+    def close(self):
+        """
+        Discards the temporary file.
+        """
+        self._file.close()
+
+
+def _utf8_encoded_row(row):
+    """
+    Returns the given row with its items encoded as utf-8 for CSV compatibility.
+    """
+    return [unicode(item).encode('utf-8') for item in row]
+
+
+def _report_name(csv_name, course_id, timestamp):
+    """
+    Returns the name of the report with the given CSV name and timestamp.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def tracker_emit(report_name):
     """
     Emits a 'report.requested' event for the given report.
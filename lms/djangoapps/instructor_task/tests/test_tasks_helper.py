@@ -8,9 +8,12 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import codecs
+import json
 import os
 import shutil
 import tempfile
+import time
 import urllib
 from contextlib import contextmanager
 from datetime import datetime, timedelta
@@ -18,6 +21,7 @@ from datetime import datetime, timedelta
 import ddt
 import unicodecsv
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
+from celery.states import FAILURE, SUCCESS
 from course_modes.models import CourseMode
 from course_modes.tests.factories import CourseModeFactory
 from courseware.tests.factories import InstructorFactory
@@ -57,6 +61,7 @@ from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCer
 from lms.djangoapps.certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, initialize_subtask_info, update_subtask_status
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
     upload_enrollment_report,
@@ -67,6 +72,8 @@ from lms.djangoapps.instructor_task.tasks_helper.enrollments import (
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ENROLLED_IN_COURSE,
     NOT_ENROLLED_IN_COURSE,
+    PARALLEL_GRADE_REPORTS,
+    WAFFLE_SWITCHES,
     CourseGradeReport,
     ProblemGradeReport,
     ProblemResponses,
@@ -76,6 +83,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data,
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -88,8 +96,30 @@ from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from openedx.core.djangoapps.credit.tests.factories import CreditCourseFactory
 from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase, TestConditionalContent
-from ..models import ReportStore
-from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
+from ..models import PROGRESS, InstructorTask, ReportStore
+from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED, ReportCSVWriter
+
+
+class TestReportCSVWriter(TestReportMixin, InstructorTaskCourseTestCase):
+    """
+    Tests that ReportCSVWriter writes and uploads reports.
+    """
+    def setUp(self):
+        super(TestReportCSVWriter, self).setUp()
+        self.course = CourseFactory.create()
+
+    def test_upload(self):
+        with ReportCSVWriter([u'Name', u'Score']) as writer:
+            writer.writerows([u'ni\xf1o{}'.format(index), index] for index in range(3))
+            report_name = writer.upload('test_report', self.course.id, datetime.now(UTC))
+        self.assertEqual(writer.num_rows, 3)
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        with report_store.open(self.course.id, report_name) as csv_file:
+            self.assertEqual(
+                csv_file.read(),
+                codecs.BOM_UTF8 + 'Name,Score\r\nni\xc3\xb1o0,0\r\nni\xc3\xb1o1,1\r\nni\xc3\xb1o2,2\r\n',
+            )
 
 
 class InstructorGradeReportTestCase(TestReportMixin, InstructorTaskCourseTestCase):
@@ -442,6 +472,150 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+@ddt.ddt
+class TestParallelGradeReport(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports can be computed in parallel shards.
+    """
+    def setUp(self):
+        super(TestParallelGradeReport, self).setUp()
+        self.course = CourseFactory.create()
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id='parallel-grade-report',
+        )
+
+    @ddt.data(1, 2, 5)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_sharded_report(self, users_per_shard, _mock_current_task):
+        students = [self.create_student(u'student{}'.format(index)) for index in range(5)]
+        with WAFFLE_SWITCHES.override(PARALLEL_GRADE_REPORTS, active=True):
+            with patch.object(CourseGradeReport, 'USERS_PER_SHARD', users_per_shard):
+                CourseGradeReport.generate(None, self.entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0, 'total': 5},
+            json.loads(entry.task_output),
+        )
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual([filename for filename, _ in links if 'grade_report' in filename], [links[0][0]])
+        with report_store.open(self.course.id, links[0][0]) as csv_file:
+            rows = list(unicodecsv.DictReader(csv_file, encoding='utf-8-sig'))
+        self.assertEqual([row['Username'] for row in rows], [student.username for student in students])
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.iter')
+    def test_sharded_grading_failure(self, mock_grades_iter, _mock_current_task):
+        student = self.create_student('username', 'student@example.com')
+        mock_grades_iter.return_value = [(student, None, TypeError('Cannot grade student'))]
+        with WAFFLE_SWITCHES.override(PARALLEL_GRADE_REPORTS, active=True):
+            CourseGradeReport.generate(None, self.entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertDictContainsSubset({'attempted': 1, 'succeeded': 0, 'failed': 1}, json.loads(entry.task_output))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_sharded_report_shard_failure(self, _mock_current_task):
+        self.create_student('username', 'student@example.com')
+        with WAFFLE_SWITCHES.override(PARALLEL_GRADE_REPORTS, active=True):
+            with patch.object(CourseGradeReport, '_rows_for_users', side_effect=Exception('Cannot grade shard')):
+                CourseGradeReport.generate(None, self.entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+
+    def _initialize_shards(self, min_user_id=0, max_user_id=0, num_users=1):
+        """
+        Initializes the subtasks of a parallel grade report of a single
+        shard, due by the default deadline, and returns the shard.
+        """
+        initialize_subtask_info(self.entry, 'graded', num_users, ['shard', 'merge'])
+        subtask_dict = json.loads(self.entry.subtasks)
+        subtask_dict['deadlines'] = {'shard': time.time() + CourseGradeReport.SHARD_QUEUE_TIMEOUT, 'merge': None}
+        self.entry.subtasks = json.dumps(subtask_dict)
+        self.entry.save()
+        return {
+            'index': 0,
+            'min_user_id': min_user_id,
+            'max_user_id': max_user_id,
+            'report': {'merge_subtask_id': 'merge', 'num_shards': 1, 'action_name': 'graded'},
+        }
+
+    def test_merge_claimed_once(self):
+        self._initialize_shards()
+        self.assertFalse(CourseGradeReport._claim_merge(self.entry.id, 'merge'))  # pylint: disable=protected-access
+
+        update_subtask_status(self.entry.id, 'shard', SubtaskStatus.create('shard', state=SUCCESS))
+        self.assertTrue(CourseGradeReport._claim_merge(self.entry.id, 'merge'))  # pylint: disable=protected-access
+        self.assertFalse(CourseGradeReport._claim_merge(self.entry.id, 'merge'))  # pylint: disable=protected-access
+
+    @patch('lms.djangoapps.instructor_task.tasks.merge_grades_csv_shards.apply_async')
+    def test_shard_progress_recorded_per_batch(self, mock_merge):
+        students = [self.create_student(u'student{}'.format(index)) for index in range(3)]
+        shard = self._initialize_shards(students[0].id, students[-1].id, len(students))
+
+        recorded_succeeded = []
+        record_subtask_progress = CourseGradeReport._record_subtask_progress  # pylint: disable=protected-access
+
+        def record(entry_id, subtask_status, deadline=None):
+            """
+            Records the progress of the shard, noting how far it got.
+            """
+            recorded_succeeded.append(subtask_status.succeeded)
+            return record_subtask_progress(entry_id, subtask_status, deadline)
+
+        with patch.object(CourseGradeReport, 'USER_BATCH_SIZE', 1):
+            with patch.object(CourseGradeReport, '_record_subtask_progress', side_effect=record):
+                result = CourseGradeReport.generate_shard(
+                    self.entry.id, None, shard, SubtaskStatus.create('shard').to_dict(),
+                )
+
+        self.assertEqual(recorded_succeeded, [0, 1, 2, 3])
+        self.assertDictContainsSubset({'attempted': 3, 'succeeded': 3, 'state': SUCCESS}, result)
+        self.assertEqual(mock_merge.call_args[1]['args'][2], shard['report'])
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        part_name = CourseGradeReport._shard_part_name(  # pylint: disable=protected-access
+            self.entry.id, 'grade_report', 0,
+        )
+        with report_store.open(self.course.id, part_name) as csv_file:
+            rows = list(unicodecsv.reader(csv_file, encoding='utf-8'))
+        self.assertEqual([row[2] for row in rows], [student.username for student in students])
+
+    @patch('lms.djangoapps.instructor_task.tasks.check_grades_csv_shards.apply_async')
+    @patch('lms.djangoapps.instructor_task.tasks.merge_grades_csv_shards.apply_async')
+    def test_expired_shard(self, mock_merge, mock_check):
+        with freeze_time('2001-01-01 00:00:00'):
+            shard = self._initialize_shards()
+            CourseGradeReport.check_shards(self.entry.id, None, shard['report'])
+        mock_merge.assert_not_called()
+        self.assertEqual(mock_check.call_count, 1)
+
+        with freeze_time('2001-01-02 00:00:01'):
+            CourseGradeReport.check_shards(self.entry.id, None, shard['report'])
+        subtask_status_info = json.loads(InstructorTask.objects.get(pk=self.entry.id).subtasks)['status']
+        self.assertEqual(subtask_status_info['shard']['state'], FAILURE)
+        self.assertEqual(mock_merge.call_count, 1)
+        self.assertEqual(mock_check.call_count, 2)
+        self.assertEqual(mock_check.call_args[1]['args'][2], shard['report'])
+
+        # A shard that resumes after failing by its deadline stops.
+        self.assertFalse(
+            CourseGradeReport._record_subtask_progress(  # pylint: disable=protected-access
+                self.entry.id, SubtaskStatus.create('shard', state=PROGRESS),
+            )
+        )
+
+
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
 
@@ -630,15 +804,12 @@ class TestProblemResponsesReport(TestReportMixin, InstructorTaskModuleTestCase):
         }
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
             with patch('lms.djangoapps.instructor_task.tasks_helper.grades'
-                       '.ProblemResponses._build_student_data') as mock_build_student_data:
-                mock_build_student_data.return_value = (
-                    [
-                        {'username': 'user0', 'state': u'state0'},
-                        {'username': 'user1', 'state': u'state1'},
-                        {'username': 'user2', 'state': u'state2'},
-                    ],
-                    ['username', 'state']
-                )
+                       '.ProblemResponses._iter_student_data') as mock_iter_student_data:
+                mock_iter_student_data.return_value = iter([
+                    {'username': 'user0', 'state': u'state0'},
+                    {'username': 'user1', 'state': u'state1'},
+                    {'username': 'user2', 'state': u'state2'},
+                ])
                 result = ProblemResponses.generate(
                     None, None, self.course.id, task_input, 'calculated'
                 )
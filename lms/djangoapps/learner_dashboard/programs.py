@@ -21,6 +21,7 @@ from openedx.core.djangoapps.programs.utils import (
     ProgramDataExtender,
     ProgramProgressMeter,
     get_certificates,
+    get_engaged_programs_with_progress,
     get_program_marketing_url
 )
 from openedx.core.djangoapps.user_api.preferences.api import get_user_preferences
@@ -44,12 +45,12 @@ class ProgramsFragmentView(EdxFragmentView):
         if not programs_config.enabled or not user.is_authenticated:
             raise Http404
 
-        meter = ProgramProgressMeter(request.site, user, mobile_only=mobile_only)
+        programs, progress = get_engaged_programs_with_progress(request.site, user, mobile_only=mobile_only)
 
         context = {
             'marketing_url': get_program_marketing_url(programs_config),
-            'programs': meter.engaged_programs,
-            'progress': meter.progress()
+            'programs': programs,
+            'progress': progress
         }
         html = render_to_string('learner_dashboard/programs_fragment.html', context)
         programs_fragment = Fragment(html)
@@ -529,6 +529,8 @@ TPA_PROVIDER_SUSTAINED_THROTTLE = '50/hr'
 # Mako templating
 import tempfile
 MAKO_MODULE_DIR = os.path.join(tempfile.gettempdir(), 'mako_lms')
+# The Mako templates compiled at startup, rather than when they are first rendered.
+MAKO_WARM_TEMPLATES = ['main.html', 'dashboard.html', 'courseware/courseware.html']
 MAKO_TEMPLATE_DIRS_BASE = [
     PROJECT_ROOT / 'templates',
     COMMON_ROOT / 'templates',
@@ -885,6 +887,22 @@ MODULESTORE = {
     }
 }
 
+# Local disk cache of course asset contents, from which the contentserver
+# serves assets instead of loading them from the django cache or GridFS.
+COURSE_ASSETS_DISK_CACHE = {
+    # Directory to keep the cached assets in.  None disables the cache.
+    'DIRECTORY': None,
+    # Maximum total size, in bytes, of the cached assets.
+    'MAX_SIZE': 1024 * 1024 * 1024,
+    # Maximum size, in bytes, of an asset to cache.
+    'MAX_FILE_SIZE': 32 * 1024 * 1024,
+}
+
+# Maximum total size, in bytes, of the pickled split course structures
+# kept in each process's local LRU cache, in front of 'course_structure_cache'.
+# Set to 0 to disable the process-local cache.
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -898,6 +916,20 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Maximum total size, in bytes, of the sandboxed execution results kept
+    # in each process, in front of the django cache.  0 disables it.
+    'result_cache_size': 32 * 1024 * 1024,
+
+    # Number of warm sandbox workers to run code in, each replaced after
+    # 'pool_max_jobs_per_worker' jobs.  0 starts a new sandbox for every job.
+    'pool_size': 0,
+    'pool_max_jobs_per_worker': 100,
+    # Unprivileged user to run the warm workers as, which must be neither root
+    # nor 'user', and the copy of the sandboxed Python it runs, which alone is
+    # given the capabilities to switch to 'user'.  See capa.safe_exec.pool.
+    'pool_user': None,
+    'pool_python_bin': None,
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -1291,6 +1323,9 @@ MIDDLEWARE_CLASSES = [
     'courseware.middleware.CacheCourseIdMiddleware',
     'courseware.middleware.RedirectMiddleware',
 
+    # Caches access decisions for the duration of each request
+    'courseware.middleware.AccessDecisionCacheMiddleware',
+
     'course_wiki.middleware.WikiAccessMiddleware',
 
     'openedx.core.djangoapps.theming.middleware.CurrentSiteThemeMiddleware',
@@ -1911,6 +1946,10 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Backend storage options
     PRUNING_ACTIVE=False,
+
+    # Maximum number of deserialized collected block structures to share
+    # across requests within each process.
+    SHARED_CACHE_SIZE=20,
 )
 
 ################################ Bulk Email ###################################
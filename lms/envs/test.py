@@ -64,6 +64,9 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Send requests to the comments service one at a time, in order, so that tests can mock them.
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = 1
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
@@ -218,6 +221,12 @@ CACHES = {
     },
 }
 
+# Don't keep course structures in a process-local cache across tests
+COURSE_STRUCTURE_LOCAL_CACHE_MAX_SIZE = 0
+
+# Nor sandboxed execution results
+CODE_JAIL['result_cache_size'] = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
@@ -6,3 +6,16 @@ else:
     SERVICE_HOST = 'http://localhost:4567'
 
 PREFIX = SERVICE_HOST + '/api/v1'
+
+# How many connections to the comments service each process keeps open, and
+# how many times failed connections and idempotent requests are retried.
+POOL_SIZE = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+MAX_RETRIES = getattr(settings, 'COMMENTS_SERVICE_MAX_RETRIES', 2)
+
+
+def max_concurrent_requests():
+    """
+    Returns how many independent requests may be sent to the comments
+    service concurrently when handling a single request.
+    """
+    return getattr(settings, 'COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS', 4)
@@ -1,16 +1,28 @@
 """" Common utilities for comment client wrapper """
 import logging
+import os
+import sys
+import threading
+from collections import defaultdict
 from contextlib import contextmanager
 from time import time
 from uuid import uuid4
 
 import requests
+import six
+from concurrent.futures import ThreadPoolExecutor
 from django.utils.translation import get_language
+from edx_django_utils import monitoring as monitoring_utils
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .settings import SERVICE_HOST as COMMENTS_SERVICE
+from .settings import MAX_RETRIES, POOL_SIZE, SERVICE_HOST as COMMENTS_SERVICE, max_concurrent_requests
 
 log = logging.getLogger(__name__)
 
+# State of the requests made on behalf of another thread; see perform_requests_concurrently.
+_delegated = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -31,9 +43,7 @@ def extract(dic, keys):
 
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
-    # To avoid dependency conflict
-    from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = _get_forums_config()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -49,7 +59,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data_or_params = {}
     headers = {
         'X-Edx-Api-Key': config.api_key,
-        'Accept-Language': get_language(),
+        'Accept-Language': getattr(_delegated, 'language', None) or get_language(),
     }
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
@@ -61,14 +71,18 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
-        method,
-        url,
-        data=data,
-        params=params,
-        headers=headers,
-        timeout=config.connection_timeout
-    )
+    start_time = time()
+    try:
+        response = request(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            timeout=config.connection_timeout
+        )
+    finally:
+        _record_request_metrics(metric_action, time() - start_time)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
@@ -99,6 +113,161 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def request(method, url, **kwargs):
+    """
+    Sends a request to the comments service through this process's pool of
+    connections.  Takes the same arguments as `requests.request`.
+    """
+    return get_session().request(method, url, **kwargs)
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns this process's `requests.Session` for the comments service, which
+    keeps up to POOL_SIZE connections alive, and retries failed connections
+    and idempotent requests up to MAX_RETRIES times.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+    with _session_lock:
+        # Connections can't be shared with the process we were forked from.
+        if _session is None or _session_pid != os.getpid():
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=POOL_SIZE,
+                max_retries=Retry(total=MAX_RETRIES, status_forcelist=(), backoff_factor=0.1, raise_on_status=False),
+            )
+            _session = requests.Session()
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+            _session_pid = os.getpid()
+        return _session
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Returns this process's pool of threads for concurrent requests.
+    """
+    global _executor, _executor_pid  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max_concurrent_requests())
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def perform_requests_concurrently(*calls):
+    """
+    Calls each of the given functions, which make independent requests to the
+    comments service, concurrently, and returns the list of their results.
+
+    All but the last function are called in other threads, which send their
+    requests with the forums configuration and language of the calling
+    thread; the last one is called in the calling thread, and so may also
+    emit events.  If any of the calls fail, the exception of the first one
+    to fail (in the order of `calls`) is raised once all of them are done.
+
+    When concurrent requests are disabled (or when already called on behalf
+    of another thread), the functions are simply called in order.
+    """
+    if len(calls) < 2 or max_concurrent_requests() < 2 or getattr(_delegated, 'config', None) is not None:
+        return [call() for call in calls]
+
+    context = (_get_forums_config(), get_language())
+    futures = [_get_executor().submit(_call_delegated, call, context) for call in calls[:-1]]
+    try:
+        last_result = (calls[-1](), None)
+    except Exception:  # pylint: disable=broad-except
+        last_result = (None, sys.exc_info())
+
+    results = []
+    exc_info = None
+    for future in futures:
+        result, call_exc_info, request_metrics = future.result()
+        for metric_action, duration in request_metrics:
+            _record_request_metrics(metric_action, duration)
+        results.append(result)
+        exc_info = exc_info or call_exc_info
+    results.append(last_result[0])
+    exc_info = exc_info or last_result[1]
+
+    if exc_info:
+        six.reraise(*exc_info)
+    return results
+
+
+def _call_delegated(call, context):
+    """
+    Calls `call` with the forums configuration and language of the thread
+    given by `context`, and returns its result, the exception info it raised
+    (if any), and the metrics of the requests it made.
+    """
+    _delegated.config, _delegated.language = context
+    _delegated.request_metrics = []
+    try:
+        return call(), None, _delegated.request_metrics
+    except Exception:  # pylint: disable=broad-except
+        return None, sys.exc_info(), _delegated.request_metrics
+    finally:
+        _delegated.config = _delegated.language = _delegated.request_metrics = None
+
+
+def _get_forums_config():
+    """
+    Returns the current forums configuration.
+    """
+    config = getattr(_delegated, 'config', None)
+    if config is None:
+        # To avoid dependency conflict
+        from django_comment_common.models import ForumsConfig
+        config = ForumsConfig.current()
+    return config
+
+
+_request_stats = defaultdict(lambda: {'count': 0, 'total_time': 0.0, 'max_time': 0.0})
+_request_stats_lock = threading.Lock()
+
+
+def _record_request_metrics(metric_action, duration):
+    """
+    Records the duration of a request to the comments service, in the
+    monitoring metrics of the current request and in this process's stats.
+    """
+    metric_action = metric_action or 'unknown'
+    request_metrics = getattr(_delegated, 'request_metrics', None)
+    if request_metrics is not None:
+        # Made on behalf of another thread, which will record the metrics.
+        request_metrics.append((metric_action, duration))
+        return
+
+    monitoring_utils.accumulate(u'comment_service.{}.count'.format(metric_action), 1)
+    monitoring_utils.accumulate(u'comment_service.{}.duration_ms'.format(metric_action), int(duration * 1000))
+    with _request_stats_lock:
+        stats = _request_stats[metric_action]
+        stats['count'] += 1
+        stats['total_time'] += duration
+        stats['max_time'] = max(stats['max_time'], duration)
+
+
+def get_request_stats():
+    """
+    Returns the number, and the total and maximum duration in seconds, of the
+    requests made to each endpoint (named by metric action) of the comments
+    service by this process.
+    """
+    with _request_stats_lock:
+        return {metric_action: dict(stats) for metric_action, stats in _request_stats.items()}
+
+
 class CommentClientError(Exception):
     pass
 
@@ -13,6 +13,7 @@ class CommonInitializationConfig(AppConfig):
         # Common settings validations for the LMS and CMS.
         from . import checks
         self._add_mimetypes()
+        self._configure_safe_exec()
 
     @staticmethod
     def _add_mimetypes():
@@ -25,3 +26,12 @@ class CommonInitializationConfig(AppConfig):
         mimetypes.add_type('application/x-font-opentype', '.otf')
         mimetypes.add_type('application/x-font-ttf', '.ttf')
         mimetypes.add_type('application/font-woff', '.woff')
+
+    @staticmethod
+    def _configure_safe_exec():
+        """
+        Configure Capa's sandboxed execution, in web and Celery processes alike.
+        """
+        from xmodule.util.sandboxing import configure_safe_exec
+
+        configure_safe_exec()
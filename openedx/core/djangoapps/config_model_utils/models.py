@@ -17,6 +17,7 @@ from django.contrib.sites.models import Site
 from django.contrib.sites.requests import RequestSite
 from django.core.exceptions import ValidationError
 from django.utils.translation import ugettext_lazy as _
+from edx_django_utils.cache import RequestCache
 import crum
 
 from config_models.models import ConfigurationModel, cache
@@ -44,6 +45,11 @@ class StackedConfigurationModel(ConfigurationModel):
     class Meta(object):
         abstract = True
 
+    # The current configurations of courses loaded in bulk by
+    # prefetch_course_configs are cached for the rest of the request in the
+    # PREFETCHED_CACHE_NAMESPACE request cache, by cache_key_name.
+    PREFETCHED_CACHE_NAMESPACE = u'StackedConfigurationModel.prefetched'
+
     KEY_FIELDS = ('site', 'org', 'course')
     STACKABLE_FIELDS = ('enabled',)
 
@@ -101,6 +107,10 @@ class StackedConfigurationModel(ConfigurationModel):
             no arguments are supplied).
         """
         cache_key_name = cls.cache_key_name(site, org, course_key=course_key)
+        prefetched = RequestCache(cls.PREFETCHED_CACHE_NAMESPACE).data.get(cache_key_name)
+        if prefetched is not None:
+            return prefetched
+
         cached = cache.get(cache_key_name)
 
         if cached is not None:
@@ -116,14 +126,6 @@ class StackedConfigurationModel(ConfigurationModel):
         if site is None and org is not None:
             site = cls._site_from_org(org)
 
-        stackable_fields = [cls._meta.get_field(field_name) for field_name in cls.STACKABLE_FIELDS]
-        field_defaults = {
-            field.name: field.get_default()
-            for field in stackable_fields
-        }
-
-        values = field_defaults.copy()
-
         global_override_q = Q(site=None, org=None, course_id=None)
         site_override_q = Q(site=site, org=None, course_id=None)
         org_override_q = Q(site=None, org=org, course_id=None)
@@ -149,6 +151,73 @@ class StackedConfigurationModel(ConfigurationModel):
             F('site').desc(nulls_first=True),
         )
 
+        current = cls._stack_overrides(overrides)
+        cache.set(cache_key_name, current, cls.cache_timeout)
+        return current
+
+    @classmethod
+    def prefetch_course_configs(cls, course_keys):
+        """
+        Loads the current configurations of all the given courses with one
+        query, and caches them for the rest of the request, so that `current`
+        doesn't load them again one course at a time.
+        """
+        prefetched = RequestCache(cls.PREFETCHED_CACHE_NAMESPACE).data
+        course_keys = [
+            course_key for course_key in set(course_keys)
+            if cls.cache_key_name(None, None, course_key=course_key) not in prefetched
+        ]
+        if not course_keys:
+            return
+
+        # Orgs without a configured site, when there's no default Site either,
+        # fall back to a RequestSite, which isn't stored and so has no overrides.
+        site_ids_by_org = {}
+        for org in {cls._org_from_course_key(course_key) for course_key in course_keys}:
+            site = cls._site_from_org(org)
+            site_ids_by_org[org] = site.id if isinstance(site, Site) else None
+        site_ids = {site_id for site_id in site_ids_by_org.values() if site_id is not None}
+        overrides = {
+            (override.site_id, override.org, override.course_id): override
+            for override in cls.objects.current_set().filter(
+                Q(site=None, org=None, course_id=None) |
+                Q(site_id__in=site_ids, org=None, course_id=None) |
+                Q(site=None, org__in=list(site_ids_by_org), course_id=None) |
+                Q(site=None, org=None, course_id__in=course_keys)
+            )
+        }
+
+        for course_key in course_keys:
+            org = cls._org_from_course_key(course_key)
+            site_id = site_ids_by_org[org]
+            # In the order of general to specific, like in `current`.
+            course_overrides = [
+                overrides.get(override_key)
+                for override_key in [
+                    (None, None, None),
+                    (site_id, None, None) if site_id is not None else None,
+                    (None, org, None),
+                    (None, None, course_key),
+                ]
+                if override_key is not None
+            ]
+            prefetched[cls.cache_key_name(None, None, course_key=course_key)] = cls._stack_overrides(
+                override for override in course_overrides if override is not None
+            )
+
+    @classmethod
+    def _stack_overrides(cls, overrides):
+        """
+        Returns the configuration made of the given overrides, stacked in the
+        order of general to specific.
+        """
+        stackable_fields = [cls._meta.get_field(field_name) for field_name in cls.STACKABLE_FIELDS]
+        field_defaults = {
+            field.name: field.get_default()
+            for field in stackable_fields
+        }
+
+        values = field_defaults.copy()
         provenances = defaultdict(lambda: Provenance.default)
         for override in overrides:
             for field in stackable_fields:
@@ -166,9 +235,13 @@ class StackedConfigurationModel(ConfigurationModel):
 
         current = cls(**values)
         current.provenances = {field.name: provenances[field.name] for field in stackable_fields}  # pylint: disable=attribute-defined-outside-init
-        cache.set(cache_key_name, current, cls.cache_timeout)
         return current
 
+    def save(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        super(StackedConfigurationModel, self).save(*args, **kwargs)
+        # Any of the prefetched configurations may stack this one.
+        RequestCache(self.PREFETCHED_CACHE_NAMESPACE).clear()
+
     @classmethod
     def all_current_course_configs(cls):
         """
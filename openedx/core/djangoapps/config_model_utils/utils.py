@@ -1,14 +1,21 @@
 """utils for feature-based enrollments"""
+from six import text_type
+
 from experiments.models import ExperimentData
+from openedx.core.lib.cache_utils import request_cached
 from openedx.features.course_duration_limits.config import (
     EXPERIMENT_ID,
     EXPERIMENT_DATA_HOLDBACK_KEY
 )
 
 
+@request_cached(arg_map_function=lambda user: text_type(getattr(user, 'id', None)))
 def is_in_holdback(user):
     """
     Return true if given user is in holdback expermiment
+
+    The result is cached for the rest of the request, since it's checked for
+    each of the courses whose features are gated.
     """
     in_holdback = False
     if user and user.is_authenticated:
@@ -6,9 +6,11 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
+    _BlockGraph - Data structure for the relations of all blocks.
     _BlockData - Data structure for a single block's data.
 """
-from copy import deepcopy
+from array import array
+from copy import copy, deepcopy
 from functools import partial
 from logging import getLogger
 
@@ -28,6 +30,10 @@ class _BlockRelations(object):
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
+
+    Note: Block structures now keep their relations in a _BlockGraph.
+    This class remains so that data serialized in the original format
+    can still be read.
     """
     def __init__(self):
 
@@ -40,6 +46,280 @@ class _BlockRelations(object):
         self.children = []
 
 
+class _BlockGraph(object):
+    """
+    Data structure to encapsulate the relationships of all blocks in a
+    block structure.
+
+    Each block is mapped to a dense integer index, and its children and
+    parents are kept as compressed sparse row (CSR) arrays of indices,
+    so traversals hash and compare small ints instead of usage keys.
+
+    Removed blocks are only marked as such and are skipped when reading
+    relations. Blocks whose relations are changed after the arrays were
+    built keep their updated relations in per-block lists, until the
+    graph is compacted into new arrays.
+    """
+    def __init__(self):
+        # Usage key of each block, by block index.
+        # list [UsageKey]
+        self.keys = []
+
+        # Map of a block's usage key to its block index.
+        # dict {UsageKey: int}
+        self._index_of = {}
+
+        # Whether the block at each index was removed.
+        self._removed = bytearray()
+
+        # CSR arrays of the children and parents of each block. The
+        # relations of block i are targets[offsets[i]:offsets[i + 1]].
+        self._child_offsets = array('l', [0])
+        self._child_targets = array('l')
+        self._parent_offsets = array('l', [0])
+        self._parent_targets = array('l')
+
+        # Updated children and parents of blocks whose relations changed
+        # since the CSR arrays were built.
+        # dict {int: list [int]}
+        self._updated_children = {}
+        self._updated_parents = {}
+
+        # Number of blocks that weren't removed.
+        self._num_blocks = 0
+
+    @classmethod
+    def from_adjacency(cls, usage_keys, children, parents):
+        """
+        Returns a new graph of the given usage keys, where children[i]
+        and parents[i] are lists of the indices of the children and
+        parents of usage_keys[i].
+        """
+        graph = cls()
+        graph.keys = list(usage_keys)
+        graph._index_of = {usage_key: index for index, usage_key in enumerate(graph.keys)}
+        graph._removed = bytearray(len(graph.keys))
+        graph._child_offsets, graph._child_targets = _build_csr(children)
+        graph._parent_offsets, graph._parent_targets = _build_csr(parents)
+        graph._num_blocks = len(graph.keys)
+        return graph
+
+    @classmethod
+    def from_block_relations(cls, block_relations):
+        """
+        Returns a new graph with the relations of the given
+        dict {UsageKey: _BlockRelations}.
+        """
+        usage_keys = list(block_relations)
+        index_of = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+        return cls.from_adjacency(
+            usage_keys,
+            [[index_of[child] for child in block_relations[key].children] for key in usage_keys],
+            [[index_of[parent] for parent in block_relations[key].parents] for key in usage_keys],
+        )
+
+    def to_adjacency(self):
+        """
+        Returns a (usage_keys, children, parents) tuple, as accepted by
+        from_adjacency, of the blocks that weren't removed.
+        """
+        graph = self.compacted()
+        return (
+            graph.keys,
+            [graph.child_indices(index) for index in xrange(len(graph.keys))],
+            [graph.parent_indices(index) for index in xrange(len(graph.keys))],
+        )
+
+    def compacted(self):
+        """
+        Returns a new graph with the blocks that weren't removed, with
+        all their relations in CSR arrays.
+        """
+        if self._num_blocks == len(self.keys) and not self._updated_children and not self._updated_parents:
+            return self.copy()
+
+        live_indices = [index for index in xrange(len(self.keys)) if not self._removed[index]]
+        new_index_of = {old_index: new_index for new_index, old_index in enumerate(live_indices)}
+        return _BlockGraph.from_adjacency(
+            [self.keys[index] for index in live_indices],
+            [[new_index_of[child] for child in self.child_indices(index)] for index in live_indices],
+            [[new_index_of[parent] for parent in self.parent_indices(index)] for index in live_indices],
+        )
+
+    def copy(self):
+        """
+        Returns a copy of this graph. Usage keys are immutable and so
+        are shared with the copy.
+        """
+        graph = _BlockGraph()
+        graph.keys = list(self.keys)
+        graph._index_of = dict(self._index_of)
+        graph._removed = bytearray(self._removed)
+        graph._child_offsets = array('l', self._child_offsets)
+        graph._child_targets = array('l', self._child_targets)
+        graph._parent_offsets = array('l', self._parent_offsets)
+        graph._parent_targets = array('l', self._parent_targets)
+        graph._updated_children = {index: list(children) for index, children in self._updated_children.iteritems()}
+        graph._updated_parents = {index: list(parents) for index, parents in self._updated_parents.iteritems()}
+        graph._num_blocks = self._num_blocks
+        return graph
+
+    def __deepcopy__(self, memo):  # pylint: disable=unused-argument
+        return self.copy()
+
+    def __len__(self):
+        return self._num_blocks
+
+    def __contains__(self, usage_key):
+        return self.index(usage_key) is not None
+
+    def __iter__(self):
+        return self.iterkeys()
+
+    def iterkeys(self):
+        """
+        Returns an iterator of the usage keys of the blocks that weren't
+        removed.
+        """
+        removed = self._removed
+        return (usage_key for index, usage_key in enumerate(self.keys) if not removed[index])
+
+    def index(self, usage_key):
+        """
+        Returns the index of the block with the given usage key, or
+        None if the block isn't in the graph.
+        """
+        index = self._index_of.get(usage_key)
+        if index is None or self._removed[index]:
+            return None
+        return index
+
+    def child_indices(self, index):
+        """
+        Returns the indices of the children of the block at the given
+        index.
+        """
+        children = self._updated_children.get(index)
+        if children is None:
+            if index + 1 >= len(self._child_offsets):
+                return []
+            children = self._child_targets[self._child_offsets[index]:self._child_offsets[index + 1]]
+        removed = self._removed
+        return [child for child in children if not removed[child]]
+
+    def parent_indices(self, index):
+        """
+        Returns the indices of the parents of the block at the given
+        index.
+        """
+        parents = self._updated_parents.get(index)
+        if parents is None:
+            if index + 1 >= len(self._parent_offsets):
+                return []
+            parents = self._parent_targets[self._parent_offsets[index]:self._parent_offsets[index + 1]]
+        removed = self._removed
+        return [parent for parent in parents if not removed[parent]]
+
+    def get_children(self, usage_key):
+        """
+        Returns the usage keys of the children of the given block.
+        """
+        index = self.index(usage_key)
+        if index is None:
+            return []
+        keys = self.keys
+        return [keys[child] for child in self.child_indices(index)]
+
+    def get_parents(self, usage_key):
+        """
+        Returns the usage keys of the parents of the given block.
+        """
+        index = self.index(usage_key)
+        if index is None:
+            return []
+        keys = self.keys
+        return [keys[parent] for parent in self.parent_indices(index)]
+
+    def add_block(self, usage_key):
+        """
+        Adds the given block to the graph, if not already present, and
+        returns its index.
+        """
+        index = self.index(usage_key)
+        if index is None:
+            index = len(self.keys)
+            self.keys.append(usage_key)
+            self._index_of[usage_key] = index
+            self._removed.append(0)
+            self._updated_children[index] = []
+            self._updated_parents[index] = []
+            self._num_blocks += 1
+        return index
+
+    def add_relation(self, parent_key, child_key):
+        """
+        Adds a parent to child relationship between the given blocks,
+        adding the blocks if needed.
+        """
+        parent_index = self.add_block(parent_key)
+        child_index = self.add_block(child_key)
+        self._children_for_update(parent_index).append(child_index)
+        self._parents_for_update(child_index).append(parent_index)
+
+    def clear_parents(self, usage_key):
+        """
+        Removes all relationships of the given block to its parents,
+        without updating the children of the parents.
+        """
+        index = self.index(usage_key)
+        if index is not None:
+            self._updated_parents[index] = []
+
+    def remove_block(self, usage_key):
+        """
+        Removes the given block and its relations from the graph.
+        """
+        index = self.index(usage_key)
+        if index is not None:
+            self._removed[index] = 1
+            self._updated_children.pop(index, None)
+            self._updated_parents.pop(index, None)
+            self._num_blocks -= 1
+
+    def _children_for_update(self, index):
+        """
+        Returns the list of children of the block at the given index
+        that is to be updated.
+        """
+        children = self._updated_children.get(index)
+        if children is None:
+            children = self._updated_children[index] = self.child_indices(index)
+        return children
+
+    def _parents_for_update(self, index):
+        """
+        Returns the list of parents of the block at the given index
+        that is to be updated.
+        """
+        parents = self._updated_parents.get(index)
+        if parents is None:
+            parents = self._updated_parents[index] = self.parent_indices(index)
+        return parents
+
+
+def _build_csr(adjacency):
+    """
+    Returns the (offsets, targets) CSR arrays for the given list of
+    lists of indices.
+    """
+    offsets = array('l', [0])
+    targets = array('l')
+    for indices in adjacency:
+        targets.extend(indices)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
 class BlockStructure(object):
     """
     Base class for a block structure.  BlockStructures are constructed
@@ -56,14 +336,13 @@ class BlockStructure(object):
         # UsageKey
         self.root_block_usage_key = root_block_usage_key
 
-        # Map of a block's usage key to its block relations. The
-        # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
-        self._block_relations = {}
+        # Graph of the blocks' relations. The existence of a block in
+        # the structure is determined by its presence in this graph.
+        # _BlockGraph
+        self._block_relations = _BlockGraph()
 
         # Add the root block.
-        self._add_block(self._block_relations, root_block_usage_key)
+        self._block_relations.add_block(root_block_usage_key)
 
     def __iter__(self):
         """
@@ -91,7 +370,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        return self._block_relations.get_parents(usage_key)
 
     def get_children(self, usage_key):
         """
@@ -105,7 +384,7 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        return self._block_relations.get_children(usage_key)
 
     def set_root_block(self, usage_key):
         """
@@ -120,7 +399,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._block_relations.clear_parents(usage_key)
 
     def __contains__(self, usage_key):
         """
@@ -167,12 +446,21 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_topologically method.
         """
-        return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
-            get_parents=self.get_parents,
-            get_children=self.get_children,
-            filter_func=filter_func,
-            yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+        graph = self._block_relations
+        start_index = graph.index(start_node or self.root_block_usage_key)
+        if start_index is None:
+            return iter([])
+
+        keys = graph.keys
+        return (
+            keys[index]
+            for index in traverse_topologically(
+                start_node=start_index,
+                get_parents=graph.parent_indices,
+                get_children=graph.child_indices,
+                filter_func=(lambda index: filter_func(keys[index])) if filter_func else None,
+                yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+            )
         )
 
     def post_order_traversal(
@@ -192,10 +480,19 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_post_order method.
         """
-        return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
-            get_children=self.get_children,
-            filter_func=filter_func,
+        graph = self._block_relations
+        start_index = graph.index(start_node or self.root_block_usage_key)
+        if start_index is None:
+            return iter([])
+
+        keys = graph.keys
+        return (
+            keys[index]
+            for index in traverse_post_order(
+                start_node=start_index,
+                get_children=graph.child_indices,
+                filter_func=(lambda index: filter_func(keys[index])) if filter_func else None,
+            )
         )
 
     #--- Internal methods ---#
@@ -205,29 +502,32 @@ class BlockStructure(object):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
+        graph = self._block_relations
+        start_index = graph.index(self.root_block_usage_key)
+        reachable = (
+            list(traverse_post_order(start_node=start_index, get_children=graph.child_indices))
+            if start_index is not None else []
+        )
 
-        # Create a new block relations map to store only those blocks
-        # that are still linked
-        pruned_block_relations = {}
-        old_block_relations = self._block_relations
-
-        # Build the structure from the leaves up by doing a post-order
-        # traversal of the old structure, thereby encountering only
-        # reachable blocks.
-        for block_key in self.post_order_traversal():
-            # If the block is in the old structure,
-            if block_key in old_block_relations:
-                # Add it to the new pruned structure
-                self._add_block(pruned_block_relations, block_key)
-
-                # Add a relationship to only those old children that
-                # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
-                    if child in pruned_block_relations:
-                        self._add_to_relations(pruned_block_relations, block_key, child)
+        # Build the structure from the leaves up, in post-order, thereby
+        # encountering only reachable blocks, and always encountering
+        # children before their parents.
+        new_index_of = {old_index: new_index for new_index, old_index in enumerate(reachable)}
+        children = [
+            [new_index_of[child] for child in graph.child_indices(old_index)]
+            for old_index in reachable
+        ]
+        parents = [[] for _ in reachable]
+        for parent, child_indices in enumerate(children):
+            for child in child_indices:
+                parents[child].append(parent)
 
         # Replace this structure's relations with the newly pruned one.
-        self._block_relations = pruned_block_relations
+        self._block_relations = _BlockGraph.from_adjacency(
+            [graph.keys[old_index] for old_index in reachable],
+            children,
+            parents,
+        )
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -237,44 +537,7 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
-
-    @staticmethod
-    def _add_to_relations(block_relations, parent_key, child_key):
-        """
-        Adds a parent to child relationship in the given block
-        relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            parent_key (UsageKey) - Usage key of the parent block.
-
-            child_key (UsageKey) - Usage key of the child block.
-        """
-        BlockStructure._add_block(block_relations, parent_key)
-        BlockStructure._add_block(block_relations, child_key)
-
-        block_relations[child_key].parents.append(parent_key)
-        block_relations[parent_key].children.append(child_key)
-
-    @staticmethod
-    def _add_block(block_relations, usage_key):
-        """
-        Adds the given usage_key to the given block_relations map.
-
-        Arguments:
-            block_relations (dict({UsageKey: _BlockRelations})) -
-                Internal map of a block's usage key to its
-                parents/children relations.
-
-            usage_key (UsageKey) - Usage key of the block that is to
-                be added to the given block_relations.
-        """
-        if usage_key not in block_relations:
-            block_relations[usage_key] = _BlockRelations()
+        self._block_relations.add_relation(parent_key, child_key)
 
 
 class FieldData(object):
@@ -347,6 +610,13 @@ class TransformerDataMap(dict):
         key = self._translate_key(key)
         dict.__delitem__(self, key)
 
+    def load_all(self):
+        """
+        Loads the entries of all transformers.  The entries of this map
+        are always loaded; see LazyTransformerDataMap.
+        """
+        pass
+
     def get_or_create(self, key):
         """
         Returns the TransformerData associated with the given
@@ -375,6 +645,177 @@ class TransformerDataMap(dict):
             return key
 
 
+class TransformerBlockDataColumns(object):
+    """
+    Encoded columns of block-specific transformer data, shared by all
+    blocks of a deserialized block structure.  Each transformer's column
+    is decoded only when data for that transformer is first accessed.
+    """
+    def __init__(self, encoded_columns, decode_column):
+        """
+        Arguments:
+            encoded_columns (dict {string: any type}) - Map of a
+                transformer's name to its encoded column.
+
+            decode_column ((encoded_column)->dict {int: TransformerData}) -
+                Function that decodes an encoded column into a map of
+                block index to the block's TransformerData.
+        """
+        self._encoded_columns = encoded_columns
+        self._decode_column = decode_column
+        self._decoded_columns = {}
+
+    def transformer_names(self):
+        """
+        Returns the names of the transformers that have a column.
+        """
+        return self._encoded_columns.keys()
+
+    def pop(self, transformer_name, block_index):
+        """
+        Returns the TransformerData of the given transformer for the
+        block at the given index, or None if there is none.  Each
+        TransformerData is handed out only once, after which it is
+        owned by the block's LazyTransformerDataMap.
+        """
+        if transformer_name not in self._encoded_columns:
+            return None
+        column = self._decoded_columns.get(transformer_name)
+        if column is None:
+            column = self._decode_column(self._encoded_columns[transformer_name])
+            self._decoded_columns[transformer_name] = column
+        return column.pop(block_index, None)
+
+    def __copy__(self):
+        """
+        Returns a copy of these columns which hands out its own copies of
+        the TransformerData not handed out yet.  The encoded columns are
+        never changed, and so are shared with the copy.
+        """
+        columns = TransformerBlockDataColumns(self._encoded_columns, self._decode_column)
+        columns._decoded_columns = {  # pylint: disable=protected-access
+            transformer_name: dict(column) for transformer_name, column in self._decoded_columns.iteritems()
+        }
+        return columns
+
+    def __deepcopy__(self, memo):
+        """
+        Returns a deep copy of these columns, without decoding any of the
+        encoded columns.
+        """
+        columns = TransformerBlockDataColumns(self._encoded_columns, self._decode_column)
+        memo[id(self)] = columns
+        columns._decoded_columns = deepcopy(self._decoded_columns, memo)  # pylint: disable=protected-access
+        return columns
+
+
+class LazyTransformerDataMap(TransformerDataMap):
+    """
+    A TransformerDataMap for a single block whose entries are loaded
+    from shared TransformerBlockDataColumns on first access.
+    """
+    def __init__(self, columns, block_index):
+        super(LazyTransformerDataMap, self).__init__()
+        self._columns = columns
+        self._block_index = block_index
+
+    def __getitem__(self, key):
+        self._load(key)
+        return super(LazyTransformerDataMap, self).__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._load(key)
+        super(LazyTransformerDataMap, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._load(key)
+        super(LazyTransformerDataMap, self).__delitem__(key)
+
+    def __contains__(self, key):
+        self._load(key)
+        return dict.__contains__(self, self._translate_key(key))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        self.load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.load_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+    def iterkeys(self):
+        self.load_all()
+        return dict.iterkeys(self)
+
+    def itervalues(self):
+        self.load_all()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self.load_all()
+        return dict.iteritems(self)
+
+    # dict subclasses are copied and pickled through iteritems, which would
+    # load all the entries, so the entries that aren't loaded yet are copied
+    # and pickled with the columns instead.
+
+    def __copy__(self):
+        copied = LazyTransformerDataMap(copy(self._columns), self._block_index)
+        for key, value in dict.iteritems(self):
+            dict.__setitem__(copied, key, value)
+        return copied
+
+    def __deepcopy__(self, memo):
+        copied = LazyTransformerDataMap(None, self._block_index)
+        memo[id(self)] = copied
+        copied._columns = deepcopy(self._columns, memo)
+        for key, value in dict.iteritems(self):
+            dict.__setitem__(copied, key, deepcopy(value, memo))
+        return copied
+
+    def __reduce__(self):
+        return (LazyTransformerDataMap, (self._columns, self._block_index), None, None, dict.iteritems(self))
+
+    def load_all(self):
+        """
+        Loads the entries of all transformers from the shared columns.
+        """
+        columns = self.__dict__.get('_columns')
+        for transformer_name in columns.transformer_names() if columns is not None else []:
+            self._load(transformer_name)
+
+    def _load(self, key):
+        """
+        Loads the entry for the given transformer from the shared
+        columns, if it wasn't loaded yet.
+        """
+        # The columns are not yet set while this map is being unpickled.
+        columns = self.__dict__.get('_columns')
+        key = self._translate_key(key)
+        if columns is not None and not dict.__contains__(self, key):
+            transformer_data = columns.pop(key, self._block_index)
+            if transformer_data is not None:
+                dict.__setitem__(self, key, transformer_data)
+
+
 class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
@@ -401,7 +842,7 @@ class BlockStructureBlockData(BlockStructure):
     # update this value whenever the data structure changes. Dependent storage
     # layers can then use this value when serializing/deserializing block
     # structures, and invalidating any previously cached/stored data.
-    VERSION = 2
+    VERSION = 3
 
     def __init__(self, root_block_usage_key):
         super(BlockStructureBlockData, self).__init__(root_block_usage_key)
@@ -414,6 +855,20 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Set of usage keys of blocks whose BlockData is shared with
+        # other copy-on-write copies of this block structure, and so
+        # needs to be copied before it's updated.
+        # set(UsageKey)
+        self._shared_block_keys = set()
+
+        # Whether transformer_data is shared with other copy-on-write
+        # copies of this block structure.
+        self._shared_transformer_data = False
+
+        # Whether this block structure is shared across threads, and so
+        # must not be updated, not even by copy_on_write.
+        self._frozen = False
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
@@ -422,11 +877,45 @@ class BlockStructureBlockData(BlockStructure):
         from .factory import BlockStructureFactory
         return BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
+            self._block_relations.copy(),
             deepcopy(self.transformer_data),
             deepcopy(self._block_data_map),
         )
 
+    def copy_on_write(self):
+        """
+        Returns a new instance of BlockStructureBlockData that shares
+        this instance's block data until either instance updates it.
+
+        Only the block relations and the map of block data are copied
+        up front; a block's data (and the non-block-specific transformer
+        data) is copied by whichever instance first updates it through
+        this class' methods.  Field values themselves are not copied, so
+        they must be replaced rather than mutated in place.
+        """
+        from .factory import BlockStructureFactory
+        new_copy = BlockStructureFactory.create_new(
+            self.root_block_usage_key,
+            self._block_relations.copy(),
+            self.transformer_data,
+            dict(self._block_data_map),
+        )
+        if not self._frozen:
+            self._shared_block_keys = set(self._block_data_map)
+            self._shared_transformer_data = True
+        new_copy._shared_block_keys = set(self._block_data_map)  # pylint: disable=protected-access
+        new_copy._shared_transformer_data = True  # pylint: disable=protected-access
+        return new_copy
+
+    def freeze(self):
+        """
+        Marks this instance as shared across threads, after which it
+        must not be updated; use copy_on_write to get an updatable copy.
+        """
+        self._shared_block_keys = set(self._block_data_map)
+        self._shared_transformer_data = True
+        self._frozen = True
+
     def iteritems(self):
         """
         Returns iterator of (UsageKey, BlockData) pairs for all
@@ -479,7 +968,7 @@ class BlockStructureBlockData(BlockStructure):
 
             override_data (object) - The data you want to set
         """
-        block_data = self._block_data_map.get(usage_key)
+        block_data = self._get_block_for_update(usage_key)
         setattr(block_data, field_name, override_data)
 
     def get_transformer_data(self, transformer, key, default=None):
@@ -513,6 +1002,9 @@ class BlockStructureBlockData(BlockStructure):
             value (any picklable type) - The value to associate with the
                 given key for the given transformer's data.
         """
+        if self._shared_transformer_data:
+            self.transformer_data = _copy_transformer_data_map(self.transformer_data)
+            self._shared_transformer_data = False
         setattr(self.transformer_data.get_or_create(transformer), key, value)
 
     def get_transformer_block_data(self, usage_key, transformer):
@@ -593,7 +1085,7 @@ class BlockStructureBlockData(BlockStructure):
                 whose data entry is to be deleted.
         """
         try:
-            transformer_block_data = self.get_transformer_block_data(usage_key, transformer)
+            transformer_block_data = self._get_block_for_update(usage_key).transformer_data[transformer]
             delattr(transformer_block_data, key)
         except (AttributeError, KeyError):
             pass
@@ -618,19 +1110,12 @@ class BlockStructureBlockData(BlockStructure):
                 removed block's children become children of the
                 removed block's parents.
         """
-        children = self._block_relations[usage_key].children
-        parents = self._block_relations[usage_key].parents
-
-        # Remove block from its children.
-        for child in children:
-            self._block_relations[child].parents.remove(usage_key)
-
-        # Remove block from its parents.
-        for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
+        children = self.get_children(usage_key)
+        parents = self.get_parents(usage_key)
 
-        # Remove block.
-        self._block_relations.pop(usage_key, None)
+        # Remove block.  Its children and parents no longer see it
+        # as a relation once it is removed from the graph.
+        self._block_relations.remove_block(usage_key)
         self._block_data_map.pop(usage_key, None)
 
         # Recreate the graph connections if descendants are to be kept.
@@ -756,12 +1241,49 @@ class BlockStructureBlockData(BlockStructure):
         If not found, creates and returns a new BlockData and
         maps it to the given key.
         """
-        try:
-            return self._block_data_map[usage_key]
-        except KeyError:
+        block_data = self._get_block_for_update(usage_key)
+        if block_data is None:
             block_data = BlockData(usage_key)
             self._block_data_map[usage_key] = block_data
-            return block_data
+        return block_data
+
+    def _get_block_for_update(self, usage_key):
+        """
+        Returns the BlockData associated with the given usage_key, or
+        None if not found, first copying it if it is shared with other
+        copy-on-write copies of this block structure.
+        """
+        block_data = self._block_data_map.get(usage_key)
+        if usage_key in self._shared_block_keys:
+            self._shared_block_keys.discard(usage_key)
+            if block_data is not None:
+                block_data = _copy_block_data(block_data)
+                self._block_data_map[usage_key] = block_data
+        return block_data
+
+
+def _copy_transformer_data_map(transformer_data_map):
+    """
+    Returns a copy of the given TransformerDataMap, with copies of its
+    TransformerData.  Field values are shared with the original.
+    """
+    new_map = TransformerDataMap()
+    for transformer_name, transformer_data in transformer_data_map.iteritems():
+        new_transformer_data = TransformerData()
+        new_transformer_data.fields = dict(transformer_data.fields)
+        new_map[transformer_name] = new_transformer_data
+    return new_map
+
+
+def _copy_block_data(block_data):
+    """
+    Returns a copy of the given BlockData, with copies of its fields and
+    transformer data maps.  Field values are shared with the original.
+    """
+    new_block_data = BlockData(block_data.location)
+    new_block_data.fields = dict(block_data.fields)
+    new_block_data.transformer_data = _copy_transformer_data_map(block_data.transformer_data)
+    return new_block_data
 
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
@@ -1,7 +1,7 @@
 """
 Module for factory class for BlockStructure objects.
 """
-from .block_structure import BlockStructureModulestoreData, BlockStructureBlockData
+from .block_structure import BlockStructureModulestoreData, BlockStructureBlockData, _BlockGraph
 
 
 class BlockStructureFactory(object):
@@ -89,7 +89,13 @@ class BlockStructureFactory(object):
     def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
         """
         Returns a new block structure for given the arguments.
+
+        The block_relations may be either a _BlockGraph or, for data in
+        the original format, a dict {UsageKey: _BlockRelations}.
         """
+        if isinstance(block_relations, dict):
+            block_relations = _BlockGraph.from_block_relations(block_relations)
+
         block_structure = BlockStructureBlockData(root_block_usage_key)
         block_structure._block_relations = block_relations  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
@@ -60,7 +60,9 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        block_structure = (
+            collected_block_structure.copy_on_write() if collected_block_structure else self.get_collected()
+        )
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
@@ -85,17 +87,18 @@ class BlockStructureManager(object):
         the modulestore is accessed if needed (at cache miss), and the
         transformers data is collected if needed.
 
+        The collected block structure is shared with other requests
+        within this process, so a copy-on-write copy of it is returned.
+
         Returns:
             BlockStructureBlockData - A collected block structure,
                 starting at root_block_usage_key, with collected data
                 from each registered transformer.
         """
         try:
-            block_structure = BlockStructureFactory.create_from_store(
-                self.root_block_usage_key,
-                self.store,
-            )
-            BlockStructureTransformers.verify_versions(block_structure)
+            shared_block_structure = self.store.get_shared(self.root_block_usage_key)
+            BlockStructureTransformers.verify_versions(shared_block_structure)
+            block_structure = shared_block_structure.copy_on_write()
 
         except (BlockStructureNotFound, TransformerDataIncompatible):
             if config.waffle().is_enabled(config.RAISE_ERROR_WHEN_NOT_FOUND):
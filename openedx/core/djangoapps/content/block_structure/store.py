@@ -2,12 +2,26 @@
 Module for the Storage of BlockStructure objects.
 """
 # pylint: disable=protected-access
+import cPickle as pickle
+import hashlib
+import threading
+from collections import OrderedDict
 from logging import getLogger
 
+from django.conf import settings
+
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
 from . import config
-from .block_structure import BlockStructureBlockData
+from .block_structure import (
+    BlockData,
+    BlockStructureBlockData,
+    LazyTransformerDataMap,
+    TransformerBlockDataColumns,
+    TransformerData,
+    TransformerDataMap,
+    _BlockGraph,
+)
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .models import BlockStructureModel
@@ -17,6 +31,63 @@ from .transformer_registry import TransformerRegistry
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+# Version of the columnar format in which block structures are serialized.
+# Increment this value whenever the format changes.
+SERIALIZATION_FORMAT_VERSION = 1
+
+
+class SharedBlockStructureCache(object):
+    """
+    Process-local LRU cache of deserialized block structures, shared
+    across requests.  Each entry is valid only for as long as the
+    serialized data it was deserialized from is unchanged, as told by
+    the digest of that data.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key, digest):
+        """
+        Returns the block structure cached for the given key, if it
+        was deserialized from data with the given digest; else None.
+        """
+        with self._lock:
+            entry = self._entries.pop(cache_key, None)
+            if entry is None:
+                return None
+            if entry[0] != digest:
+                logger.info(u"BlockStructure: Shared copy outdated; %s.", cache_key)
+                return None
+            self._entries[cache_key] = entry
+            return entry[1]
+
+    def set(self, cache_key, digest, block_structure):
+        """
+        Caches the given block structure, deserialized from data with
+        the given digest, evicting the least recently used entries when
+        the cache is full.
+        """
+        max_size = _shared_cache_size()
+        if not max_size:
+            return
+        with self._lock:
+            self._entries.pop(cache_key, None)
+            self._entries[cache_key] = (digest, block_structure)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_shared_block_structures = SharedBlockStructureCache()  # pylint: disable=invalid-name
+
+
 class StubModel(object):
     """
     Stub model to use when storage backing is disabled.
@@ -83,19 +154,53 @@ class BlockStructureStore(object):
             BlockStructure - The deserialized block structure starting
             at root_block_usage_key, if found.
 
+        Raises:
+            BlockStructureNotFound if the root_block_usage_key is not
+            found.
+        """
+        serialized_data = self._get_serialized_data(root_block_usage_key)
+        return self._deserialize(serialized_data, root_block_usage_key)
+
+    def get_shared(self, root_block_usage_key):
+        """
+        Returns the block structure starting at root_block_usage_key,
+        as the get method does, except that the returned block structure
+        is shared with other callers within this process.
+
+        Deserialized block structures are kept in a process-local cache,
+        and reused for as long as the serialized data in the cache or
+        storage is unchanged.  Only the digest of the serialized data is
+        fetched from the cache to tell whether it's unchanged.  The
+        returned block structure must not be updated; use its
+        copy_on_write method to get an updatable copy.
+
         Raises:
             BlockStructureNotFound if the root_block_usage_key is not
             found.
         """
         bs_model = self._get_model(root_block_usage_key)
+        cache_key = self._encode_root_cache_key(bs_model)
 
-        try:
-            serialized_data = self._get_from_cache(bs_model)
-        except BlockStructureNotFound:
-            serialized_data = self._get_from_store(bs_model)
-            self._add_to_cache(serialized_data, bs_model)
+        digest = self._cache.get(_digest_cache_key(cache_key))
+        block_structure = _shared_block_structures.get(cache_key, digest) if digest else None
+        if block_structure is None:
+            serialized_data = self._get_serialized_data_of_model(bs_model)
+            data_digest = _digest(serialized_data)
+            if not digest:
+                # Don't replace the digest of data added meanwhile.
+                self._cache.add(_digest_cache_key(cache_key), data_digest, timeout=config.cache_timeout_in_seconds())
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+            block_structure = self._deserialize(serialized_data, root_block_usage_key)
+
+            # Decode all lazily loaded data up front, since the block
+            # structure may be read concurrently.
+            for block_data in block_structure.itervalues():
+                block_data.transformer_data.load_all()
+            block_structure.freeze()
+
+            _shared_block_structures.set(cache_key, data_digest, block_structure)
+
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -107,7 +212,9 @@ class BlockStructureStore(object):
                 of the block structure that is to be removed.
         """
         bs_model = self._get_model(root_block_usage_key)
-        self._cache.delete(self._encode_root_cache_key(bs_model))
+        cache_key = self._encode_root_cache_key(bs_model)
+        self._cache.delete(cache_key)
+        self._cache.delete(_digest_cache_key(cache_key))
         bs_model.delete()
         logger.info(u"BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -126,6 +233,31 @@ class BlockStructureStore(object):
 
         return False
 
+    def _get_serialized_data(self, root_block_usage_key):
+        """
+        Returns the serialized data of the block structure for the given
+        key, from the cache or else from storage.
+        Raises:
+             BlockStructureNotFound if not found.
+        """
+        return self._get_serialized_data_of_model(self._get_model(root_block_usage_key))
+
+    def _get_serialized_data_of_model(self, bs_model):
+        """
+        Returns the serialized data of the block structure for the given
+        BlockStructureModel or StubModel, from the cache or else from
+        storage.
+        Raises:
+             BlockStructureNotFound if not found.
+        """
+        try:
+            serialized_data = self._get_from_cache(bs_model)
+        except BlockStructureNotFound:
+            serialized_data = self._get_from_store(bs_model)
+            self._add_to_cache(serialized_data, bs_model)
+
+        return serialized_data
+
     def _get_model(self, root_block_usage_key):
         """
         Returns the model associated with the given key.
@@ -157,7 +289,11 @@ class BlockStructureStore(object):
         to the cache.
         """
         cache_key = self._encode_root_cache_key(bs_model)
-        self._cache.set(cache_key, serialized_data, timeout=config.cache_timeout_in_seconds())
+        timeout = config.cache_timeout_in_seconds()
+        self._cache.set(cache_key, serialized_data, timeout=timeout)
+        # The digest is set after the data, so that it never describes
+        # data that isn't yet in the cache.
+        self._cache.set(_digest_cache_key(cache_key), _digest(serialized_data), timeout=timeout)
         logger.info(u"BlockStructure: Added to cache; %s, size: %d", bs_model, len(serialized_data))
 
     def _get_from_cache(self, bs_model):
@@ -191,18 +327,19 @@ class BlockStructureStore(object):
         """
         Serializes the data for the given block_structure.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        return zpickle(_encode_block_structure(block_structure))
 
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
         """
-        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+        data = zunpickle(serialized_data)
+        if isinstance(data, dict) and data.get('format_version') == SERIALIZATION_FORMAT_VERSION:
+            block_relations, transformer_data, block_data_map = _decode_block_structure(data)
+        else:
+            # Data in the original (pickled object graph) format.
+            block_relations, transformer_data, block_data_map = data
+
         return BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
@@ -249,8 +386,126 @@ class BlockStructureStore(object):
         }
 
 
+def _shared_cache_size():
+    """
+    Returns the maximum number of block structures to keep in the
+    process-local cache of shared block structures.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('SHARED_CACHE_SIZE', 0)
+
+
+def _digest_cache_key(cache_key):
+    """
+    Returns the cache key of the digest of the serialized data cached
+    under the given cache key.
+    """
+    return u'{}.digest'.format(cache_key)
+
+
+def _digest(serialized_data):
+    """
+    Returns a digest of the given serialized data.
+    """
+    return hashlib.sha1(serialized_data).hexdigest()
+
+
 def _is_storage_backing_enabled():
     """
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _encode_block_structure(block_structure):
+    """
+    Returns a compact, columnar encoding of the given block_structure's
+    block relations, transformer data, and block data.
+
+    Each usage key is stored only once, in a table, and is otherwise
+    referred to by its index in that table. Block relations are stored as
+    adjacency lists of indices of the first num_blocks usage keys, and block data as one column per xBlock
+    field and one separately pickled column per transformer, so that a
+    transformer's column is decoded only when it is first accessed.
+    """
+    usage_keys, children, parents = block_structure._block_relations.to_adjacency()
+    block_data_map = block_structure._block_data_map
+
+    usage_keys = list(usage_keys)
+    index_of = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+    for usage_key in block_data_map:
+        if usage_key not in index_of:
+            index_of[usage_key] = len(usage_keys)
+            usage_keys.append(usage_key)
+
+    xblock_fields = {}
+    transformer_block_data = {}
+    for usage_key, block_data in block_data_map.iteritems():
+        index = index_of[usage_key]
+        for field_name, value in block_data.fields.iteritems():
+            column = xblock_fields.setdefault(field_name, ([], []))
+            column[0].append(index)
+            column[1].append(value)
+        for transformer_name, transformer_data in block_data.transformer_data.iteritems():
+            column = transformer_block_data.setdefault(transformer_name, ([], []))
+            column[0].append(index)
+            column[1].append(transformer_data.fields)
+
+    return {
+        'format_version': SERIALIZATION_FORMAT_VERSION,
+        'usage_keys': usage_keys,
+        'num_blocks': len(children),
+        'children': children,
+        'parents': parents,
+        'transformer_data': dict(block_structure.transformer_data),
+        'block_data_indices': [index_of[usage_key] for usage_key in block_data_map],
+        'xblock_fields': xblock_fields,
+        'transformer_block_data': {
+            transformer_name: pickle.dumps(column, pickle.HIGHEST_PROTOCOL)
+            for transformer_name, column in transformer_block_data.iteritems()
+        },
+    }
+
+
+def _decode_block_structure(data):
+    """
+    Returns the (block_relations, transformer_data, block_data_map) of
+    the block structure encoded in the given data by
+    _encode_block_structure.
+    """
+    usage_keys = data['usage_keys']
+
+    block_relations = _BlockGraph.from_adjacency(
+        usage_keys[:data['num_blocks']],
+        data['children'],
+        data['parents'],
+    )
+
+    transformer_data = TransformerDataMap(data['transformer_data'])
+
+    columns = TransformerBlockDataColumns(data['transformer_block_data'], _decode_transformer_block_column)
+    blocks = {}
+    for index in data['block_data_indices']:
+        block_data = BlockData(usage_keys[index])
+        block_data.transformer_data = LazyTransformerDataMap(columns, index)
+        blocks[index] = block_data
+
+    for field_name, (indices, values) in data['xblock_fields'].iteritems():
+        for index, value in zip(indices, values):
+            blocks[index].fields[field_name] = value
+
+    block_data_map = {block_data.location: block_data for block_data in blocks.itervalues()}
+    return block_relations, transformer_data, block_data_map
+
+
+def _decode_transformer_block_column(encoded_column):
+    """
+    Decodes a single transformer's column of block data, as encoded by
+    _encode_block_structure, into a map of block index to TransformerData.
+    """
+    indices, fields_list = pickle.loads(encoded_column)
+    column = {}
+    for index, fields in zip(indices, fields_list):
+        transformer_data = TransformerData()
+        transformer_data.fields = fields
+        column[index] = transformer_data
+    return column
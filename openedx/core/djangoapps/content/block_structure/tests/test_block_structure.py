@@ -45,6 +45,40 @@ class TestBlockStructure(TestCase, ChildrenMapTestMixin):
             self.assertIn(node, block_structure)
         self.assertNotIn(len(children_map) + 1, block_structure)
 
+    def test_relations_after_compaction(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP, BlockStructure)
+        block_relations = block_structure._block_relations  # pylint: disable=protected-access
+        block_relations.remove_block(2)
+        usage_keys, children, parents = block_relations.to_adjacency()
+
+        self.assertNotIn(2, usage_keys)
+        index_of = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+        for usage_key in usage_keys:
+            self.assertEqual(
+                [usage_keys[child] for child in children[index_of[usage_key]]],
+                block_structure.get_children(usage_key),
+            )
+            self.assertEqual(
+                [usage_keys[parent] for parent in parents[index_of[usage_key]]],
+                block_structure.get_parents(usage_key),
+            )
+
+    def test_clear_parents_of_unknown_block(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP, BlockStructure)
+        block_relations = block_structure._block_relations  # pylint: disable=protected-access
+        block_relations.clear_parents(len(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP))
+        self.assertNotIn(None, block_relations._updated_parents)  # pylint: disable=protected-access
+        self.assertEqual(block_structure.get_parents(1), [0])
+
+    def test_traversals(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP, BlockStructure)
+        self.assertEqual(list(block_structure.topological_traversal()), [0, 1, 2, 3, 5, 6, 4])
+        self.assertEqual(list(block_structure.post_order_traversal()), [5, 6, 3, 1, 4, 2, 0])
+        self.assertEqual(
+            list(block_structure.topological_traversal(filter_func=lambda block_key: block_key != 3)),
+            [0, 1, 2, 4],
+        )
+
 
 @ddt.ddt
 class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
@@ -308,3 +342,29 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+    def test_copy_on_write(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        for block in block_structure:
+            block_structure._get_or_create_block(block).display_name = 'original'
+            block_structure.set_transformer_block_field(block, 'transformer', 'test_key', 'original')
+        block_structure.set_transformer_data('transformer', 'test_key', 'original')
+
+        new_copy = block_structure.copy_on_write()
+        self.assertIs(block_structure[1], new_copy[1])
+
+        # updates to the copy are not seen by the original
+        new_copy.override_xblock_field(1, 'display_name', 'edit1')
+        new_copy.set_transformer_block_field(2, 'transformer', 'test_key', 'edit1')
+        new_copy.set_transformer_data('transformer', 'test_key', 'edit1')
+        new_copy.remove_block(3, keep_descendants=False)
+        self.assertEquals(block_structure.get_xblock_field(1, 'display_name'), 'original')
+        self.assertEquals(block_structure.get_transformer_block_field(2, 'transformer', 'test_key'), 'original')
+        self.assertEquals(block_structure.get_transformer_data('transformer', 'test_key'), 'original')
+        self.assert_block_structure(block_structure, [[1], [2], [3], []])
+
+        # updates to the original are not seen by the copy
+        block_structure.override_xblock_field(0, 'display_name', 'edit2')
+        self.assertEquals(new_copy.get_xblock_field(0, 'display_name'), 'original')
+        self.assertEquals(new_copy.get_xblock_field(1, 'display_name'), 'edit1')
+        self.assertIsNot(block_structure[0], new_copy[0])
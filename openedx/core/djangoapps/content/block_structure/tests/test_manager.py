@@ -122,7 +122,8 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
             self.assertGreater(self.modulestore.get_items_call_count, 0)
         else:
             self.assertEquals(self.modulestore.get_items_call_count, 0)
-        self.assertEquals(self.cache.set_call_count, 1 if expect_cache_updated else 0)
+        # The serialized data and its digest are cached together.
+        self.assertEquals(self.cache.set_call_count, 2 if expect_cache_updated else 0)
 
     def test_get_transformed(self):
         with mock_registered_transformers(self.registered_transformers):
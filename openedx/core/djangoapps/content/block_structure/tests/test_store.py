@@ -1,14 +1,21 @@
 """
 Tests for block_structure/cache.py
 """
+import pickle
+from copy import copy, deepcopy
+
 import ddt
+from django.conf import settings
+from mock import patch
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.cache_utils import zpickle
 
+from ..block_structure import _BlockRelations
 from ..config import STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
-from ..store import BlockStructureStore
+from ..store import BlockStructureStore, StubModel, _shared_block_structures
 from .helpers import ChildrenMapTestMixin, UsageKeyFactoryMixin, MockCache, MockTransformer
 
 
@@ -88,3 +95,155 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         self.assertEquals(self.mock_cache.timeout_from_last_call, 0)
         self.store.add(self.block_structure)
         self.assertEquals(self.mock_cache.timeout_from_last_call, timeout)
+
+    def test_serialization_format(self):
+        self.block_structure._get_or_create_block(self.block_key_factory(1)).display_name = u'Section'  # pylint: disable=protected-access
+        deserialized = self.store._deserialize(  # pylint: disable=protected-access
+            self.store._serialize(self.block_structure),  # pylint: disable=protected-access
+            self.block_structure.root_block_usage_key,
+        )
+        self.assert_block_structure(deserialized, self.children_map)
+        self.assertEquals(deserialized.get_xblock_field(self.block_key_factory(1), 'display_name'), u'Section')
+        self.assertEquals(
+            deserialized.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+        self.assertEquals(
+            deserialized._get_transformer_data_version(MockTransformer),  # pylint: disable=protected-access
+            MockTransformer.WRITE_VERSION,
+        )
+
+    def test_transformer_block_data_decoded_lazily(self):
+        serialized_data = self.store._serialize(self.block_structure)  # pylint: disable=protected-access
+        deserialized = self.store._deserialize(  # pylint: disable=protected-access
+            serialized_data,
+            self.block_structure.root_block_usage_key,
+        )
+        root_block_data = deserialized[self.block_key_factory(0)]
+        self.assertEquals(dict.__len__(root_block_data.transformer_data), 0)
+
+        copied = deserialized.copy()
+        self.assertEquals(
+            copied.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+        self.assertEquals(dict.__len__(root_block_data.transformer_data), 0)
+        self.assertIn(MockTransformer, root_block_data.transformer_data)
+
+    def test_transformer_block_data_copied_lazily(self):
+        serialized_data = self.store._serialize(self.block_structure)  # pylint: disable=protected-access
+        deserialized = self.store._deserialize(  # pylint: disable=protected-access
+            serialized_data,
+            self.block_structure.root_block_usage_key,
+        )
+        transformer_data = deserialized[self.block_key_factory(0)].transformer_data
+
+        for copied in (
+                copy(transformer_data),
+                deepcopy(transformer_data),
+                pickle.loads(pickle.dumps(transformer_data, pickle.HIGHEST_PROTOCOL)),
+        ):
+            self.assertEquals(dict.__len__(transformer_data), 0)
+            self.assertEquals(dict.__len__(copied), 0)
+            self.assertEquals(copied[MockTransformer].test, u'{} val'.format(MockTransformer.name()))
+
+        self.assertEquals(dict.__len__(transformer_data), 0)
+        self.assertEquals(transformer_data[MockTransformer].test, u'{} val'.format(MockTransformer.name()))
+
+    def _serialize_legacy(self):
+        """
+        Returns the block structure serialized in the original (pickled
+        object graph) format.
+        """
+        block_relations = {}
+        for block_key in self.block_structure:
+            block_relations[block_key] = _BlockRelations()
+            block_relations[block_key].children = self.block_structure.get_children(block_key)
+            block_relations[block_key].parents = self.block_structure.get_parents(block_key)
+
+        return zpickle((
+            block_relations,
+            self.block_structure.transformer_data,
+            self.block_structure._block_data_map,  # pylint: disable=protected-access
+        ))
+
+    def test_legacy_serialization_format(self):
+        deserialized = self.store._deserialize(  # pylint: disable=protected-access
+            self._serialize_legacy(),
+            self.block_structure.root_block_usage_key,
+        )
+        self.assert_block_structure(deserialized, self.children_map)
+
+    @patch.dict(settings.BLOCK_STRUCTURES_SETTINGS, {'SHARED_CACHE_SIZE': 1})
+    def test_get_shared_legacy_serialization_format(self):
+        _shared_block_structures.clear()
+        self.addCleanup(_shared_block_structures.clear)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        cache_key = BlockStructureStore._encode_root_cache_key(  # pylint: disable=protected-access
+            StubModel(root_block_usage_key),
+        )
+        self.mock_cache.set(cache_key, self._serialize_legacy(), timeout=None)
+        shared = self.store.get_shared(root_block_usage_key)
+        self.assert_block_structure(shared, self.children_map)
+        self.assertEquals(
+            shared.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+
+    @patch.dict(settings.BLOCK_STRUCTURES_SETTINGS, {'SHARED_CACHE_SIZE': 1})
+    def test_get_shared(self):
+        _shared_block_structures.clear()
+        self.addCleanup(_shared_block_structures.clear)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        self.store.add(self.block_structure)
+        shared = self.store.get_shared(root_block_usage_key)
+        self.assert_block_structure(shared, self.children_map)
+        self.assertIs(self.store.get_shared(root_block_usage_key), shared)
+
+        # an updated block structure is deserialized anew
+        self.block_structure.remove_block(self.block_key_factory(4), keep_descendants=False)
+        self.store.add(self.block_structure)
+        updated_shared = self.store.get_shared(root_block_usage_key)
+        self.assertIsNot(updated_shared, shared)
+        self.assert_block_structure(updated_shared, [[1, 2], [3], [], [], []], missing_blocks=[4])
+
+    @patch.dict(settings.BLOCK_STRUCTURES_SETTINGS, {'SHARED_CACHE_SIZE': 1})
+    def test_get_shared_fetches_digest_only(self):
+        _shared_block_structures.clear()
+        self.addCleanup(_shared_block_structures.clear)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        self.store.add(self.block_structure)
+        shared = self.store.get_shared(root_block_usage_key)
+        with patch.object(self.mock_cache, 'get', wraps=self.mock_cache.get) as mock_get:
+            self.assertIs(self.store.get_shared(root_block_usage_key), shared)
+        self.assertEquals(mock_get.call_count, 1)
+        self.assertTrue(mock_get.call_args[0][0].endswith(u'.digest'))
+
+    @patch.dict(settings.BLOCK_STRUCTURES_SETTINGS, {'SHARED_CACHE_SIZE': 1})
+    def test_get_shared_not_updated_by_copy_on_write(self):
+        _shared_block_structures.clear()
+        self.addCleanup(_shared_block_structures.clear)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+
+        self.store.add(self.block_structure)
+        shared = self.store.get_shared(root_block_usage_key)
+        shared_state = (
+            shared._shared_block_keys,  # pylint: disable=protected-access
+            shared._shared_transformer_data,  # pylint: disable=protected-access
+        )
+        new_copy = shared.copy_on_write()
+        self.assertIs(shared._shared_block_keys, shared_state[0])  # pylint: disable=protected-access
+        self.assertEquals(shared._shared_transformer_data, shared_state[1])  # pylint: disable=protected-access
+
+        new_copy.override_xblock_field(self.block_key_factory(1), 'display_name', u'Updated')
+        self.assertEquals(new_copy.get_xblock_field(self.block_key_factory(1), 'display_name'), u'Updated')
+        self.assertNotEquals(shared.get_xblock_field(self.block_key_factory(1), 'display_name'), u'Updated')
+
+    @patch.dict(settings.BLOCK_STRUCTURES_SETTINGS, {'SHARED_CACHE_SIZE': 0})
+    def test_get_shared_disabled(self):
+        self.store.add(self.block_structure)
+        root_block_usage_key = self.block_structure.root_block_usage_key
+        self.assertIsNot(self.store.get_shared(root_block_usage_key), self.store.get_shared(root_block_usage_key))
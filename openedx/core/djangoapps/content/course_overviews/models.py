@@ -6,12 +6,14 @@ import logging
 from urlparse import urlparse, urlunparse
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
 from django.template import defaultfilters
 
 from ccx_keys.locator import CCXLocator
+from edx_django_utils.cache import RequestCache
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField, UsageKeyField
 from six import text_type
@@ -50,6 +52,12 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 6
 
+    # Overviews, with their tabs and image set, are cached for the duration
+    # of a request in this RequestCache namespace, and across requests in the
+    # django cache for CACHE_TIMEOUT seconds.
+    CACHE_NAMESPACE = 'course_overviews'
+    CACHE_TIMEOUT = 60 * 60
+
     # Cache entry versioning.
     version = IntegerField()
 
@@ -288,14 +296,18 @@ class CourseOverview(TimeStampedModel):
             - IOError if some other error occurs while trying to load the
                 course from the module store.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(id=course_id)
-            if course_overview.version < cls.VERSION:
-                # Throw away old versions of CourseOverview, as they might contain stale data.
-                course_overview.delete()
+        course_overview = cls._get_cached_many([course_id], fetch_missing=False).get(course_id)
+        if course_overview is None:
+            try:
+                course_overview = cls.objects.select_related('image_set').prefetch_related('tabs').get(id=course_id)
+                if course_overview.version < cls.VERSION:
+                    # Throw away old versions of CourseOverview, as they might contain stale data.
+                    course_overview.delete()
+                    course_overview = None
+                else:
+                    cls._set_cached_many({course_id: course_overview})
+            except cls.DoesNotExist:
                 course_overview = None
-        except cls.DoesNotExist:
-            course_overview = None
 
         # Regenerate the thumbnail images if they're missing (either because
         # they were never generated, or because they were flushed out after
@@ -305,6 +317,27 @@ class CourseOverview(TimeStampedModel):
 
         return course_overview or cls.load_from_module_store(course_id)
 
+    @classmethod
+    def get_many(cls, course_ids):
+        """
+        Return a dict mapping course_ids to CourseOverviews, like get_from_id
+        does for each of them, but fetching all the cached overviews at once.
+
+        Overviews that are not cached are fetched from the database, with
+        their tabs and image sets, in a single query; those that don't exist
+        (or are outdated) are then generated one by one.  Courses that are
+        not found in the module store are left out of the returned dict.
+        """
+        course_ids = list(course_ids)
+        course_overviews = cls._get_cached_many(course_ids)
+        for course_id in course_ids:
+            if course_id not in course_overviews:
+                try:
+                    course_overviews[course_id] = cls.get_from_id(course_id)
+                except cls.DoesNotExist:
+                    pass
+        return course_overviews
+
     @classmethod
     def get_from_ids_if_exists(cls, course_ids):
         """
@@ -317,14 +350,7 @@ class CourseOverview(TimeStampedModel):
         Callers should assume that this list is incomplete and fall back to
         get_from_id if they need to guarantee CourseOverview generation.
         """
-        return {
-            overview.id: overview
-            for overview
-            in cls.objects.select_related('image_set').filter(
-                id__in=course_ids,
-                version__gte=cls.VERSION
-            )
-        }
+        return cls._get_cached_many(course_ids)
 
     @classmethod
     def get_from_id_if_exists(cls, course_id):
@@ -339,15 +365,81 @@ class CourseOverview(TimeStampedModel):
         Callers should assume that this list is incomplete and fall back to
         get_from_id if they need to guarantee CourseOverview generation.
         """
-        try:
-            course_overview = cls.objects.select_related('image_set').get(
-                id=course_id,
-                version__gte=cls.VERSION
-            )
-        except cls.DoesNotExist:
-            course_overview = None
+        return cls._get_cached_many([course_id]).get(course_id)
 
-        return course_overview
+    @classmethod
+    def _get_cached_many(cls, course_ids, fetch_missing=True):
+        """
+        Return a dict mapping course_ids to up-to-date CourseOverviews, if they
+        exist, looking them up in the request cache, then in the django cache,
+        then (if fetch_missing) in the database, and caching those found.
+        """
+        request_cache = RequestCache(cls.CACHE_NAMESPACE)
+        course_overviews = {}
+        missing_ids = []
+        for course_id in set(course_ids):
+            cached_response = request_cache.get_cached_response(unicode(course_id))
+            if cached_response.is_found:
+                course_overviews[course_id] = cached_response.value
+            else:
+                missing_ids.append(course_id)
+        if not missing_ids:
+            return course_overviews
+
+        cache_keys = {cls._cache_key(course_id): course_id for course_id in missing_ids}
+        for cache_key, course_overview in cache.get_many(cache_keys.keys()).iteritems():
+            course_overviews[cache_keys[cache_key]] = course_overview
+            request_cache.set(unicode(cache_keys[cache_key]), course_overview)
+
+        missing_ids = [course_id for course_id in missing_ids if course_id not in course_overviews]
+        if missing_ids and fetch_missing:
+            fetched = {
+                course_overview.id: course_overview
+                for course_overview in cls.objects.select_related('image_set').prefetch_related('tabs').filter(
+                    id__in=missing_ids,
+                    version__gte=cls.VERSION
+                )
+            }
+            cls._set_cached_many(fetched)
+            course_overviews.update(fetched)
+        return course_overviews
+
+    @classmethod
+    def _set_cached_many(cls, course_overviews):
+        """
+        Caches the given dict mapping course_ids to up-to-date CourseOverviews,
+        in the request cache and the django cache.
+        """
+        request_cache = RequestCache(cls.CACHE_NAMESPACE)
+        for course_id, course_overview in course_overviews.iteritems():
+            request_cache.set(unicode(course_id), course_overview)
+        cache.set_many(
+            {cls._cache_key(course_id): course_overview for course_id, course_overview in course_overviews.iteritems()},
+            cls.CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def _cache_key(cls, course_id):
+        """
+        Returns the django cache key of the overview of the given course at the
+        current VERSION, so that overviews cached by older code are not used.
+        """
+        return u'{}.v{}.{}'.format(cls.CACHE_NAMESPACE, cls.VERSION, course_id)
+
+    @classmethod
+    def invalidate_cache(cls, course_id):
+        """
+        Removes the overview of the given course from the request cache and
+        the django cache, now and once the current transaction is committed
+        (so that a concurrent request can't cache the overview as it was before
+        the transaction).
+        """
+        def _invalidate():
+            RequestCache(cls.CACHE_NAMESPACE).delete(unicode(course_id))
+            cache.delete(cls._cache_key(course_id))
+
+        _invalidate()
+        transaction.on_commit(_invalidate)
 
     def clean_id(self, padding_char='='):
         """
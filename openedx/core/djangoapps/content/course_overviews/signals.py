@@ -3,10 +3,11 @@ Signal handler for invalidating cached course overviews
 """
 import logging
 
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal
 from django.dispatch.dispatcher import receiver
 
-from .models import CourseOverview
+from .models import CourseOverview, CourseOverviewImageSet
 from xmodule.modulestore.django import SignalHandler
 
 LOG = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     updates the corresponding CourseOverview cache entry.
     """
     previous_course_overview = CourseOverview.get_from_ids_if_exists([course_key]).get(course_key)
+    CourseOverview.invalidate_cache(course_key)
     updated_course_overview = CourseOverview.load_from_module_store(course_key)
     _check_for_course_changes(previous_course_overview, updated_course_overview)
 
@@ -34,12 +36,33 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     invalidates the corresponding CourseOverview cache entry if one exists.
     """
     CourseOverview.objects.filter(id=course_key).delete()
+    CourseOverview.invalidate_cache(course_key)
     # import CourseAboutSearchIndexer inline due to cyclic import
     from cms.djangoapps.contentstore.courseware_index import CourseAboutSearchIndexer
     # Delete course entry from Course About Search_index
     CourseAboutSearchIndexer.remove_deleted_items(course_key)
 
 
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+def _invalidate_cached_course_overview(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached copies of a CourseOverview when it is saved or
+    deleted outside of the course publish and delete handlers.
+    """
+    CourseOverview.invalidate_cache(instance.id)
+
+
+@receiver(post_save, sender=CourseOverviewImageSet)
+@receiver(post_delete, sender=CourseOverviewImageSet)
+def _invalidate_cached_course_overview_image_set(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the cached copies of a CourseOverview, which include its
+    image set, when the image set is saved or deleted.
+    """
+    CourseOverview.invalidate_cache(instance.course_overview_id)
+
+
 def _check_for_course_changes(previous_course_overview, updated_course_overview):
     if previous_course_overview:
         _check_for_course_date_changes(previous_course_overview, updated_course_overview)
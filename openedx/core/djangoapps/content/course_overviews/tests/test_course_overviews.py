@@ -556,6 +556,62 @@ class CourseOverviewTestCase(CatalogIntegrationMixin, ModuleStoreTestCase, Cache
         course_id_to_overview = CourseOverview.get_from_id_if_exists(course_with_overview.id)
         self.assertEqual(course_id_to_overview, None)
 
+    def test_get_many(self):
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        non_existent_course_id = self.store.make_course_key('Non', 'Existent', 'Course')
+
+        course_ids_to_overviews = CourseOverview.get_many(
+            [course_with_overview.id, course_without_overview.id, non_existent_course_id]
+        )
+
+        # Missing overviews are generated, like with get_from_id, but courses
+        # that don't exist are left out.
+        self.assertEqual(
+            set(course_ids_to_overviews),
+            {course_with_overview.id, course_without_overview.id},
+        )
+        for course_id, course_overview in course_ids_to_overviews.iteritems():
+            self.assertEqual(course_overview.id, course_id)
+
+    def test_get_many_is_cached(self):
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+
+        # The overviews, with their tabs and image sets, are fetched at once.
+        with self.assertNumQueries(2):
+            course_ids_to_overviews = CourseOverview.get_many(course_ids)
+            for course_overview in course_ids_to_overviews.itervalues():
+                list(course_overview.tabs.all())
+                hasattr(course_overview, 'image_set')
+
+        # Then they are cached for the rest of the request.
+        with self.assertNumQueries(0):
+            CourseOverview.get_many(course_ids)
+            CourseOverview.get_from_id_if_exists(course_ids[0])
+            CourseOverview.get_from_ids_if_exists(course_ids)
+
+    def test_cache_invalidated_on_publish(self):
+        course = CourseFactory.create(emit_signals=True)
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, course.display_name)
+
+        course.display_name = u'Updated Course Name'
+        self.store.update_item(course, ModuleStoreEnum.UserID.test)
+
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, u'Updated Course Name')
+        self.assertEqual(
+            CourseOverview.get_from_ids_if_exists([course.id])[course.id].display_name,
+            u'Updated Course Name',
+        )
+
+    def test_cache_invalidated_on_save(self):
+        course = CourseFactory.create(emit_signals=True)
+        course_overview = CourseOverview.get_from_id(course.id)
+
+        course_overview.display_name = u'Updated Course Name'
+        course_overview.save()
+
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, u'Updated Course Name')
+
 
 @ddt.ddt
 class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
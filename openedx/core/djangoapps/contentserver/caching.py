@@ -1,12 +1,23 @@
 """
 Helper functions for caching course assets.
 """
+import errno
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
 
+log = logging.getLogger(__name__)
+
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
 try:
@@ -48,3 +59,176 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+
+
+class AssetDiskCache(object):
+    """
+    A size-bounded cache of course asset contents in a local directory,
+    shared by all the processes using that directory.
+
+    Contents are keyed by their md5 digest, so a cached file never needs to
+    be invalidated, only evicted; the least recently served files are
+    evicted first.  Files are only cached if their contents match their
+    digest, and are served from an open file, so that responses can be
+    sent with sendfile and ranges read without loading the whole asset.
+    """
+    DIGEST_RE = re.compile(r'^[0-9a-f]{32}$')
+
+    # How many files this process stores between rescans of the directory,
+    # to account for the files stored by other processes.
+    SCAN_INTERVAL = 100
+
+    def __init__(self, directory, max_size, max_file_size):
+        """
+        Arguments:
+            directory (str): The directory to keep the cached files in.
+            max_size (int): The maximum total size, in bytes, of the cached files.
+            max_file_size (int): The maximum size, in bytes, of an asset to cache.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._stores_since_scan = 0
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, content):
+        """
+        Returns whether the given content can be cached.
+        """
+        digest = getattr(content, 'content_digest', None)
+        return (
+            digest is not None and self.DIGEST_RE.match(digest) is not None and
+            content.length is not None and content.length <= min(self.max_file_size, self.max_size)
+        )
+
+    def path(self, digest):
+        """
+        Returns the path of the file caching the contents with the given digest.
+        """
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def open(self, digest):
+        """
+        Returns the cached file for the given digest, opened for reading, or
+        None if it isn't cached.
+        """
+        path = self.path(digest)
+        try:
+            asset_file = open(path, 'rb')
+            os.utime(path, None)
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return asset_file
+
+    def store(self, digest, chunks):
+        """
+        Caches the contents given by the `chunks` iterable under `digest`,
+        and returns the cached file opened for reading, or None if the
+        contents couldn't be cached.
+        """
+        path = self.path(digest)
+        md5 = hashlib.md5()
+        size = 0
+        try:
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError as error:
+                if error.errno != errno.EEXIST:
+                    raise
+
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as temp_file:
+                    for chunk in chunks:
+                        md5.update(chunk)
+                        size += len(chunk)
+                        temp_file.write(chunk)
+                if md5.hexdigest() != digest:
+                    raise IOError(u"Contents don't match digest {}".format(digest))
+                os.rename(temp_path, path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+            asset_file = open(path, 'rb')
+        except (IOError, OSError):
+            log.warning(u"Couldn't cache asset contents %s in %s", digest, self.directory, exc_info=True)
+            return None
+
+        self._record_store(size)
+        return asset_file
+
+    def _record_store(self, size):
+        """
+        Records that a file of the given size was stored, and evicts files
+        if the cache is (or may be) too big.
+        """
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            self._stores_since_scan += 1
+            if self._size is None or self._size > self.max_size or self._stores_since_scan >= self.SCAN_INTERVAL:
+                self._evict()
+
+    def _evict(self):
+        """
+        Rescans the directory, and removes the least recently served files
+        until the cache takes at most 90% of its maximum size.
+        """
+        entries = []
+        for dirpath, __, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.startswith('.tmp'):
+                    # Still being written.
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for __, size, __ in entries)
+        if total_size > self.max_size:
+            target_size = self.max_size * 9 // 10
+            for __, size, path in sorted(entries):
+                if total_size <= target_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+
+        self._size = total_size
+        self._stores_since_scan = 0
+
+
+_ASSET_DISK_CACHE = None
+_ASSET_DISK_CACHE_LOCK = threading.Lock()
+
+
+def get_asset_disk_cache():
+    """
+    Returns the :class:`AssetDiskCache` configured by the
+    COURSE_ASSETS_DISK_CACHE setting, or None if it's disabled.
+
+    The cache is (re)created whenever the setting changes, so that tests can
+    enable it with `override_settings`.
+    """
+    global _ASSET_DISK_CACHE  # pylint: disable=global-statement
+    config = getattr(settings, 'COURSE_ASSETS_DISK_CACHE', {})
+    if not config.get('DIRECTORY'):
+        return None
+
+    config_values = (config['DIRECTORY'], config.get('MAX_SIZE', 0), config.get('MAX_FILE_SIZE', 0))
+    with _ASSET_DISK_CACHE_LOCK:
+        if _ASSET_DISK_CACHE is None or (
+                _ASSET_DISK_CACHE.directory, _ASSET_DISK_CACHE.max_size, _ASSET_DISK_CACHE.max_file_size
+        ) != config_values:
+            _ASSET_DISK_CACHE = AssetDiskCache(*config_values)
+        return _ASSET_DISK_CACHE
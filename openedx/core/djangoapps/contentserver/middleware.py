@@ -10,18 +10,18 @@ try:
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
 from django.http import (
-    HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
+    FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
     HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
 from six import text_type
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import get_asset_disk_cache, get_cached_content, set_cached_content
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -122,9 +122,10 @@ class StaticContentServer(object):
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
+            content, asset_file = self.open_cached_asset_file(content, loc)
             if request.META.get('HTTP_RANGE'):
                 # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
+                if asset_file is None and isinstance(content, StaticContent):
                     content = AssetManager.find(loc, as_stream=True)
 
                 header_value = request.META['HTTP_RANGE']
@@ -151,7 +152,10 @@ class StaticContentServer(object):
 
                         if 0 <= first <= last < content.length:
                             # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                            if asset_file is not None:
+                                response = FileResponse(AssetFileRange(asset_file, first, last))
+                            else:
+                                response = HttpResponse(content.stream_data_in_range(first, last))
                             response['Content-Range'] = b'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
@@ -165,14 +169,20 @@ class StaticContentServer(object):
                                 u"Cannot satisfy ranges in Range header: %s for content: %s",
                                 header_value, text_type(loc)
                             )
+                            if asset_file is not None:
+                                asset_file.close()
                             return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if asset_file is not None:
+                    response = FileResponse(asset_file)
+                else:
+                    response = HttpResponse(content.stream_data())
                 response['Content-Length'] = content.length
 
             if newrelic:
+                newrelic.agent.add_custom_parameter('contentserver.disk_cached', asset_file is not None)
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
                 newrelic.agent.add_custom_parameter('contentserver.content_type', content.content_type)
 
@@ -189,6 +199,26 @@ class StaticContentServer(object):
 
             return response
 
+    def open_cached_asset_file(self, content, location):
+        """
+        Returns the content, and its contents as a file from the local disk
+        cache of assets, storing them there first if needed, or None if
+        they're not cached.
+
+        The content is reloaded if storing it consumed its stream without
+        caching it.
+        """
+        disk_cache = get_asset_disk_cache()
+        if disk_cache is None or not disk_cache.is_cacheable(content):
+            return content, None
+
+        asset_file = disk_cache.open(content.content_digest)
+        if asset_file is None:
+            asset_file = disk_cache.store(content.content_digest, content.stream_data())
+            if asset_file is None and isinstance(content, StaticContentStream):
+                content = AssetManager.find(location, as_stream=True)
+        return content, asset_file
+
     def set_caching_headers(self, content, response):
         """
         Sets caching headers based on whether or not the asset is locked.
@@ -293,6 +323,29 @@ class StaticContentServer(object):
         return content
 
 
+class AssetFileRange(object):
+    """
+    A read-only file-like view of the bytes between `first` and `last`
+    (included) of `asset_file`, to stream a range of an asset.
+    """
+    def __init__(self, asset_file, first, last):
+        self.asset_file = asset_file
+        self.remaining = last - first + 1
+        self.asset_file.seek(first)
+
+    def read(self, size=-1):
+        """Read at most `size` bytes, without going past the range."""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.asset_file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        """Close the underlying file."""
+        self.asset_file.close()
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
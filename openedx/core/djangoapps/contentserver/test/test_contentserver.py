@@ -5,7 +5,9 @@ import copy
 
 import datetime
 import ddt
+import hashlib
 import logging
+import os
 import unittest
 from uuid import uuid4
 
@@ -24,9 +26,11 @@ from xmodule.assetstore.assetmgr import AssetManager
 from opaque_keys import InvalidKeyError
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
+from openedx.core.lib.tempdir import mkdtemp_clean
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import AssetDiskCache, get_asset_disk_cache
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -402,6 +406,90 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         is_from_cdn = StaticContentServer.is_cdn_request(browser_request)
         self.assertEqual(is_from_cdn, True)
 
+    def test_disk_cached_asset(self):
+        """
+        Tests that assets are stored in, then served from, the local disk cache.
+        """
+        with override_settings(COURSE_ASSETS_DISK_CACHE={
+            'DIRECTORY': mkdtemp_clean(), 'MAX_SIZE': 1024 * 1024, 'MAX_FILE_SIZE': 1024 * 1024,
+        }):
+            disk_cache = get_asset_disk_cache()
+            contents = []
+            for __ in range(2):
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+                self.assertEqual(resp['Vary'], 'Origin')
+                contents.append(b''.join(resp.streaming_content))
+            self.assertEqual((disk_cache.misses, disk_cache.hits), (1, 1))
+
+            self.assertEqual(contents[0], contents[1])
+            self.assertEqual(len(contents[0]), self.length_unlocked)
+            self.assertEqual(contents[0], AssetManager.find(self.unlocked_asset).data)
+
+            first_byte = self.length_unlocked / 4
+            last_byte = self.length_unlocked / 2
+            resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}'.format(
+                first=first_byte, last=last_byte))
+            self.assertEqual(resp.status_code, 206)
+            self.assertEqual(resp['Content-Length'], str(last_byte - first_byte + 1))
+            self.assertEqual(b''.join(resp.streaming_content), contents[0][first_byte:last_byte + 1])
+
+    def test_disk_cached_locked_asset(self):
+        """
+        Tests that locked assets are still only served to authorized users
+        once they're in the local disk cache.
+        """
+        with override_settings(COURSE_ASSETS_DISK_CACHE={
+            'DIRECTORY': mkdtemp_clean(), 'MAX_SIZE': 1024 * 1024, 'MAX_FILE_SIZE': 1024 * 1024,
+        }):
+            self.client.login(username=self.staff_usr, password='test')
+            self.assertEqual(self.client.get(self.url_locked).status_code, 200)
+            self.client.logout()
+            self.assertEqual(self.client.get(self.url_locked).status_code, 403)
+
+
+class AssetDiskCacheTestCase(unittest.TestCase):
+    """
+    Tests for the AssetDiskCache class.
+    """
+    def setUp(self):
+        super(AssetDiskCacheTestCase, self).setUp()
+        self.disk_cache = AssetDiskCache(mkdtemp_clean(), max_size=1300, max_file_size=500)
+
+    def store(self, data):
+        """Store `data` in the cache, and return its digest."""
+        digest = hashlib.md5(data).hexdigest()
+        asset_file = self.disk_cache.store(digest, [data[:10], data[10:]])
+        self.assertIsNotNone(asset_file)
+        asset_file.close()
+        return digest
+
+    def test_store_and_open(self):
+        digest = self.store(b'a' * 100)
+        asset_file = self.disk_cache.open(digest)
+        self.assertEqual(asset_file.read(), b'a' * 100)
+        asset_file.close()
+        self.assertIsNone(self.disk_cache.open('f' * 32))
+        self.assertEqual((self.disk_cache.hits, self.disk_cache.misses), (1, 1))
+
+    def test_digest_mismatch(self):
+        digest = hashlib.md5(b'expected').hexdigest()
+        self.assertIsNone(self.disk_cache.store(digest, [b'actual']))
+        self.assertIsNone(self.disk_cache.open(digest))
+
+    def test_eviction(self):
+        digests = []
+        for index in range(4):
+            digests.append(self.store(str(index) * 300))
+            # Make sure the files have distinct modification times.
+            os.utime(self.disk_cache.path(digests[-1]), (index, index))
+        os.utime(self.disk_cache.path(digests[0]), (10, 10))
+        digests.append(self.store(b'x' * 300))
+
+        cached = [digest for digest in digests if os.path.exists(self.disk_cache.path(digest))]
+        self.assertEqual(cached, [digests[0], digests[3], digests[4]])
+
 
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
@@ -20,6 +20,9 @@ from .models import CountryAccessRule, RestrictedCourse
 
 log = logging.getLogger(__name__)
 
+# The GeoIP database readers, by the path of their database.
+_geoip_readers = {}
+
 
 def redirect_if_blocked(course_key, access_point='enrollment', **kwargs):
     """Redirect if the user does not have access to the course. In case of blocked if access_point
@@ -170,7 +173,10 @@ def _country_code_from_ip(ip_addr):
         str: A 2-letter country code.
 
     """
-    reader = geoip2.database.Reader(settings.GEOIP_PATH)
+    reader = _geoip_readers.get(settings.GEOIP_PATH)
+    if reader is None:
+        # Opening the database is costly, but a reader can be shared by all requests.
+        reader = _geoip_readers[settings.GEOIP_PATH] = geoip2.database.Reader(settings.GEOIP_PATH)
 
     try:
         response = reader.country(ip_addr)
@@ -178,7 +184,6 @@ def _country_code_from_ip(ip_addr):
         country_code = response.country.iso_code
     except geoip2.errors.AddressNotFoundError:
         country_code = ""
-    reader.close()
     return country_code
 
 
@@ -24,6 +24,7 @@ from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
 from django_countries import countries
 from django_countries.fields import CountryField
+from edx_django_utils.cache import RequestCache
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
 
@@ -447,6 +448,9 @@ class CountryAccessRule(models.Model):
 
     CACHE_KEY = u"embargo.allowed_countries.{course_key}"
 
+    # The access decisions made during a request, by course and country.
+    DECISIONS_CACHE_NAMESPACE = u"embargo.country_access_decisions"
+
     ALL_COUNTRIES = set(code[0] for code in list(countries))
 
     @classmethod
@@ -471,13 +475,17 @@ class CountryAccessRule(models.Model):
         if country not in cls.ALL_COUNTRIES:
             return True
 
-        cache_key = cls.CACHE_KEY.format(course_key=course_id)
-        allowed_countries = cache.get(cache_key)
-        if allowed_countries is None:
-            allowed_countries = cls._get_country_access_list(course_id)
-            cache.set(cache_key, allowed_countries)
+        decisions = RequestCache(cls.DECISIONS_CACHE_NAMESPACE).data
+        decision_key = (unicode(course_id), country)
+        if decision_key not in decisions:
+            cache_key = cls.CACHE_KEY.format(course_key=course_id)
+            allowed_countries = cache.get(cache_key)
+            if allowed_countries is None:
+                allowed_countries = cls._get_country_access_list(course_id)
+                cache.set(cache_key, allowed_countries)
+            decisions[decision_key] = country == '' or country in allowed_countries
 
-        return country == '' or country in allowed_countries
+        return decisions[decision_key]
 
     @classmethod
     def _get_country_access_list(cls, course_id):
@@ -533,6 +541,7 @@ class CountryAccessRule(models.Model):
         """Invalidate the cache. """
         cache_key = cls.CACHE_KEY.format(course_key=course_key)
         cache.delete(cache_key)
+        RequestCache(cls.DECISIONS_CACHE_NAMESPACE).clear()
         log.info(u"Invalidated country access list for course %s", course_key)
 
     class Meta(object):
@@ -695,10 +704,22 @@ class IPFilter(ConfigurationModel):
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        The networks are indexed by IP version and netmask, so that checking
+        whether an address is in the list takes one set lookup per distinct
+        netmask, however many networks the list has.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddress.ip_network(ip) for ip in ips]
+            prefixes = {}
+            for network in self.networks:
+                prefixes.setdefault(
+                    (network.version, int(network.netmask)), set()
+                ).add(int(network.network_address))
+            self._prefixes = {}
+            for (version, netmask), network_addresses in prefixes.iteritems():
+                self._prefixes.setdefault(version, []).append((netmask, frozenset(network_addresses)))
 
         def __iter__(self):
             for network in self.networks:
@@ -710,12 +731,30 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if ip_addr in network:
+            address = int(ip_addr)
+            for netmask, network_addresses in self._prefixes.get(ip_addr.version, ()):
+                if address & netmask in network_addresses:
                     return True
 
             return False
 
+    # The IP filter lists of the current configurations, by their comma-separated addresses,
+    # so that they are only parsed and indexed once per configuration.
+    _ip_filter_lists = {}
+    MAX_CACHED_IP_FILTER_LISTS = 8
+
+    @classmethod
+    def _get_ip_filter_list(cls, ips):
+        """
+        Return the IPFilterList of the given comma-separated IP addresses.
+        """
+        if ips not in cls._ip_filter_lists:
+            ip_filter_list = cls.IPFilterList([addr.strip() for addr in ips.split(',')])
+            if len(cls._ip_filter_lists) >= cls.MAX_CACHED_IP_FILTER_LISTS:
+                cls._ip_filter_lists.clear()
+            cls._ip_filter_lists[ips] = ip_filter_list
+        return cls._ip_filter_lists[ips]
+
     @property
     def whitelist_ips(self):
         """
@@ -723,7 +762,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.whitelist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])
+        return self._get_ip_filter_list(self.whitelist)
 
     @property
     def blacklist_ips(self):
@@ -732,7 +771,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.blacklist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])
+        return self._get_ip_filter_list(self.blacklist)
 
     def __unicode__(self):
         return "Whitelist: {} - Blacklist: {}".format(self.whitelist_ips, self.blacklist_ips)
@@ -2,6 +2,7 @@
 import json
 from django.test import TestCase
 from django.db.utils import IntegrityError
+from mock import patch
 from opaque_keys.edx.locator import CourseLocator
 from ..models import (
     EmbargoedCourse, EmbargoedState, IPFilter, RestrictedCourse,
@@ -105,6 +106,22 @@ class EmbargoModelsTest(CacheIsolationTestCase):
         self.assertIn(u'1.1.1.0', cblacklist)
         self.assertNotIn(u'1.2.0.0', cblacklist)
 
+    def test_ip_mixed_networks_blocking(self):
+        IPFilter(whitelist=u'1.0.0.0/24, 2.2.2.2, 3.0.0.0/8, 2001:db8::/32', blacklist=u'').save()
+
+        cwhitelist = IPFilter.current().whitelist_ips
+        self.assertIn(u'1.0.0.255', cwhitelist)
+        self.assertIn(u'2.2.2.2', cwhitelist)
+        self.assertIn(u'3.200.1.1', cwhitelist)
+        self.assertIn(u'2001:db8::1', cwhitelist)
+        self.assertNotIn(u'2.2.2.3', cwhitelist)
+        self.assertNotIn(u'4.0.0.0', cwhitelist)
+        self.assertNotIn(u'2001:db9::1', cwhitelist)
+        self.assertNotIn(u'not an ip', cwhitelist)
+
+        # The list is only parsed once per configuration
+        self.assertIs(IPFilter.current().whitelist_ips, cwhitelist)
+
 
 class RestrictedCourseTest(CacheIsolationTestCase):
     """Test RestrictedCourse model. """
@@ -246,6 +263,24 @@ class CountryAccessRuleTest(CacheIsolationTestCase):
         with self.assertNumQueries(1):
             CountryAccessRule.check_country_access(course_id, 'NZ')
 
+    def test_country_access_decisions_cached(self):
+        course_id = CourseLocator('abc', '123', 'doremi')
+        restricted_course = RestrictedCourse.objects.create(course_key=course_id)
+        self.assertTrue(CountryAccessRule.check_country_access(course_id, 'NZ'))
+
+        # The decision is reused without looking up the allowed countries again
+        with patch.object(CountryAccessRule, '_get_country_access_list') as mock_get_list:
+            self.assertTrue(CountryAccessRule.check_country_access(course_id, 'NZ'))
+        self.assertFalse(mock_get_list.called)
+
+        # Changing the rules invalidates the decision
+        CountryAccessRule.objects.create(
+            restricted_course=restricted_course,
+            rule_type=CountryAccessRule.BLACKLIST_RULE,
+            country=Country.objects.create(country='NZ')
+        )
+        self.assertFalse(CountryAccessRule.check_country_access(course_id, 'NZ'))
+
 
 class CourseAccessRuleHistoryTest(TestCase):
     """Test course access rule history. """
@@ -0,0 +1,81 @@
+"""Management command for backpopulating learners' materialized program progress."""
+import logging
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand
+from opaque_keys.edx.keys import CourseKey
+
+from entitlements.models import CourseEntitlement
+from openedx.core.djangoapps.catalog.utils import get_programs
+from openedx.core.djangoapps.programs.tasks.v1.tasks import update_program_progress
+from student.models import CourseEnrollment
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class Command(BaseCommand):
+    """Management command for backpopulating learners' materialized program progress.
+
+    The command finds the learners engaged in the programs of each site, and
+    passes them in batches to a Celery task which materializes their progress.
+    """
+    help = 'Backpopulate the materialized program progress of learners engaged in programs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-c', '--commit',
+            action='store_true',
+            dest='commit',
+            default=False,
+            help='Submit tasks for processing.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=100,
+            help='Number of learners whose progress each task materializes.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for site in Site.objects.all():
+            logger.info(u'Loading programs from the catalog for site %s.', site.domain)
+            user_ids = self._load_user_ids(get_programs(site))
+
+            if not options.get('commit'):
+                logger.info(
+                    u'Found %d learners for site %s. To enqueue program progress tasks, pass the -c or --commit flags.',
+                    len(user_ids),
+                    site.domain
+                )
+                continue
+
+            logger.info(u'Enqueuing program progress tasks for %d learners for site %s.', len(user_ids), site.domain)
+            for start in range(0, len(user_ids), batch_size):
+                update_program_progress.delay(user_ids[start:start + batch_size], site.id)
+
+        logger.info(u'Done.')
+
+    def _load_user_ids(self, programs):
+        """Find the learners enrolled in or entitled to any of the courses of the given programs."""
+        course_run_keys, course_uuids = set(), set()
+        for program in programs:
+            for course in program['courses']:
+                course_uuids.add(course['uuid'])
+                for course_run in course['course_runs']:
+                    course_run_keys.add(CourseKey.from_string(course_run['key']))
+
+        user_ids = set()
+        if course_run_keys:
+            user_ids.update(CourseEnrollment.objects.filter(
+                course_id__in=course_run_keys,
+                is_active=True,
+            ).values_list('user_id', flat=True).distinct())
+        if course_uuids:
+            user_ids.update(CourseEntitlement.objects.filter(
+                course_uuid__in=course_uuids,
+            ).values_list('user_id', flat=True).distinct())
+
+        return sorted(user_ids)
@@ -1,8 +1,12 @@
 """Models providing Programs support for the LMS and Studio."""
 
 from config_models.models import ConfigurationModel
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
+from jsonfield.fields import JSONField
+from model_utils.models import TimeStampedModel
 
 
 class ProgramsApiConfig(ConfigurationModel):
@@ -23,3 +27,26 @@ class ProgramsApiConfig(ConfigurationModel):
             'Path used to construct URLs to programs marketing pages (e.g., "/foo").'
         )
     )
+
+
+class ProgramProgress(TimeStampedModel):
+    """
+    A learner's progress towards completing the programs of a site they're
+    engaged in, as last computed by ProgramProgressMeter.
+
+    .. no_pii:
+    """
+    class Meta(object):
+        app_label = "programs"
+        unique_together = ('user', 'site')
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    site = models.ForeignKey(Site, on_delete=models.CASCADE)
+    progress = JSONField(
+        default=list,
+        help_text=_('Progress towards each engaged program, ordered by most recent enrollment.'),
+    )
+    expires = models.DateTimeField(
+        db_index=True,
+        help_text=_('Time after which the progress must be computed again.'),
+    )
@@ -3,10 +3,15 @@ This module contains signals / handlers related to programs.
 """
 import logging
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from openedx.core.djangoapps.programs.models import ProgramProgress, ProgramsApiConfig
 from openedx.core.djangoapps.signals.signals import COURSE_CERT_AWARDED, COURSE_CERT_CHANGED
 from openedx.core.djangoapps.site_configuration import helpers
+from student.signals import ENROLL_STATUS_CHANGE, ENROLLMENT_TRACK_UPDATED
 
 LOGGER = logging.getLogger(__name__)
 
@@ -129,3 +134,44 @@ def handle_course_cert_changed(sender, user, course_key, mode, status, **kwargs)
     # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
     from openedx.core.djangoapps.programs.tasks.v1.tasks import award_course_certificate
     award_course_certificate.delay(user.username, str(course_key))
+
+
+@receiver(COURSE_CERT_CHANGED)
+@receiver(ENROLL_STATUS_CHANGE)
+@receiver(ENROLLMENT_TRACK_UPDATED)
+def handle_program_progress_changed(sender, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    When a learner's certificates or enrollments change, schedule a celery
+    task to update their materialized progress towards programs, once the
+    change is committed.
+    """
+    _schedule_program_progress_update(user.id)
+
+
+@receiver(post_save, sender='entitlements.CourseEntitlement')
+@receiver(post_delete, sender='entitlements.CourseEntitlement')
+def handle_course_entitlement_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    When a learner's entitlements change, schedule a celery task to update
+    their materialized progress towards programs, once the change is committed.
+    """
+    _schedule_program_progress_update(instance.user_id)
+
+
+def _schedule_program_progress_update(user_id):
+    """
+    Schedules the update of the given user's materialized program progress,
+    if they have any.
+    """
+    # Program progress is only materialized by the LMS.
+    if settings.ROOT_URLCONF != 'lms.urls':
+        return
+
+    # The task only updates the progress that was already materialized, when
+    # the user first viewed their programs.
+    if not ProgramsApiConfig.current().enabled or not ProgramProgress.objects.filter(user_id=user_id).exists():
+        return
+
+    # import here, because signal is registered at startup, but items in tasks are not yet able to be loaded
+    from openedx.core.djangoapps.programs.tasks.v1.tasks import update_program_progress
+    transaction.on_commit(lambda: update_program_progress.delay([user_id]))
@@ -17,7 +17,8 @@ from openedx.core.djangoapps.content.course_overviews.models import CourseOvervi
 from openedx.core.djangoapps.credentials.models import CredentialsApiConfig
 from openedx.core.djangoapps.credentials.utils import get_credentials, get_credentials_api_client
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
-from openedx.core.djangoapps.programs.utils import ProgramProgressMeter
+from openedx.core.djangoapps.programs.models import ProgramProgress
+from openedx.core.djangoapps.programs.utils import ProgramProgressMeter, materialize_program_progress
 
 LOGGER = get_task_logger(__name__)
 # Under cms the following setting is not defined, leading to errors during tests.
@@ -327,3 +328,35 @@ def award_course_certificate(self, username, course_run_key):
     except Exception as exc:
         LOGGER.exception(u'Failed to determine course certificates to be awarded for user %s', username)
         raise self.retry(exc=exc, countdown=countdown, max_retries=MAX_RETRIES)
+
+
+@task(ignore_result=True, routing_key=PROGRAM_CERTIFICATES_ROUTING_KEY)
+def update_program_progress(user_ids, site_id=None):
+    """
+    This task is designed to be called whenever the certificates, enrollments
+    or entitlements of a student change, to update their materialized progress
+    towards the programs of every site it was materialized for.
+
+    It may also be given a site, to materialize the progress of the students
+    for that site - for example, to backpopulate it.
+
+    Args:
+        user_ids (list): The ids of the students
+        site_id (int): The id of the site to materialize progress for, if any
+
+    Returns:
+        None
+
+    """
+    if site_id is None:
+        program_progress = ProgramProgress.objects.filter(user_id__in=user_ids).select_related('user', 'site')
+        sites_and_users = [(progress.site, progress.user) for progress in program_progress]
+    else:
+        site = Site.objects.get(id=site_id)
+        sites_and_users = [(site, user) for user in User.objects.filter(id__in=user_ids)]
+
+    for site, user in sites_and_users:
+        try:
+            materialize_program_progress(site, user)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception(u'Failed to update program progress for user %s on site %s', user.username, site.domain)
@@ -21,6 +21,7 @@ from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
 from openedx.core.djangoapps.certificates.config import waffle
 from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
 from openedx.core.djangoapps.credentials.tests.mixins import CredentialsApiConfigMixin
+from openedx.core.djangoapps.programs.models import ProgramProgress
 from openedx.core.djangoapps.programs.tasks.v1 import tasks
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteFactory, SiteConfigurationFactory
 from openedx.core.djangolib.testing.utils import skip_unless_lms
@@ -586,3 +587,67 @@ class AwardCourseCertificatesTestCase(CredentialsApiConfigMixin, TestCase):
 
         tasks.award_course_certificate.delay(self.student.username, str(self.certificate.course_id)).get()
         self.assertFalse(mock_post_course_certificate.called)
+
+
+@skip_unless_lms
+@mock.patch('openedx.core.djangoapps.programs.utils.ProgramProgressMeter')
+class UpdateProgramProgressTestCase(TestCase):
+    """
+    Test the update_program_progress celery task.
+    """
+    PROGRESS = [{'uuid': 'test-program', 'completed': 1, 'in_progress': 0, 'not_started': 1}]
+
+    def setUp(self):
+        super(UpdateProgramProgressTestCase, self).setUp()
+        self.user = UserFactory.create()
+        self.site = SiteFactory.create()
+
+    def _configure_meter(self, mock_meter):
+        """
+        DRY helper.
+        """
+        mock_meter.return_value.progress.return_value = self.PROGRESS
+        mock_meter.return_value.next_upgrade_deadline.return_value = None
+
+    def test_updates_materialized_progress(self, mock_meter):
+        self._configure_meter(mock_meter)
+        ProgramProgress.objects.create(
+            user=self.user,
+            site=self.site,
+            progress=[],
+            expires=datetime.now(pytz.UTC) - timedelta(days=1),
+        )
+
+        tasks.update_program_progress([self.user.id])
+
+        mock_meter.assert_called_once_with(self.site, self.user)
+        program_progress = ProgramProgress.objects.get(user=self.user)
+        self.assertEqual(program_progress.site, self.site)
+        self.assertEqual(program_progress.progress, self.PROGRESS)
+        self.assertGreater(program_progress.expires, datetime.now(pytz.UTC))
+
+    def test_progress_not_materialized(self, mock_meter):
+        self._configure_meter(mock_meter)
+
+        tasks.update_program_progress([self.user.id])
+
+        mock_meter.assert_not_called()
+        self.assertFalse(ProgramProgress.objects.filter(user=self.user).exists())
+
+    def test_materializes_progress_for_site(self, mock_meter):
+        self._configure_meter(mock_meter)
+
+        tasks.update_program_progress([self.user.id], self.site.id)
+
+        program_progress = ProgramProgress.objects.get(user=self.user, site=self.site)
+        self.assertEqual(program_progress.progress, self.PROGRESS)
+
+    def test_failures_logged(self, mock_meter):
+        mock_meter.side_effect = Exception('boom')
+        other_user = UserFactory.create()
+
+        with mock.patch(TASKS_MODULE + '.LOGGER.exception') as mock_exception:
+            tasks.update_program_progress([self.user.id, other_user.id], self.site.id)
+
+        self.assertEqual(mock_exception.call_count, 2)
+        self.assertFalse(ProgramProgress.objects.exists())
@@ -0,0 +1,69 @@
+"""Tests for the backpopulate_program_progress management command."""
+import mock
+from django.contrib.sites.models import Site
+from django.core.management import call_command
+from django.test import TestCase
+
+from entitlements.tests.factories import CourseEntitlementFactory
+from openedx.core.djangoapps.catalog.tests.factories import (
+    generate_course_run_key,
+    ProgramFactory,
+    CourseFactory,
+    CourseRunFactory,
+)
+from openedx.core.djangolib.testing.utils import skip_unless_lms
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+
+COMMAND_MODULE = 'openedx.core.djangoapps.programs.management.commands.backpopulate_program_progress'
+
+
+@mock.patch(COMMAND_MODULE + '.get_programs')
+@mock.patch(COMMAND_MODULE + '.update_program_progress.delay')
+@skip_unless_lms
+class BackpopulateProgramProgressTests(TestCase):
+    """Tests for the backpopulate_program_progress management command."""
+
+    def setUp(self):
+        super(BackpopulateProgramProgressTests, self).setUp()
+
+        self.course_run_key = generate_course_run_key()
+        self.course = CourseFactory(course_runs=[CourseRunFactory(key=self.course_run_key)])
+        self.site = Site.objects.get()
+
+        self.alice = UserFactory()
+        self.bob = UserFactory()
+        self.carol = UserFactory()
+        CourseEnrollmentFactory(user=self.alice, course_id=self.course_run_key)
+        CourseEntitlementFactory(user=self.bob, course_uuid=self.course['uuid'])
+        CourseEnrollmentFactory(user=self.carol, course_id=generate_course_run_key())
+
+    def test_dry_run(self, mock_task, mock_get_programs):
+        mock_get_programs.return_value = [ProgramFactory(courses=[self.course])]
+
+        call_command('backpopulate_program_progress')
+
+        mock_task.assert_not_called()
+
+    def test_engaged_learners_enqueued(self, mock_task, mock_get_programs):
+        mock_get_programs.return_value = [ProgramFactory(courses=[self.course])]
+
+        call_command('backpopulate_program_progress', commit=True)
+
+        mock_task.assert_called_once_with(sorted([self.alice.id, self.bob.id]), self.site.id)
+
+    def test_batches(self, mock_task, mock_get_programs):
+        mock_get_programs.return_value = [ProgramFactory(courses=[self.course])]
+
+        call_command('backpopulate_program_progress', commit=True, batch_size=1)
+
+        mock_task.assert_has_calls([
+            mock.call([self.alice.id], self.site.id),
+            mock.call([self.bob.id], self.site.id),
+        ])
+
+    def test_no_programs(self, mock_task, mock_get_programs):
+        mock_get_programs.return_value = []
+
+        call_command('backpopulate_program_progress', commit=True)
+
+        mock_task.assert_not_called()
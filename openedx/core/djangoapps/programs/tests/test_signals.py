@@ -2,14 +2,22 @@
 This module contains tests for programs-related signals and signal handlers.
 """
 
+from datetime import datetime
+
+from django.contrib.sites.models import Site
 from django.test import TestCase
 import mock
+import pytz
 
+from entitlements.tests.factories import CourseEntitlementFactory
 from opaque_keys.edx.keys import CourseKey
+from student.signals import ENROLL_STATUS_CHANGE
 from student.tests.factories import UserFactory
 
 from openedx.core.djangoapps.signals.signals import COURSE_CERT_AWARDED, COURSE_CERT_CHANGED
+from openedx.core.djangoapps.programs.models import ProgramProgress
 from openedx.core.djangoapps.programs.signals import handle_course_cert_awarded, handle_course_cert_changed
+from openedx.core.djangoapps.programs.tests.mixins import ProgramsApiConfigMixin
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteConfigurationFactory
 from openedx.core.djangolib.testing.utils import skip_unless_lms
 
@@ -159,3 +167,66 @@ class CertChangedReceiverTest(TestCase):
         site_config.save()
         handle_course_cert_changed(**self.signal_kwargs)
         self.assertFalse(mock_task.called)
+
+
+@skip_unless_lms
+@mock.patch('openedx.core.djangoapps.programs.tasks.v1.tasks.update_program_progress.delay')
+@mock.patch('openedx.core.djangoapps.programs.signals.transaction.on_commit', side_effect=lambda func: func())
+class ProgramProgressChangedReceiverTest(ProgramsApiConfigMixin, TestCase):
+    """
+    Tests for the signal handlers which update materialized program progress.
+    """
+    def setUp(self):
+        super(ProgramProgressChangedReceiverTest, self).setUp()
+        self.create_programs_config()
+        self.user = UserFactory.create(username=TEST_USERNAME)
+
+    def _materialize_progress(self):
+        """
+        DRY helper.
+        """
+        ProgramProgress.objects.create(
+            user=self.user,
+            site=Site.objects.get(),
+            expires=datetime.now(pytz.UTC),
+        )
+
+    def test_enrollment_changed(self, mock_on_commit, mock_task):  # pylint: disable=unused-argument
+        self._materialize_progress()
+
+        ENROLL_STATUS_CHANGE.send(sender=None, user=self.user, course_id=TEST_COURSE_KEY)
+
+        mock_task.assert_called_once_with([self.user.id])
+
+    def test_cert_changed(self, mock_on_commit, mock_task):  # pylint: disable=unused-argument
+        self._materialize_progress()
+
+        COURSE_CERT_CHANGED.send(
+            sender=self.__class__,
+            user=self.user,
+            course_key=TEST_COURSE_KEY,
+            mode='verified',
+            status='downloadable',
+        )
+
+        mock_task.assert_any_call([self.user.id])
+
+    def test_entitlement_changed(self, mock_on_commit, mock_task):  # pylint: disable=unused-argument
+        self._materialize_progress()
+
+        CourseEntitlementFactory.create(user=self.user)
+
+        mock_task.assert_called_with([self.user.id])
+
+    def test_progress_not_materialized(self, mock_on_commit, mock_task):  # pylint: disable=unused-argument
+        ENROLL_STATUS_CHANGE.send(sender=None, user=self.user, course_id=TEST_COURSE_KEY)
+
+        mock_task.assert_not_called()
+
+    def test_programs_disabled(self, mock_on_commit, mock_task):  # pylint: disable=unused-argument
+        self._materialize_progress()
+        self.create_programs_config(enabled=False)
+
+        ENROLL_STATUS_CHANGE.send(sender=None, user=self.user, course_id=TEST_COURSE_KEY)
+
+        mock_task.assert_not_called()
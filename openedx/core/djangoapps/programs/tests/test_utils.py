@@ -31,6 +31,7 @@ from openedx.core.djangoapps.catalog.tests.factories import (
     generate_course_run_key
 )
 from openedx.core.djangoapps.programs import ALWAYS_CALCULATE_PROGRAM_PRICE_AS_ANONYMOUS_USER
+from openedx.core.djangoapps.programs.models import ProgramProgress
 from openedx.core.djangoapps.programs.tests.factories import ProgressFactory
 from openedx.core.djangoapps.programs.utils import (
     DEFAULT_ENROLLMENT_START_DATE,
@@ -38,7 +39,9 @@ from openedx.core.djangoapps.programs.utils import (
     ProgramMarketingDataExtender,
     ProgramProgressMeter,
     get_certificates,
-    get_logged_in_program_certificate_url
+    get_engaged_programs_with_progress,
+    get_logged_in_program_certificate_url,
+    materialize_program_progress
 )
 from openedx.core.djangoapps.site_configuration.tests.factories import SiteFactory
 from openedx.core.djangolib.testing.utils import skip_unless_lms
@@ -802,6 +805,72 @@ def _create_course(self, course_price, course_run_count=1, make_entitlement=Fals
     return CourseFactory(course_runs=course_runs, entitlements=entitlements)
 
 
+@skip_unless_lms
+@mock.patch(UTILS_MODULE + '.get_programs')
+class TestMaterializedProgramProgress(TestCase):
+    """Tests of the materialized program progress."""
+
+    def setUp(self):
+        super(TestMaterializedProgramProgress, self).setUp()
+
+        self.user = UserFactory()
+        self.site = SiteFactory()
+        self.course_run_key = generate_course_run_key()
+
+    def _create_program(self, mock_get_programs, upgrade_deadline=None):
+        """Create a program containing the course run, whose verified seat has the given upgrade deadline."""
+        seats = [
+            SeatFactory(type=CourseMode.VERIFIED, upgrade_deadline=upgrade_deadline),
+            SeatFactory(type=CourseMode.AUDIT),
+        ]
+        program = ProgramFactory(
+            courses=[
+                CourseFactory(course_runs=[
+                    CourseRunFactory(key=self.course_run_key, type=CourseMode.VERIFIED, seats=seats),
+                ]),
+            ]
+        )
+        mock_get_programs.return_value = [program]
+        return program
+
+    def test_progress_materialized(self, mock_get_programs):
+        """Verify that progress is computed once, and then read from the user's materialized progress."""
+        program = self._create_program(mock_get_programs)
+        CourseEnrollmentFactory(user=self.user, course_id=self.course_run_key, mode=CourseMode.VERIFIED)
+        expected_progress = ProgramProgressMeter(self.site, self.user).progress()
+
+        programs, progress = get_engaged_programs_with_progress(self.site, self.user)
+        self.assertEqual([engaged_program['uuid'] for engaged_program in programs], [program['uuid']])
+        self.assertEqual(progress, expected_progress)
+
+        with mock.patch(UTILS_MODULE + '.ProgramProgressMeter') as mock_meter:
+            self.assertEqual(get_engaged_programs_with_progress(self.site, self.user)[1], expected_progress)
+        self.assertFalse(mock_meter.called)
+
+    def test_expired_progress_computed(self, mock_get_programs):
+        """Verify that expired progress is computed again."""
+        self._create_program(mock_get_programs)
+        program_progress = materialize_program_progress(self.site, self.user)
+        self.assertEqual(program_progress.progress, [])
+
+        CourseEnrollmentFactory(user=self.user, course_id=self.course_run_key, mode=CourseMode.VERIFIED)
+        self.assertEqual(get_engaged_programs_with_progress(self.site, self.user), ([], []))
+
+        ProgramProgress.objects.filter(pk=program_progress.pk).update(
+            expires=datetime.datetime.now(utc) - datetime.timedelta(seconds=1)
+        )
+        self.assertEqual(len(get_engaged_programs_with_progress(self.site, self.user)[1]), 1)
+
+    def test_progress_expires_at_upgrade_deadline(self, mock_get_programs):
+        """Verify that progress expires when a course may stop being in progress."""
+        upgrade_deadline = datetime.datetime.now(utc) + datetime.timedelta(hours=2)
+        self._create_program(mock_get_programs, upgrade_deadline=str(upgrade_deadline))
+        CourseEnrollmentFactory(user=self.user, course_id=self.course_run_key, mode=CourseMode.AUDIT)
+
+        program_progress = materialize_program_progress(self.site, self.user)
+        self.assertEqual(program_progress.expires, upgrade_deadline)
+
+
 @ddt.ddt
 @override_settings(ECOMMERCE_PUBLIC_URL_ROOT=ECOMMERCE_URL_ROOT)
 @skip_unless_lms
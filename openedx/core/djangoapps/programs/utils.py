@@ -31,6 +31,7 @@ from openedx.core.djangoapps.commerce.utils import ecommerce_api_client
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.credentials.utils import get_credentials
 from openedx.core.djangoapps.programs import ALWAYS_CALCULATE_PROGRAM_PRICE_AS_ANONYMOUS_USER
+from openedx.core.djangoapps.programs.models import ProgramProgress
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from student.models import CourseEnrollment
 from util.date_utils import strftime_localized
@@ -39,6 +40,10 @@ from xmodule.modulestore.django import modulestore
 # The datetime module's strftime() methods require a year >= 1900.
 DEFAULT_ENROLLMENT_START_DATE = datetime.datetime(1900, 1, 1, tzinfo=utc)
 
+# How long a learner's materialized program progress is used before it's computed again,
+# to pick up changes to the programs and grades, which don't update it.
+PROGRAM_PROGRESS_MAX_AGE = datetime.timedelta(days=1)
+
 log = logging.getLogger(__name__)
 
 
@@ -209,6 +214,35 @@ class ProgramProgressMeter(object):
         # An upgrade deadline of None means the course is always upgradeable.
         return any(not deadline or deadline and parse(deadline) > now for deadline in upgrade_deadlines)
 
+    def next_upgrade_deadline(self, now, programs=None):
+        """Find the next deadline at which a course may stop being in progress.
+
+        This is the earliest upgrade deadline after now of the seats required for
+        completion of the enrolled runs of the given programs, whose mode doesn't
+        match the enrollment's.
+
+        Keyword Arguments:
+            programs (list): Specific list of programs to check. If left unspecified,
+                self.engaged_programs will be used.
+
+        Returns:
+            datetime, or None if there is no such deadline.
+        """
+        deadlines = []
+        for program in programs or self.engaged_programs:
+            for course in program['courses']:
+                for run in course['course_runs']:
+                    enrolled_mode = self.enrolled_run_modes.get(run['key'])
+                    if enrolled_mode is None or run['type'] == enrolled_mode:
+                        continue
+                    for seat in run['seats']:
+                        if seat['type'] == run['type'] and seat['upgrade_deadline']:
+                            deadline = parse(seat['upgrade_deadline'])
+                            if deadline > now:
+                                deadlines.append(deadline)
+
+        return min(deadlines) if deadlines else None
+
     def progress(self, programs=None, count_only=True):
         """Gauge a user's progress towards program completion.
 
@@ -453,6 +487,66 @@ class ProgramProgressMeter(object):
         return any(course_run['key'] in self.course_run_ids for course_run in course['course_runs'])
 
 
+def materialize_program_progress(site, user):
+    """Compute a user's progress towards the programs they're engaged in, and store it.
+
+    Arguments:
+        site (Site): The site whose programs to inspect.
+        user (User): The user whose progress to compute.
+
+    Returns:
+        ProgramProgress
+    """
+    now = datetime.datetime.now(utc)
+    meter = ProgramProgressMeter(site, user)
+    expires = now + PROGRAM_PROGRESS_MAX_AGE
+    next_upgrade_deadline = meter.next_upgrade_deadline(now)
+    if next_upgrade_deadline:
+        expires = min(expires, next_upgrade_deadline)
+
+    program_progress, __ = ProgramProgress.objects.update_or_create(
+        user=user,
+        site=site,
+        defaults={'progress': meter.progress(), 'expires': expires},
+    )
+    return program_progress
+
+
+def get_engaged_programs_with_progress(site, user, mobile_only=False):
+    """Read the programs a user is engaged in and their progress towards each.
+
+    These are the same as ProgramProgressMeter's engaged_programs and progress(), but
+    the progress is read from the user's materialized progress, which is only computed
+    if it's missing or has expired.
+
+    Arguments:
+        site (Site): The site whose programs to inspect.
+        user (User): The user whose progress to read.
+
+    Keyword Arguments:
+        mobile_only (bool): Whether to link to the mobile program details.
+
+    Returns:
+        tuple of (list of program dicts, list of progress dicts), ordered by
+            most recent enrollment
+    """
+    now = datetime.datetime.now(utc)
+    program_progress = ProgramProgress.objects.filter(user=user, site=site, expires__gt=now).first()
+    if program_progress is None:
+        program_progress = materialize_program_progress(site, user)
+
+    programs_by_uuid = {program['uuid']: program for program in get_programs(site)}
+    progress = [
+        program_progress_data for program_progress_data in program_progress.progress
+        if program_progress_data['uuid'] in programs_by_uuid
+    ]
+    programs = attach_program_detail_url(
+        [programs_by_uuid[program_progress_data['uuid']] for program_progress_data in progress],
+        mobile_only,
+    )
+    return programs, progress
+
+
 # pylint: disable=missing-docstring
 class ProgramDataExtender(object):
     """
@@ -5,14 +5,23 @@ import collections
 from logging import getLogger
 
 from django.contrib.sites.models import Site
-from django.db import models
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from edx_django_utils.cache import RequestCache
 from jsonfield.fields import JSONField
 from model_utils.models import TimeStampedModel
 
 logger = getLogger(__name__)  # pylint: disable=invalid-name
 
+# The index of the orgs in the course_org_filter of the enabled site configurations is
+# cached in the django cache, and for the duration of a request along with the
+# configurations it's been used to look up, until a site configuration changes.
+ORG_INDEX_CACHE_KEY = u'site_configuration.org_index'
+ORG_INDEX_CACHE_TIMEOUT = 60 * 60
+ORG_INDEX_CACHE_NAMESPACE = u'site_configuration.org_index'
+
 
 class SiteConfiguration(models.Model):
     """
@@ -62,6 +71,17 @@ class SiteConfiguration(models.Model):
 
         return default
 
+    def get_course_org_filter(self):
+        """
+        Returns the list of the orgs in this configuration's course_org_filter.
+        """
+        course_org_filter = self.get_value('course_org_filter', [])
+        # The value of 'course_org_filter' can be configured as a string representing
+        # a single organization or a list of strings representing multiple organizations.
+        if not isinstance(course_org_filter, list):
+            course_org_filter = [course_org_filter]
+        return course_org_filter
+
     @classmethod
     def get_configuration_for_org(cls, org, select_related=None):
         """
@@ -72,18 +92,53 @@ class SiteConfiguration(models.Model):
             org (str): Org to use to filter SiteConfigurations
             select_related (list or None): A list of values to pass as arguments to select_related
         """
-        query = cls.objects.filter(values__contains=org, enabled=True).all()
+        request_cache = RequestCache(ORG_INDEX_CACHE_NAMESPACE).data
+        cache_key = (u'configuration', org)
+        if cache_key not in request_cache:
+            configuration = cls._get_indexed_configuration(org, select_related)
+            if configuration is None and org in cls._get_org_index():
+                # The index is out of date: rebuild it and look again.
+                invalidate_org_index()
+                configuration = cls._get_indexed_configuration(org, select_related)
+            request_cache = RequestCache(ORG_INDEX_CACHE_NAMESPACE).data
+            request_cache[cache_key] = configuration
+        return request_cache[cache_key]
+
+    @classmethod
+    def _get_indexed_configuration(cls, org, select_related):
+        """
+        Returns the enabled SiteConfiguration with an org_filter that matches the
+        supplied org, as found in the index of orgs, or None if there is none.
+        """
+        configuration_id = cls._get_org_index().get(org)
+        if configuration_id is None:
+            return None
+        query = cls.objects.filter(id=configuration_id, enabled=True)
         if select_related is not None:
             query = query.select_related(*select_related)
-        for configuration in query:
-            course_org_filter = configuration.get_value('course_org_filter', [])
-            # The value of 'course_org_filter' can be configured as a string representing
-            # a single organization or a list of strings representing multiple organizations.
-            if not isinstance(course_org_filter, list):
-                course_org_filter = [course_org_filter]
-            if org in course_org_filter:
-                return configuration
-        return None
+        configuration = query.first()
+        if configuration is None or org not in configuration.get_course_org_filter():
+            return None
+        return configuration
+
+    @classmethod
+    def _get_org_index(cls):
+        """
+        Returns a dict mapping each org in the course_org_filter of an enabled site
+        configuration to the id of the first such configuration.
+        """
+        request_cache = RequestCache(ORG_INDEX_CACHE_NAMESPACE).data
+        if ORG_INDEX_CACHE_KEY not in request_cache:
+            org_index = cache.get(ORG_INDEX_CACHE_KEY)
+            if org_index is None:
+                org_index = {}
+                query = cls.objects.filter(values__contains='course_org_filter', enabled=True).order_by('id')
+                for configuration in query:
+                    for org in configuration.get_course_org_filter():
+                        org_index.setdefault(org, configuration.id)
+                cache.set(ORG_INDEX_CACHE_KEY, org_index, ORG_INDEX_CACHE_TIMEOUT)
+            request_cache[ORG_INDEX_CACHE_KEY] = org_index
+        return request_cache[ORG_INDEX_CACHE_KEY]
 
     @classmethod
     def get_value_for_org(cls, org, name, default=None):
@@ -114,14 +169,7 @@ class SiteConfiguration(models.Model):
         Returns:
             A list of all organizations present in site configuration.
         """
-        org_filter_set = set()
-
-        for configuration in cls.objects.filter(values__contains='course_org_filter', enabled=True).all():
-            course_org_filter = configuration.get_value('course_org_filter', [])
-            if not isinstance(course_org_filter, list):
-                course_org_filter = [course_org_filter]
-            org_filter_set.update(course_org_filter)
-        return org_filter_set
+        return set(cls._get_org_index())
 
     @classmethod
     def has_org(cls, org):
@@ -131,7 +179,7 @@ class SiteConfiguration(models.Model):
         Returns:
             True if given organization is present in site configurations otherwise False.
         """
-        return org in cls.get_all_orgs()
+        return org in cls._get_org_index()
 
 
 class SiteConfigurationHistory(TimeStampedModel):
@@ -183,3 +231,24 @@ def update_site_configuration_history(sender, instance, **kwargs):  # pylint: di
         values=instance.values,
         enabled=instance.enabled,
     )
+
+
+def invalidate_org_index():
+    """
+    Forgets the cached index of the orgs of the site configurations, and the
+    configurations looked up with it during the current request.
+    """
+    cache.delete(ORG_INDEX_CACHE_KEY)
+    RequestCache(ORG_INDEX_CACHE_NAMESPACE).clear()
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def _invalidate_org_index(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the index of the orgs of the site configurations when one of
+    them changes, and again once the change is committed, so that other
+    processes can't cache an index that is about to change.
+    """
+    invalidate_org_index()
+    transaction.on_commit(lambda: cache.delete(ORG_INDEX_CACHE_KEY))
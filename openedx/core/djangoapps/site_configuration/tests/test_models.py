@@ -345,3 +345,38 @@ class SiteConfigurationTests(TestCase):
             list(SiteConfiguration.get_all_orgs()),
             expected_orgs,
         )
+
+    def test_org_index_cached(self):
+        """
+        Test that the orgs of the site configurations are only queried once, until a site configuration changes.
+        """
+        config1 = SiteConfigurationFactory.create(
+            site=self.site,
+            values=self.test_config1,
+        )
+        SiteConfigurationFactory.create(
+            site=self.site2,
+            values=self.test_config2,
+        )
+
+        self.assertTrue(SiteConfiguration.has_org(self.test_config1['course_org_filter']))
+        with self.assertNumQueries(0):
+            self.assertTrue(SiteConfiguration.has_org(self.test_config2['course_org_filter']))
+            self.assertFalse(SiteConfiguration.has_org('something else'))
+            self.assertEqual(
+                SiteConfiguration.get_all_orgs(),
+                {self.test_config1['course_org_filter'], self.test_config2['course_org_filter']},
+            )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(SiteConfiguration.get_configuration_for_org(self.test_config1['course_org_filter']), config1)
+            self.assertEqual(SiteConfiguration.get_configuration_for_org(self.test_config1['course_org_filter']), config1)
+
+        config1.values = dict(self.test_config1, course_org_filter=['TestX', 'NewX'])
+        config1.save()
+        self.assertTrue(SiteConfiguration.has_org('NewX'))
+        self.assertEqual(SiteConfiguration.get_configuration_for_org('NewX'), config1)
+
+        config1.delete()
+        self.assertFalse(SiteConfiguration.has_org('NewX'))
+        self.assertIsNone(SiteConfiguration.get_configuration_for_org('NewX'))
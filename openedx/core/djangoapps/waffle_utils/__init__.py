@@ -67,10 +67,11 @@ from contextlib import contextmanager
 
 import six
 from opaque_keys.edx.keys import CourseKey
-from waffle import flag_is_active, switch_is_active
 
 from openedx.core.lib.cache_utils import get_cache as get_request_cache
 
+from .snapshot import get_waffle_snapshot
+
 log = logging.getLogger(__name__)
 
 
@@ -133,7 +134,7 @@ class WaffleSwitchNamespace(WaffleNamespace):
         namespaced_switch_name = self._namespaced_name(switch_name)
         value = self._cached_switches.get(namespaced_switch_name)
         if value is None:
-            value = switch_is_active(namespaced_switch_name)
+            value = get_waffle_snapshot().switch_is_active(namespaced_switch_name)
             self._cached_switches[namespaced_switch_name] = value
         return value
 
@@ -256,9 +257,6 @@ class WaffleFlagNamespace(WaffleNamespace):
                 returned if the waffle flag is to be checked, but doesn't exist.
                 See docs for alternatives.
         """
-        # Import is placed here to avoid model import at project startup.
-        from waffle.models import Flag
-
         # validate arguments
         namespaced_flag_name = self._namespaced_name(flag_name)
         value = None
@@ -270,18 +268,17 @@ class WaffleFlagNamespace(WaffleNamespace):
             # The callback needs to handle its own caching if it wants it.
             value = self._cached_flags.get(namespaced_flag_name)
             if value is None:
+                snapshot = get_waffle_snapshot()
 
                 if flag_undefined_default is not None:
                     # determine if the flag is undefined in waffle
-                    try:
-                        Flag.objects.get(name=namespaced_flag_name)
-                    except Flag.DoesNotExist:
+                    if not snapshot.flag_exists(namespaced_flag_name):
                         value = flag_undefined_default
 
                 if value is None:
                     request = crum.get_current_request()
                     if request:
-                        value = flag_is_active(request, namespaced_flag_name)
+                        value = snapshot.flag_is_active(request, namespaced_flag_name)
                     else:
                         log.warn(u"%sFlag '%s' accessed without a request", self.log_prefix, namespaced_flag_name)
                         # Return the default value if not in a request context.
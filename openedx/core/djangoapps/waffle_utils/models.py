@@ -2,14 +2,19 @@
 Models for configuring waffle utils.
 """
 from django.db.models import CharField
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from model_utils import Choices
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
+from waffle.models import Flag, Switch
 
 from config_models.models import ConfigurationModel
 from openedx.core.lib.cache_utils import request_cached
 
+from .snapshot import get_waffle_snapshot, invalidate_waffle_snapshot
+
 
 class WaffleFlagCourseOverrideModel(ConfigurationModel):
     """
@@ -48,9 +53,9 @@ class WaffleFlagCourseOverrideModel(ConfigurationModel):
         if not course_id or not waffle_flag:
             return cls.ALL_CHOICES.unset
 
-        effective = cls.objects.filter(waffle_flag=waffle_flag, course_id=course_id).order_by('-change_date').first()
-        if effective and effective.enabled:
-            return effective.override_choice
+        override_choice = get_waffle_snapshot().course_override(waffle_flag, course_id)
+        if override_choice is not None:
+            return override_choice
         return cls.ALL_CHOICES.unset
 
     class Meta(object):
@@ -61,3 +66,16 @@ class WaffleFlagCourseOverrideModel(ConfigurationModel):
     def __unicode__(self):
         enabled_label = "Enabled" if self.enabled else "Not Enabled"
         return u"Course '{}': Persistent Grades {}".format(text_type(self.course_id), enabled_label)
+
+
+@receiver(post_save, sender=Switch)
+@receiver(post_delete, sender=Switch)
+@receiver(post_save, sender=Flag)
+@receiver(post_delete, sender=Flag)
+@receiver(post_save, sender=WaffleFlagCourseOverrideModel)
+@receiver(post_delete, sender=WaffleFlagCourseOverrideModel)
+def _invalidate_waffle_snapshot(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Reloads the snapshot of the waffle tables when any of them changes.
+    """
+    invalidate_waffle_snapshot()
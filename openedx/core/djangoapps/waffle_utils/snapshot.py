@@ -0,0 +1,144 @@
+"""
+A process-wide snapshot of the waffle switches, flags and course overrides.
+
+Each table is loaded whole, the first time it's needed, and kept in process
+memory for as long as its version, in the shared cache, doesn't change.  Any
+change to the tables deletes the version, so every process reloads its
+snapshot the next time it's checked.  The version is only checked once per
+request, so that in the steady state, checking switches and flags doesn't
+query the database at all.
+"""
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from lazy import lazy
+from waffle import flag_is_active
+from waffle.utils import get_setting
+
+from openedx.core.lib.cache_utils import get_cache as get_request_cache
+
+SNAPSHOT_VERSION_CACHE_KEY = u'waffle_utils.snapshot.version'
+
+_snapshot = None
+
+
+class WaffleSnapshot(object):
+    """
+    The contents of the waffle tables as of a given version.
+    """
+    def __init__(self, version):
+        self.version = version
+
+    @lazy
+    def switches(self):
+        """
+        Returns whether each switch is active, by switch name.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from waffle.models import Switch
+        return dict(Switch.objects.values_list('name', 'active'))
+
+    @lazy
+    def flags(self):
+        """
+        Returns the `everyone` setting of each flag, by flag name.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from waffle.models import Flag
+        return dict(Flag.objects.values_list('name', 'everyone'))
+
+    @lazy
+    def course_overrides(self):
+        """
+        Returns the current override choice of each flag overridden for a
+        course, by flag name and course id.
+        """
+        # Import is placed here to avoid model import at project startup.
+        from .models import WaffleFlagCourseOverrideModel
+        overrides = {}
+        rows = WaffleFlagCourseOverrideModel.objects.order_by('change_date', 'id').values_list(
+            'waffle_flag', 'course_id', 'override_choice', 'enabled',
+        )
+        for waffle_flag, course_id, override_choice, enabled in rows:
+            key = (waffle_flag, unicode(course_id))
+            if enabled:
+                overrides[key] = override_choice
+            else:
+                overrides.pop(key, None)
+        return overrides
+
+    def switch_is_active(self, switch_name):
+        """
+        Returns whether the given switch is active, the way waffle would.
+        """
+        return self.switches.get(switch_name, get_setting('SWITCH_DEFAULT'))
+
+    def flag_exists(self, flag_name):
+        """
+        Returns whether the given flag is defined.
+        """
+        return flag_name in self.flags
+
+    def flag_is_active(self, request, flag_name):
+        """
+        Returns whether the given flag is active for the given request, the
+        way waffle would.  Only the flags whose value depends on the request
+        are left to waffle.
+        """
+        if get_setting('OVERRIDE') and flag_name in request.GET:
+            return flag_is_active(request, flag_name)
+        if flag_name not in self.flags:
+            return get_setting('FLAG_DEFAULT')
+        everyone = self.flags[flag_name]
+        if everyone is not None:
+            return everyone
+        return flag_is_active(request, flag_name)
+
+    def course_override(self, waffle_flag, course_id):
+        """
+        Returns the override choice of the given flag for the given course,
+        or None if it isn't overridden.
+        """
+        return self.course_overrides.get((waffle_flag, unicode(course_id)))
+
+
+def _get_version():
+    """
+    Returns the current version of the waffle tables.
+    """
+    version = cache.get(SNAPSHOT_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(SNAPSHOT_VERSION_CACHE_KEY, uuid4().hex, None)
+        # Another process may have added its own version first.
+        version = cache.get(SNAPSHOT_VERSION_CACHE_KEY) or uuid4().hex
+    return version
+
+
+def get_waffle_snapshot():
+    """
+    Returns the snapshot of the waffle tables, reloading it if they've
+    changed since it was loaded.  This is only checked once per request.
+    """
+    global _snapshot  # pylint: disable=global-statement
+    request_cache = get_request_cache('WaffleNamespace')
+    snapshot = request_cache.get('snapshot')
+    if snapshot is None:
+        version = _get_version()
+        snapshot = _snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = _snapshot = WaffleSnapshot(version)
+        request_cache['snapshot'] = snapshot
+    return snapshot
+
+
+def invalidate_waffle_snapshot():
+    """
+    Makes every process reload its snapshot of the waffle tables.
+    """
+    global _snapshot  # pylint: disable=global-statement
+    _snapshot = None
+    get_request_cache('WaffleNamespace').pop('snapshot', None)
+    cache.delete(SNAPSHOT_VERSION_CACHE_KEY)
+    # Other processes may have reloaded their snapshot before the change was committed.
+    transaction.on_commit(lambda: cache.delete(SNAPSHOT_VERSION_CACHE_KEY))
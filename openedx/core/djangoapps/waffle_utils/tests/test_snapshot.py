@@ -0,0 +1,84 @@
+"""
+Tests for the snapshot of the waffle tables.
+"""
+import crum
+from django.test.client import RequestFactory
+from edx_django_utils.cache import RequestCache
+from opaque_keys.edx.keys import CourseKey
+from waffle.models import Flag, Switch
+
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+
+from .. import CourseWaffleFlag, WaffleFlag, WaffleFlagNamespace, WaffleSwitchNamespace
+from ..models import WaffleFlagCourseOverrideModel
+from ..snapshot import get_waffle_snapshot
+
+
+class WaffleSnapshotTests(CacheIsolationTestCase):
+    """
+    Tests for the process-wide snapshot of the waffle tables.
+    """
+    ENABLED_CACHES = ['default']
+
+    TEST_COURSE_KEY = CourseKey.from_string("edX/DemoX/Demo_Course")
+    SWITCHES = WaffleSwitchNamespace("test_namespace")
+    FLAGS = WaffleFlagNamespace("test_namespace")
+
+    def setUp(self):
+        super(WaffleSnapshotTests, self).setUp()
+        request = RequestFactory().request()
+        self.addCleanup(crum.set_current_request, None)
+        crum.set_current_request(request)
+
+    def test_switches_loaded_once(self):
+        Switch.objects.create(name="test_namespace.on", active=True)
+        Switch.objects.create(name="test_namespace.off", active=False)
+        with self.assertNumQueries(1):
+            self.assertTrue(self.SWITCHES.is_enabled("on"))
+            self.assertFalse(self.SWITCHES.is_enabled("off"))
+            self.assertFalse(self.SWITCHES.is_enabled("undefined"))
+
+        # A later request reuses the snapshot
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            self.assertTrue(self.SWITCHES.is_enabled("on"))
+
+    def test_snapshot_reloaded_on_change(self):
+        switch = Switch.objects.create(name="test_namespace.switch", active=True)
+        snapshot = get_waffle_snapshot()
+        self.assertTrue(snapshot.switch_is_active("test_namespace.switch"))
+
+        switch.active = False
+        switch.save()
+        RequestCache.clear_all_namespaces()
+        self.assertIsNot(get_waffle_snapshot(), snapshot)
+        self.assertFalse(self.SWITCHES.is_enabled("switch"))
+
+    def test_flags(self):
+        Flag.objects.create(name="test_namespace.everyone", everyone=True)
+        Flag.objects.create(name="test_namespace.nobody", everyone=False)
+        with self.assertNumQueries(1):
+            self.assertTrue(WaffleFlag(self.FLAGS, "everyone").is_enabled())
+            self.assertFalse(WaffleFlag(self.FLAGS, "nobody").is_enabled())
+            self.assertFalse(WaffleFlag(self.FLAGS, "undefined").is_enabled())
+            self.assertTrue(WaffleFlag(self.FLAGS, "undefined_on", flag_undefined_default=True).is_enabled())
+
+    def test_course_overrides(self):
+        WaffleFlagCourseOverrideModel.objects.create(
+            waffle_flag="test_namespace.overridden",
+            course_id=self.TEST_COURSE_KEY,
+            override_choice=WaffleFlagCourseOverrideModel.ALL_CHOICES.on,
+            enabled=True,
+        )
+        WaffleFlagCourseOverrideModel.objects.create(
+            waffle_flag="test_namespace.disabled",
+            course_id=self.TEST_COURSE_KEY,
+            override_choice=WaffleFlagCourseOverrideModel.ALL_CHOICES.on,
+            enabled=False,
+        )
+        self.assertTrue(CourseWaffleFlag(self.FLAGS, "overridden").is_enabled(self.TEST_COURSE_KEY))
+        self.assertFalse(CourseWaffleFlag(self.FLAGS, "disabled").is_enabled(self.TEST_COURSE_KEY))
+
+        RequestCache.clear_all_namespaces()
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseWaffleFlag(self.FLAGS, "overridden").is_enabled(self.TEST_COURSE_KEY))
@@ -6,8 +6,10 @@ from datetime import timedelta, datetime
 import itertools
 
 import ddt
+from django.test import RequestFactory
+from django.test.utils import override_settings
 from django.utils import timezone
-from mock import Mock
+from mock import Mock, patch
 import pytz
 
 from edx_django_utils.cache import RequestCache
@@ -422,6 +424,54 @@ class TestCourseDurationLimitConfig(CacheIsolationTestCase):
         with self.assertNumQueries(0):
             self.assertFalse(CourseDurationLimitConfig.current(course_key=course.id).enabled)
 
+    def test_prefetch_course_configs(self):
+        site_cfg = SiteConfigurationFactory.create(values={'course_org_filter': 'test-org'})
+        courses = [
+            CourseOverviewFactory.create(
+                org='test-org', id=CourseLocator('test-org', 'test_course', 'run-{}'.format(run))
+            )
+            for run in range(3)
+        ]
+        other_org_course = CourseOverviewFactory.create(org='other-org')
+        CourseDurationLimitConfig.objects.create(enabled=False, enabled_as_of=datetime(2018, 1, 1))
+        CourseDurationLimitConfig.objects.create(site=site_cfg.site, enabled=True)
+        CourseDurationLimitConfig.objects.create(org='other-org', enabled=True, enabled_as_of=datetime(2019, 1, 1))
+        CourseDurationLimitConfig.objects.create(course=courses[0], enabled=False)
+        course_keys = [course.id for course in courses + [other_org_course]]
+
+        RequestCache.clear_all_namespaces()
+        CourseDurationLimitConfig.prefetch_course_configs(course_keys)
+        with self.assertNumQueries(0):
+            prefetched = [CourseDurationLimitConfig.current(course_key=course_key) for course_key in course_keys]
+
+        RequestCache.clear_all_namespaces()
+        for course_key, prefetched_config in zip(course_keys, prefetched):
+            config = CourseDurationLimitConfig.current(course_key=course_key)
+            self.assertEqual(prefetched_config.enabled, config.enabled)
+            self.assertEqual(prefetched_config.enabled_as_of, config.enabled_as_of)
+            self.assertEqual(prefetched_config.provenances, config.provenances)
+        self.assertEqual([config.enabled for config in prefetched], [False, True, True, True])
+
+        # Saving a configuration forgets the prefetched ones.
+        CourseDurationLimitConfig.prefetch_course_configs(course_keys)
+        CourseDurationLimitConfig.objects.create(course=courses[1], enabled=False)
+        self.assertFalse(CourseDurationLimitConfig.current(course_key=courses[1].id).enabled)
+
+    def test_prefetch_course_configs_without_site(self):
+        course = CourseOverviewFactory.create(org='no-site-org')
+        CourseDurationLimitConfig.objects.create(enabled=False, enabled_as_of=datetime(2018, 1, 1))
+        CourseDurationLimitConfig.objects.create(org='no-site-org', enabled=True, enabled_as_of=datetime(2019, 1, 1))
+
+        # Without a site configured for the org nor a default site, the org's site is a RequestSite.
+        RequestCache.clear_all_namespaces()
+        with override_settings(SITE_ID=0):
+            with patch('crum.get_current_request', return_value=RequestFactory().get('/')):
+                CourseDurationLimitConfig.prefetch_course_configs([course.id])
+        with self.assertNumQueries(0):
+            config = CourseDurationLimitConfig.current(course_key=course.id)
+        self.assertTrue(config.enabled)
+        self.assertEqual(config.provenances['enabled'], Provenance.org)
+
     def _resolve_settings(self, settings):
         if all(setting is None for setting in settings):
             return None
@@ -34,20 +34,23 @@ class LearnerAchievementsFragmentView(EdxFragmentView):
         """
         Returns a user's certificates sorted by course name.
         """
-        course_certificates = certificate_api.get_certificates_for_user(username)
+        course_certificates = [
+            course_certificate
+            for course_certificate in certificate_api.get_certificates_for_user(username)
+            if course_certificate.get('is_passing', False)
+        ]
+        course_overviews = CourseOverview.get_many(
+            course_certificate['course_key'] for course_certificate in course_certificates
+        )
         passing_certificates = []
         for course_certificate in course_certificates:
-            if course_certificate.get('is_passing', False):
-                course_key = course_certificate['course_key']
-                try:
-                    course_overview = CourseOverview.get_from_id(course_key)
-                    course_certificate['course'] = course_overview
-                    if certificates_viewable_for_course(course_overview):
-                        passing_certificates.append(course_certificate)
-                except CourseOverview.DoesNotExist:
-                    # This is unlikely to fail as the course should exist.
-                    # Ideally the cert should have all the information that
-                    # it needs. This might be solved by the Credentials API.
-                    pass
+            course_overview = course_overviews.get(course_certificate['course_key'])
+            # A course overview is unlikely to be missing, as the course
+            # should exist.  Ideally the cert should have all the information
+            # that it needs. This might be solved by the Credentials API.
+            if course_overview:
+                course_certificate['course'] = course_overview
+                if certificates_viewable_for_course(course_overview):
+                    passing_certificates.append(course_certificate)
         passing_certificates.sort(key=lambda certificate: certificate['course'].display_name_with_default)
         return passing_certificates